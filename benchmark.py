@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Framework performance benchmarks for HCLTech Authentication Module tests
+
+    python benchmark.py startup            # import-time breakdown + collect-only timing
+    python benchmark.py startup --json reports/startup.json --max-collect-ms 3000
+    python benchmark.py logging            # per-record and per-test cost of logging
+    python benchmark.py merge --tests 20000 --fragments 16   # streaming JUnit merge
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str):
+    """Aggregate `-X importtime` output into cumulative microseconds per top-level package.
+
+    Returns (packages, imported) where `imported` holds the top-level name of
+    every module in the import tree, including nested imports.
+    """
+    packages = defaultdict(int)
+    imported = set()
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, module = match.groups()
+        imported.add(module.split(".")[0])
+        # Only top-level entries in the import tree, so nothing is counted twice
+        if len(indent) == 1:
+            packages[module.split(".")[0]] += int(cumulative)
+    return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)), imported
+
+
+def run_collect(extra_args, importtime=False):
+    """Run `pytest --collect-only` once and return (wall seconds, stderr)"""
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    # --capture=no: otherwise pytest's fd capture swallows the importtime lines
+    # written while conftest and test modules are imported
+    command += ["-m", "pytest", "--collect-only", "-q", "--capture=no", "-p", "no:cacheprovider"] + extra_args
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode not in (0, 5):
+        print(result.stdout[-2000:], result.stderr[-2000:], sep="\n")
+        raise SystemExit(f"pytest --collect-only failed with exit code {result.returncode}")
+    return elapsed, result.stderr
+
+
+def benchmark_startup(args):
+    extra_args = args.pytest_args or []
+    _, stderr = run_collect(extra_args, importtime=True)
+    packages, imported = parse_importtime(stderr)
+    timings = [run_collect(extra_args)[0] for _ in range(args.repeat)]
+    collect_ms = statistics.median(timings) * 1000
+
+    print(f"\n{'='*60}")
+    print("Import time by top-level package (cumulative, collect-only)")
+    print(f"{'='*60}")
+    for package, micros in list(packages.items())[:args.top]:
+        print(f"{package:<30} {micros / 1000:>10.1f} ms")
+    heavy = [name for name in ("selenium", "webdriver_manager", "pandas", "openpyxl") if name in imported]
+    print(f"\nHeavy packages imported during collection: {', '.join(heavy) or 'none'}")
+    print(f"Collect-only wall time: median {collect_ms:.0f} ms over {args.repeat} runs")
+
+    result = {
+        "collect_ms_median": round(collect_ms, 1),
+        "collect_ms_runs": [round(t * 1000, 1) for t in timings],
+        "import_ms_by_package": {name: round(micros / 1000, 2) for name, micros in packages.items()},
+        "heavy_imports": heavy,
+    }
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as file:
+            json.dump(result, file, indent=2)
+        print(f"Results written to {args.json}")
+    if args.max_collect_ms and collect_ms > args.max_collect_ms:
+        print(f"FAIL: collect-only {collect_ms:.0f} ms exceeds budget {args.max_collect_ms} ms")
+        return 1
+    return 0
+
+
+def _time_logging(records, emit):
+    """Seconds spent on the calling thread emitting `records` log calls"""
+    start = time.perf_counter()
+    for i in range(records):
+        emit(i)
+    return time.perf_counter() - start
+
+
+def benchmark_logging(args):
+    import logging
+    from src.utilities.log_pipeline import LOG_FORMAT, LogPipeline
+
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers = []
+    logger = logging.getLogger("benchmark.login_page")
+    username, locator = "standard_user", ("id", "user-name")
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+            # Previous setup: synchronous file + console handlers, eager f-strings
+            file_handler = logging.FileHandler(os.path.join(log_dir, "sync.log"))
+            console = logging.StreamHandler(devnull)
+            for handler in (file_handler, console):
+                handler.setFormatter(logging.Formatter(LOG_FORMAT))
+                root.addHandler(handler)
+            root.setLevel(logging.INFO)
+            results["sync_fstring"] = _time_logging(
+                args.records, lambda i: logger.info(f"Entering username: {username} ({locator}) #{i}"))
+            results["disabled_fstring"] = _time_logging(
+                args.records, lambda i: logger.debug(f"Entering username: {username} ({locator}) #{i}"))
+            for handler in (file_handler, console):
+                root.removeHandler(handler)
+                handler.close()
+
+            # Queue handler with a background listener, lazy %-style
+            pipeline = LogPipeline(log_dir, "bench").start()
+            results["queue_lazy"] = _time_logging(
+                args.records, lambda i: logger.info("Entering username: %s (%s) #%s", username, locator, i))
+            results["disabled_lazy"] = _time_logging(
+                args.records, lambda i: logger.debug("Entering username: %s (%s) #%s", username, locator, i))
+            drain_start = time.perf_counter()
+            pipeline.stop()
+            results["queue_drain"] = time.perf_counter() - drain_start
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+
+    per_record = {name: seconds / args.records * 1e6 for name, seconds in results.items() if name != "queue_drain"}
+    print(f"\n{'='*60}")
+    print(f"Logging cost on the test thread ({args.records} records)")
+    print(f"{'='*60}")
+    labels = {
+        "sync_fstring": "File+console handlers, f-string",
+        "queue_lazy": "Queue handler, lazy %-style",
+        "disabled_fstring": "Disabled level, f-string",
+        "disabled_lazy": "Disabled level, lazy %-style",
+    }
+    for name, label in labels.items():
+        print(f"{label:<36} {per_record[name]:>8.2f} us/record "
+              f"{per_record[name] * args.records_per_test / 1000:>8.3f} ms/test")
+    print(f"Background drain after the run: {results['queue_drain'] * 1000:.1f} ms")
+
+    result = {
+        "records": args.records,
+        "records_per_test": args.records_per_test,
+        "us_per_record": {name: round(value, 3) for name, value in per_record.items()},
+        "ms_per_test": {name: round(value * args.records_per_test / 1000, 4) for name, value in per_record.items()},
+        "queue_drain_ms": round(results["queue_drain"] * 1000, 1),
+    }
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as file:
+            json.dump(result, file, indent=2)
+        print(f"Results written to {args.json}")
+    return 0
+
+
+def _write_junit_fragment(path, index, tests):
+    """Synthetic xdist/shard JUnit fragment: properties, captured output and some failures"""
+    with open(path, "w") as file:
+        file.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites><testsuite name="pytest">\n')
+        for test in range(tests):
+            failure = '<failure message="AssertionError: login failed">Traceback ...</failure>' if test % 50 == 0 else ""
+            file.write(
+                f'<testcase classname="src.tests.test_login_{index}.TestLogin" name="test_case_{test}" time="{test % 7 + 0.5}">'
+                f'<properties><property name="setup_s" value="0.2"/><property name="call_s" value="1.5"/>'
+                f'<property name="screenshot" value="reports/screenshots/{test:020x}.png"/></properties>{failure}'
+                f'<system-out>{"INFO login_page Entering username: standard_user " * 10}</system-out></testcase>\n'
+            )
+        file.write("</testsuite></testsuites>\n")
+
+
+def benchmark_merge(args):
+    import tracemalloc
+    from src.utilities.junit_merge import merge_junit
+
+    per_fragment = max(1, args.tests // args.fragments)
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = []
+        for index in range(args.fragments):
+            path = os.path.join(directory, f"junit_gw{index}.xml")
+            _write_junit_fragment(path, index, per_fragment)
+            inputs.append((f"gw{index}", path))
+        input_bytes = sum(os.path.getsize(path) for _, path in inputs)
+        output = os.path.join(directory, "merged", "junit_merged.xml")
+        summary = os.path.join(directory, "merged", "summary.html")
+
+        start = time.perf_counter()
+        result = merge_junit(inputs, output, summary)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        merge_junit(inputs, output, summary)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    tests = result["totals"]["tests"]
+    print(f"\n{'='*60}")
+    print(f"Streaming JUnit merge ({tests} tests in {args.fragments} fragments, {input_bytes / 1e6:.1f} MB)")
+    print(f"{'='*60}")
+    print(f"Merge time:  {elapsed:.2f}s ({tests / elapsed:,.0f} tests/s)")
+    print(f"Peak Python memory: {peak / 1e6:.1f} MB")
+
+    data = {"tests": tests, "fragments": args.fragments, "input_mb": round(input_bytes / 1e6, 2),
+            "seconds": round(elapsed, 3), "peak_mb": round(peak / 1e6, 2)}
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as file:
+            json.dump(data, file, indent=2)
+        print(f"Results written to {args.json}")
+    if args.max_seconds and elapsed > args.max_seconds:
+        print(f"FAIL: merge took {elapsed:.2f}s > {args.max_seconds:.2f}s")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the test framework")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    startup = subparsers.add_parser("startup", help="Import-time breakdown and collect-only timing")
+    startup.add_argument("--repeat", type=int, default=5, help="Collect-only runs to time")
+    startup.add_argument("--top", type=int, default=15, help="Packages to show")
+    startup.add_argument("--json", help="Write machine-readable results to this file")
+    startup.add_argument("--max-collect-ms", type=float, help="Fail if median collect time exceeds this")
+    startup.add_argument("pytest_args", nargs="*", help="Extra pytest arguments (e.g. a test path)")
+    startup.set_defaults(func=benchmark_startup)
+
+    logging_parser = subparsers.add_parser("logging", help="Per-record and per-test cost of logging")
+    logging_parser.add_argument("--records", type=int, default=20000, help="Log calls to time per variant")
+    logging_parser.add_argument("--records-per-test", type=int, default=25, help="Typical log calls in one test")
+    logging_parser.add_argument("--json", help="Write machine-readable results to this file")
+    logging_parser.set_defaults(func=benchmark_logging)
+
+    merge = subparsers.add_parser("merge", help="Time and memory of merging JUnit fragments")
+    merge.add_argument("--tests", type=int, default=20000, help="Test cases across all fragments")
+    merge.add_argument("--fragments", type=int, default=16, help="Number of JUnit fragments")
+    merge.add_argument("--json", help="Write machine-readable results to this file")
+    merge.add_argument("--max-seconds", type=float, help="Fail if the merge takes longer than this")
+    merge.set_defaults(func=benchmark_merge)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
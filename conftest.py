@@ -1,24 +1,47 @@
 # conftest.py
 import pytest
+import base64
 import logging
+import os
+import sys
+import time
 from datetime import datetime
-from src.utilities.driver_manager import DriverManager
 from src.config.config import config
 
+# selenium/webdriver_manager are imported only when a browser fixture first runs,
+# so collecting and running browserless tests stays cheap.
+def _driver_manager():
+    from src.utilities.driver_manager import DriverManager
+    return DriverManager
+
 # Configure logging
-def setup_logging():
-    """Setup logging configuration"""
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    log_file = f"{config.LOG_PATH}/test_execution_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
+_log_pipeline = None
+
+def setup_logging(run_id=None, worker_id=None):
+    """Route all logging through a queue to a background file writer (idempotent)"""
+    global _log_pipeline
+    if _log_pipeline is None:
+        from src.utilities.log_pipeline import LogPipeline
+        config.ensure_directories()
+        run_id = run_id or os.getenv("TEST_RUN_ID") or datetime.now().strftime('%Y%m%d_%H%M%S')
+        _log_pipeline = LogPipeline(config.LOG_PATH, run_id, worker_id).start()
+    return _log_pipeline
+
+def _stop_logging():
+    """Flush the log file; the xdist controller also merges worker files"""
+    global _log_pipeline
+    if _log_pipeline is None:
+        return
+    pipeline, _log_pipeline = _log_pipeline, None
+    pipeline.stop()
+    if pipeline.worker_id is None:
+        from src.utilities.log_pipeline import merge_logs, worker_log_paths
+        paths = worker_log_paths(pipeline.log_dir, pipeline.run_id)
+        if paths:
+            # The controller's own records are part of the merge, not overwritten by it
+            if os.path.exists(pipeline.path):
+                paths.append(pipeline.path)
+            merge_logs(paths, pipeline.path)
 
 @pytest.fixture(scope="session")
 def logger():
@@ -26,16 +49,199 @@ def logger():
     setup_logging()
     return logging.getLogger(__name__)
 
+_session_start = time.time()
+_perf_report = {}
+
+def _apply_perf_options(pytest_config):
+    """Command line overrides for lean mode and the page performance budget mode"""
+    if pytest_config.getoption("--lean"):
+        config.LEAN_MODE = True
+    mode = pytest_config.getoption("--perf-budget-mode")
+    if mode:
+        config.PERF_BUDGET_MODE = mode
+
+def _apply_lean_profile(request, driver):
+    """Per-test block/allow lists: @pytest.mark.lean(block=[...], allow=[...], extend=True) or lean(False)"""
+    if not getattr(driver, "lean_mode", False):
+        return
+    from src.utilities import lean_mode
+    marker = request.node.get_closest_marker("lean")
+    enabled = marker.args[0] if marker and marker.args else True
+    patterns = lean_mode.effective_block_list(**(marker.kwargs if marker else {})) if enabled else []
+    if not lean_mode.apply_block_list(driver, patterns) and marker:
+        logging.getLogger(__name__).info(
+            "%s: per-test lean lists need CDP (Chrome/Edge); using launch prefs", request.node.nodeid
+        )
+
+def _finish_performance(session):
+    """Write this process's page timing; the controller also compares all of it to the baseline"""
+    module = sys.modules.get("src.utilities.page_metrics")
+    if module is None:
+        return
+    recorder = module.performance_recorder
+    worker_id = getattr(session.config, "workerinput", {}).get("workerid")
+    if recorder.samples:
+        recorder.write(os.path.join(config.REPORT_PATH, f"performance_{worker_id}.json" if worker_id else "performance.json"))
+    if worker_id:
+        return
+
+    samples = recorder.dataset()
+    violations = list(recorder.violations)
+    import glob
+    import json
+    for path in glob.glob(os.path.join(config.REPORT_PATH, "performance_gw*.json")):
+        if os.path.getmtime(path) >= _session_start:
+            with open(path) as file:
+                fragment = json.load(file)
+            samples += fragment["samples"]
+            violations += fragment.get("violations", [])
+    if not samples:
+        return
+    summary = module.summarize(samples)
+    baseline = module.load_baseline(config.PERF_BASELINE_PATH)
+    regressions = module.compare_to_baseline(
+        summary, baseline, config.PERF_REGRESSION_TOLERANCE, config.PERF_REGRESSION_MIN_MS
+    )
+    from src.utilities.lean_mode import savings_report
+    savings = savings_report(summary, baseline)
+    if session.config.getoption("--perf-update-baseline"):
+        module.save_baseline(config.PERF_BASELINE_PATH, dict(baseline, **summary))
+    _perf_report.update(summary=summary, regressions=regressions, violations=violations, savings=savings)
+    with open(os.path.join(config.REPORT_PATH, "performance_summary.json"), "w") as file:
+        json.dump(_perf_report, file, indent=2)
+    if regressions and config.PERF_BUDGET_MODE == "fail" and session.exitstatus == 0:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+_local_app = None
+
+def _local_app_enabled(pytest_config):
+    """Whether this run targets the bundled stand-in app"""
+    return pytest_config.getoption("--local-app") or config.LOCAL_APP
+
+def _start_local_app():
+    """Start the bundled stand-in app and point BASE_URL at it"""
+    global _local_app
+    from src.utilities.local_app import LocalApp
+    _local_app = LocalApp(
+        latency_ms=config.LOCAL_APP_LATENCY_MS,
+        jitter_ms=config.LOCAL_APP_JITTER_MS
+    ).start()
+    config.BASE_URL = _local_app.url
+
+@pytest.fixture(scope="session")
+def local_app():
+    """Running local stand-in app (shared with --local-app runs)"""
+    if _local_app is not None:
+        yield _local_app
+        return
+    from src.utilities.local_app import LocalApp
+    app = LocalApp(
+        latency_ms=config.LOCAL_APP_LATENCY_MS,
+        jitter_ms=config.LOCAL_APP_JITTER_MS
+    ).start()
+    yield app
+    app.stop()
+
+@pytest.fixture(scope="session")
+def driver_pool(pytestconfig):
+    """Session-wide pool of reusable browsers, or None when reuse is disabled"""
+    if not config.REUSE_DRIVER or pytestconfig.getoption("--no-driver-reuse"):
+        yield None
+        return
+    pool = _driver_manager().get_pool(prefetch=pytestconfig.getoption("--driver-prefetch"))
+    yield pool
+    _driver_manager().shutdown_pool()
+
 @pytest.fixture(scope="function")
-def driver():
+def driver(request, driver_pool):
     """WebDriver fixture for each test"""
-    driver = None
+    if driver_pool is None:
+        driver = None
+        try:
+            driver = _driver_manager().create_driver()
+            _start_command_profile(driver)
+            _set_performance_test(request)
+            _apply_lean_profile(request, driver)
+            yield driver
+        finally:
+            if driver:
+                driver.quit()
+        return
+    
+    driver = driver_pool.acquire()
+    _start_command_profile(driver)
+    _set_performance_test(request)
+    _apply_lean_profile(request, driver)
+    # Per-test time blocked waiting for a browser (exported to JUnit properties)
+    request.node.user_properties.append(("driver_wait_s", round(driver_pool.last_wait, 3)))
+    start = time.perf_counter()
     try:
-        driver = DriverManager.create_driver()
         yield driver
     finally:
-        if driver:
-            driver.quit()
+        driver_pool.record_test_time(time.perf_counter() - start)
+        failed = any(
+            getattr(getattr(request.node, f"rep_{when}", None), "failed", False)
+            for when in ("setup", "call")
+        )
+        driver_pool.release(driver, failed=failed)
+
+_command_profiles = {}
+
+def _start_command_profile(driver):
+    """Begin a fresh per-test profile on an instrumented driver"""
+    profiler = getattr(driver, "command_profiler", None)
+    if profiler is not None:
+        profiler.reset()
+
+def _set_performance_test(request):
+    """Tag page timing samples with the test that produced them"""
+    from src.utilities.page_metrics import performance_recorder
+    performance_recorder.test_id = request.node.nodeid
+
+def _record_command_profile(item, report, driver):
+    """Export the test's WebDriver profile to JUnit properties, the report and the JSON file"""
+    profiler = getattr(driver, "command_profiler", None)
+    if profiler is None:
+        return
+    summary = profiler.summary()
+    item.user_properties.append(("webdriver_commands", summary["total_commands"]))
+    item.user_properties.append(("webdriver_wait_s", summary["wait_time"]))
+    item.user_properties.append(("webdriver_work_s", summary["work_time"]))
+    lines = [
+        f"commands: {summary['total_commands']} in {summary['command_time']:.3f}s | "
+        f"waits: {summary['waits']} ({summary['wait_time']:.3f}s, {summary['retries']} retries) | "
+        f"work: {summary['work_time']:.3f}s",
+        "by command: " + ", ".join(f"{name}={count}" for name, count in sorted(summary["commands"].items())),
+    ]
+    lines += [f"  {entry['time']:.3f}s  {entry['commands']:>3}x  {entry['locator']}" for entry in summary["slowest_locators"]]
+    report.sections.append(("WebDriver profile", "\n".join(lines)))
+    _command_profiles[item.nodeid] = dict(summary, duration=round(report.duration, 4), outcome=report.outcome)
+
+def _write_command_profiles(session):
+    """Write per-test profiles to reports/command_profile[_gwN].json"""
+    if not _command_profiles:
+        return
+    import json
+    worker_id = getattr(session.config, "workerinput", {}).get("workerid")
+    config.ensure_directories()
+    path = os.path.join(config.REPORT_PATH, f"command_profile_{worker_id}.json" if worker_id else "command_profile.json")
+    with open(path, "w") as file:
+        json.dump({"generated": datetime.now().isoformat(timespec="seconds"), "tests": _command_profiles}, file, indent=2)
+
+_worker_stats = None
+
+def _runs_tests(pytest_config):
+    """False for the xdist controller, which only relays its workers' reports"""
+    return hasattr(pytest_config, "workerinput") or not getattr(pytest_config.option, "numprocesses", None)
+
+def _write_worker_report(session):
+    """Write this process's outcomes, test time and browser pool stats for run_tests.py to merge"""
+    directory = session.config.getoption("--worker-report-dir")
+    if not directory or _worker_stats is None:
+        return
+    driver_manager = sys.modules.get("src.utilities.driver_manager")
+    pool = driver_manager.DriverManager.pool_summary() if driver_manager else None
+    _worker_stats.write(directory, {"pool": pool})
 
 @pytest.fixture(scope="function")
 def login_page(driver):
@@ -51,9 +257,115 @@ def forgot_password_page(driver):
     login_page = LoginPage(driver).navigate_to_login()
     return login_page.click_forgot_password()
 
+@pytest.fixture(scope="function")
+def record(request):
+    """Data row for tests parametrized with @pytest.mark.data_source, read on demand"""
+    return request.param.load()
+
+@pytest.fixture(scope="function")
+def logged_in_page(driver, request):
+    """Authenticated page via cached session state (use @pytest.mark.login_as("user") to pick the user)"""
+    from src.pages.login_page import LoginPage
+    from src.utilities.data_loader import DataLoader
+    marker = request.node.get_closest_marker("login_as")
+    if marker:
+        username = marker.args[0]
+    else:
+        users = DataLoader.load_test_credentials()
+        username = users[0]["username"] if users else "standard_user"
+    return LoginPage(driver).login_with_state(username)
+
 # Pytest hooks
+def pytest_addoption(parser):
+    """Register custom command line options"""
+    parser.addoption(
+        "--no-driver-reuse",
+        action="store_true",
+        default=False,
+        help="Launch a fresh browser for every test instead of using the driver pool"
+    )
+    parser.addoption(
+        "--driver-prefetch",
+        type=int,
+        default=None,
+        help="Number of browsers to launch ahead in the background (0 disables)"
+    )
+    parser.addoption(
+        "--local-app",
+        action="store_true",
+        default=False,
+        help="Run against the bundled local stand-in app instead of APP_URL"
+    )
+    parser.addoption(
+        "--forbid-sleep",
+        action="store_true",
+        default=False,
+        help="Fail tests whose test or page-object code calls time.sleep"
+    )
+    parser.addoption(
+        "--lean",
+        action="store_true",
+        default=False,
+        help="Launch browsers with the lean profile (block images/fonts/trackers, no animations)"
+    )
+    parser.addoption(
+        "--perf-budget-mode",
+        choices=("off", "warn", "fail"),
+        default=None,
+        help="What a page over its performance budget does (default: PERF_BUDGET_MODE)"
+    )
+    parser.addoption(
+        "--perf-update-baseline",
+        action="store_true",
+        default=False,
+        help="Save this run's page timing medians as the performance baseline"
+    )
+    parser.addoption(
+        "--longest-first",
+        action="store_true",
+        default=False,
+        help="Run tests in order of expected duration from the duration history, longest first"
+    )
+    parser.addoption(
+        "--shard",
+        action="store",
+        default=None,
+        metavar="i/N",
+        help="Run only shard i of N: balanced by --durations-file if given, otherwise split by node id hash"
+    )
+    parser.addoption(
+        "--durations-file",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help="Duration history shared by every shard (e.g. restored from a CI cache); must exist"
+    )
+    parser.addoption(
+        "--retry-failed",
+        action="store",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Retry a failed test up to N times right away, on a fresh browser from the same worker"
+    )
+    parser.addoption(
+        "--quarantine",
+        action="store",
+        choices=("include", "exclude", "only"),
+        default="include",
+        help="Tests quarantined by the flake record: run them (include), skip them (exclude) "
+             "or run only them (only, for the non-blocking quarantine lane)"
+    )
+    parser.addoption(
+        "--worker-report-dir",
+        action="store",
+        default=None,
+        help="Write a per-worker JSON summary (outcomes, test time, driver pool) into this directory"
+    )
+
 def pytest_configure(config):
     """Setup pytest configuration"""
+    global _worker_stats
     # Add custom markers
     config.addinivalue_line(
         "markers",
@@ -63,6 +375,235 @@ def pytest_configure(config):
         "markers",
         "regression: mark test as regression test"
     )
+    config.addinivalue_line(
+        "markers",
+        "login_as(username): user for the logged_in_page fixture"
+    )
+    config.addinivalue_line(
+        "markers",
+        "lean(enabled=True, block=None, allow=None, extend=True): per-test lean-mode URL block/allow lists"
+    )
+    config.addinivalue_line(
+        "markers",
+        "data_source(path, sheet=None, id_field=None, types=None): stream `record` params from a data file"
+    )
+    if not config.option.collectonly:
+        workerinput = getattr(config, "workerinput", {})
+        setup_logging(workerinput.get("log_run_id"), workerinput.get("workerid"))
+    _apply_perf_options(config)
+    if config.getoption("--worker-report-dir") and _runs_tests(config):
+        from src.utilities.report_fragments import WorkerStats
+        _worker_stats = WorkerStats(getattr(config, "workerinput", {}).get("workerid"))
+    if _local_app_enabled(config):
+        _start_local_app()
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Give every xdist worker the controller's run id so their logs can be merged"""
+    node.workerinput["log_run_id"] = setup_logging().run_id
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    """Finish queued screenshot writes before report plugins write their output"""
+    if "src.utilities.screenshots" in sys.modules:
+        sys.modules["src.utilities.screenshots"].shutdown_screenshot_service()
+    _write_command_profiles(session)
+    _write_worker_report(session)
+    _finish_performance(session)
+    if hasattr(session.config, "workerinput"):
+        # Workers flush before reporting back, so the controller can merge
+        _stop_logging()
+
+def pytest_unconfigure(config):
+    """Stop the local stand-in app and quit any browsers still pooled"""
+    if _local_app is not None:
+        _local_app.stop()
+    driver_manager = sys.modules.get("src.utilities.driver_manager")
+    if driver_manager is not None:
+        # Prefetched at collection even if no selected test ever set up driver_pool
+        driver_manager.DriverManager.shutdown_pool()
+    _stop_logging()
+    if "src.utilities.data_loader" in sys.modules:
+        sys.modules["src.utilities.data_loader"].DataLoader.close_streams()
+
+def pytest_runtest_logreport(report):
+    """Count outcomes and test time for the per-worker summary"""
+    if _worker_stats is not None:
+        _worker_stats.add(report)
+
+def pytest_generate_tests(metafunc):
+    """Parametrize `record` from a streamed data file: @pytest.mark.data_source(path, sheet=, id_field=, types=)"""
+    marker = metafunc.definition.get_closest_marker("data_source")
+    if marker is None or "record" not in metafunc.fixturenames:
+        return
+    from src.utilities.data_loader import DataLoader
+    rows, ids = [], []
+    for row, test_id in DataLoader.iter_params(
+        marker.args[0],
+        sheet_name=marker.kwargs.get("sheet"),
+        id_field=marker.kwargs.get("id_field"),
+        types=marker.kwargs.get("types")
+    ):
+        rows.append(row)
+        ids.append(test_id)
+    metafunc.parametrize("record", rows, ids=ids, indirect=True)
+
+def pytest_collection_modifyitems(session, config, items):
+    """Select this machine's --shard, apply the quarantine lane and/or order tests longest-first"""
+    from src.config.config import config as settings
+    shard = config.getoption("--shard")
+    if not shard and not config.getoption("--longest-first"):
+        _select_quarantine_lane(config, items, settings)
+        return
+    from src.utilities import duration_history
+    durations_file = config.getoption("--durations-file")
+    if durations_file and not os.path.isfile(durations_file):
+        raise pytest.UsageError(f"--durations-file not found: {durations_file}")
+    history = duration_history.DurationHistory(durations_file or settings.DURATION_HISTORY_PATH)
+    try:
+        estimates = history.estimates()
+    finally:
+        history.close()
+    nodeids = [item.nodeid for item in items]
+    durations = duration_history.expected_durations(nodeids, estimates, settings.DEFAULT_TEST_DURATION)
+
+    if shard:
+        try:
+            index, total = duration_history.parse_shard(shard)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+        if durations_file:
+            shards = duration_history.assign_shards(nodeids, durations, total)
+        else:
+            # This machine's own history would give a split the other shards do not agree with
+            shards = duration_history.hash_shards(nodeids, total)
+        deselected = [item for item in items if shards[item.nodeid] != index]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if shards[item.nodeid] == index]
+    # Quarantine only after sharding: flake records differ between machines, the full collection does not
+    _select_quarantine_lane(config, items, settings)
+    if config.getoption("--longest-first"):
+        order = {nodeid: position for position, nodeid in enumerate(duration_history.longest_first(nodeids, durations))}
+        items.sort(key=lambda item: order[item.nodeid])
+
+def _select_quarantine_lane(config, items, settings):
+    """Keep or drop the tests the flake record has quarantined"""
+    if config.getoption("--quarantine") == "include":
+        return
+    from src.utilities.duration_history import junit_key
+    from src.utilities.flake_tracker import FlakeRecord
+    record = FlakeRecord(settings.FLAKE_HISTORY_PATH, settings.FLAKE_WINDOW, settings.FLAKE_QUARANTINE_THRESHOLD)
+    try:
+        quarantined = record.quarantined()
+    finally:
+        record.close()
+    only = config.getoption("--quarantine") == "only"
+    keep = [item for item in items if (junit_key(item.nodeid) in quarantined) == only]
+    deselected = [item for item in items if (junit_key(item.nodeid) in quarantined) != only]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = keep
+
+def pytest_collection_finish(session):
+    """Start launching browsers in the background as soon as we know they are needed"""
+    if not config.REUSE_DRIVER or session.config.getoption("--no-driver-reuse"):
+        return
+    if session.config.option.collectonly:
+        return
+    if any("driver" in getattr(item, "fixturenames", ()) for item in session.items):
+        prefetch = session.config.getoption("--driver-prefetch")
+        _driver_manager().get_pool(prefetch=prefetch).warm_up()
+
+def pytest_runtest_protocol(item, nextitem):
+    """Retry a failed test right away (--retry-failed N).
+
+    Failed attempts are reported with the "rerun" outcome. The driver pool
+    discards a failed test's browser, so every retry starts on a fresh one.
+    """
+    retries = item.config.getoption("--retry-failed")
+    if not retries:
+        return None
+    from src.utilities.retry import run_with_retries
+    return run_with_retries(item, nextitem, retries)
+
+def pytest_report_teststatus(report):
+    """Show retried attempts as R / RERUN"""
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Optionally fail tests that sleep instead of waiting for a page condition"""
+    if not item.config.getoption("--forbid-sleep"):
+        yield
+        return
+    from src.utilities.waits import forbid_sleep
+    with forbid_sleep():
+        yield
+
+def pytest_terminal_summary(terminalreporter):
+    """Report browser startup time versus test time for the driver pool"""
+    _summarize_command_profiles(terminalreporter)
+    _summarize_performance(terminalreporter)
+    driver_manager = sys.modules.get("src.utilities.driver_manager")
+    stats = driver_manager.DriverManager.pool_summary() if driver_manager else None
+    if not stats:
+        return
+    terminalreporter.section("driver pool")
+    terminalreporter.write_line(
+        f"browsers launched: {stats['launched']} | reused: {stats['reused']} | "
+        f"recycled: {stats['recycled']}"
+    )
+    terminalreporter.write_line(
+        f"startup time: {stats['startup_time']:.2f}s (avg {stats['avg_startup']:.2f}s) | "
+        f"test time: {stats['test_time']:.2f}s"
+    )
+    terminalreporter.write_line(f"estimated startup time saved: {stats['saved_time']:.2f}s")
+    terminalreporter.write_line(
+        f"fixture wait for driver: {stats['wait_time']:.2f}s (max {stats['max_wait']:.2f}s) | "
+        f"startup hidden by prefetch: {stats['hidden_startup']:.2f}s"
+    )
+
+def _summarize_command_profiles(terminalreporter, top=5):
+    """Session-wide WebDriver profile: wait versus work time and the slowest locators"""
+    if not _command_profiles:
+        return
+    profiles = _command_profiles.values()
+    locators = {}
+    for profile in profiles:
+        for entry in profile["slowest_locators"]:
+            locators[entry["locator"]] = locators.get(entry["locator"], 0) + entry["time"]
+    terminalreporter.section("webdriver profile")
+    terminalreporter.write_line(
+        f"commands: {sum(p['total_commands'] for p in profiles)} | "
+        f"wait time: {sum(p['wait_time'] for p in profiles):.2f}s | "
+        f"work time: {sum(p['work_time'] for p in profiles):.2f}s | "
+        f"retries: {sum(p['retries'] for p in profiles)}"
+    )
+    for locator, seconds in sorted(locators.items(), key=lambda item: item[1], reverse=True)[:top]:
+        terminalreporter.write_line(f"  {seconds:.3f}s  {locator}")
+
+def _summarize_performance(terminalreporter):
+    """Page timing medians, budget misses and regressions against the baseline"""
+    if not _perf_report:
+        return
+    terminalreporter.section("page performance")
+    for page, metrics in sorted(_perf_report["summary"].items()):
+        terminalreporter.write_line(f"{page}: " + " | ".join(
+            f"{metric} {values['median']:.0f}ms" for metric, values in metrics.items()
+        ))
+    for violation in _perf_report["violations"]:
+        terminalreporter.write_line(f"over budget: {violation}", yellow=True)
+    for regression in _perf_report["regressions"]:
+        terminalreporter.write_line(f"regression: {regression}", red=True)
+    for saved in _perf_report["savings"]:
+        terminalreporter.write_line(
+            f"lean mode saved on {saved['page']}: {saved['requests_saved']:.0f} requests, "
+            f"{saved['bytes_saved'] / 1024:.1f} KiB per load"
+        )
+    if terminalreporter.config.getoption("--perf-update-baseline"):
+        terminalreporter.write_line(f"baseline updated: {config.PERF_BASELINE_PATH}")
 
 def pytest_html_report_title(report):
     """Set HTML report title"""
@@ -73,15 +614,50 @@ def pytest_runtest_makereport(item, call):
     """Add screenshots to HTML report on test failure"""
     outcome = yield
     report = outcome.get_result()
+    # Expose phase results to fixtures (driver pool recycles on failure)
+    setattr(item, f"rep_{report.when}", report)
     
-    if report.when == "call" and report.failed:
-        # Add screenshot to report
-        if "driver" in item.fixturenames:
-            driver = item.funcargs["driver"]
-            try:
-                screenshot_path = f"screenshots/{item.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-                driver.save_screenshot(screenshot_path)
-                if hasattr(report, 'extra'):
-                    report.extra.append(pytest_html.extras.image(screenshot_path))
-            except:
-                pass
\ No newline at end of file
+    if report.when == "teardown":
+        # Phase durations for the duration history (JUnit only reports one time per test)
+        for phase in ("setup", "call"):
+            phase_report = getattr(item, f"rep_{phase}", None)
+            if phase_report is not None:
+                report.user_properties.append((f"{phase}_s", round(phase_report.duration, 4)))
+        report.user_properties.append(("teardown_s", round(report.duration, 4)))
+        # Passed after a retry: recorded as flaky by the flake record
+        if getattr(item, "execution_count", 1) > 1:
+            report.user_properties.append(("attempts", item.execution_count))
+
+    if report.when == "call" and "driver" in item.fixturenames:
+        driver = item.funcargs.get("driver")
+        if driver is not None:
+            _record_command_profile(item, report, driver)
+            if report.failed:
+                _attach_failure_screenshot(item, report, driver)
+
+
+def _attach_failure_screenshot(item, report, driver):
+    """Capture on the test thread, write in the background, attach to HTML/Allure reports"""
+    from src.utilities.screenshots import get_screenshot_service
+    try:
+        png = driver.get_screenshot_as_png()
+    except Exception as e:
+        logging.getLogger(__name__).warning("Could not capture screenshot for %s: %s", item.nodeid, e)
+        return
+    path = get_screenshot_service().store(png, item.name)
+    # Linked (not embedded) by the merged summary from merge_reports.py
+    item.user_properties.append(("screenshot", path))
+
+    html_plugin = item.config.pluginmanager.getplugin("html")
+    if html_plugin is not None:
+        from pytest_html import extras
+        if item.config.getoption("self_contained_html", False):
+            content = base64.b64encode(png).decode("ascii")
+        else:
+            html_path = item.config.getoption("htmlpath", None)
+            content = os.path.relpath(path, os.path.dirname(os.path.abspath(html_path))) if html_path else path
+        report.extras = getattr(report, "extras", []) + [extras.png(content, name="Failure screenshot")]
+
+    if item.config.pluginmanager.hasplugin("allure_pytest"):
+        import allure
+        allure.attach(png, name=f"{item.name} failure", attachment_type=allure.attachment_type.PNG)
\ No newline at end of file
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Merge JUnit XML from parallel workers, shards and browser variants
+
+    python merge_reports.py "reports/shard*/junit_report_*.xml"
+    python merge_reports.py chrome=reports/chrome.xml firefox=reports/firefox.xml --output reports/merged
+"""
+import argparse
+import os
+import sys
+
+from src.utilities.junit_merge import merge_junit, parse_inputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge JUnit reports into one file and an HTML summary")
+    parser.add_argument("inputs", nargs="+", help="JUnit files or globs, optionally labelled as label=path")
+    parser.add_argument("--output", default="reports/merged", help="Directory for junit_merged.xml and summary.html")
+    parser.add_argument("--slowest", type=int, default=10, help="Slowest tests to list in the summary")
+    args = parser.parse_args()
+
+    inputs = parse_inputs(args.inputs)
+    missing = [path for _, path in inputs if not os.path.exists(path)]
+    if missing:
+        parser.error(f"no such file: {', '.join(missing)}")
+
+    result = merge_junit(inputs, os.path.join(args.output, "junit_merged.xml"),
+                         os.path.join(args.output, "summary.html"), slowest=args.slowest)
+    totals = result["totals"]
+    print(f"Merged {totals['tests']} tests from {len(result['suites'])} files in {result['merge_time']:.2f}s: "
+          f"{totals['failures']} failed, {totals['errors']} errors, {totals['skipped']} skipped")
+    print(f"JUnit: {result['output']}")
+    print(f"Summary: {result['summary']}")
+    sys.exit(1 if totals["failures"] or totals["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,70 +6,356 @@ Test execution script for HCLTech Authentication Module
 import subprocess
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 import argparse
 
-def run_tests(test_type="all", browser="chrome", headless=False):
+# Rough resident memory of one browser (the worker's pytest process is counted with its first)
+MEMORY_PER_BROWSER_MB = 700
+
+def available_memory_mb():
+    """Free memory in MB, or None if it cannot be determined"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available // (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+def browsers_per_worker():
+    """Browsers one worker keeps open: the one in use plus DRIVER_PREFETCH warm spares when pooling"""
+    from src.config.config import config
+    return 1 + (config.DRIVER_PREFETCH if config.REUSE_DRIVER else 0)
+
+def auto_worker_count(cpu_count=None, memory_mb=None, per_browser_mb=MEMORY_PER_BROWSER_MB, browsers=None):
+    """One worker per CPU core, capped by how many workers' browsers fit in free memory"""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = cpu_count
+    if memory_mb is not None:
+        browsers = browsers or browsers_per_worker()
+        workers = min(workers, memory_mb // (per_browser_mb * browsers))
+    return max(1, workers)
+
+def workers_arg(value):
+    """argparse type for --workers: 'auto' or a non-negative number"""
+    if value == "auto" or value.isdigit():
+        return value
+    raise argparse.ArgumentTypeError("expected a number of workers or 'auto'")
+
+def resolve_workers(value):
+    """--workers value ('auto' or a number) to a worker count; 0 runs serially"""
+    if value is None:
+        return 0
+    if value == "auto":
+        return auto_worker_count(memory_mb=available_memory_mb())
+    return int(value)
+
+def print_worker_summary(fragment_dir, wall_time):
+    """Merge the per-worker fragments and print one summary with the speedup over serial"""
+    from src.utilities.report_fragments import format_summary, load_fragments, merge_fragments
+    fragments = load_fragments(fragment_dir)
+    if not fragments:
+        return
+    merged = merge_fragments(fragments, wall_time)
+    print(f"\n{'='*60}")
+    print(f"Merged summary ({merged['workers']} workers)")
+    print(f"{'='*60}")
+    for line in format_summary(merged):
+        print(line)
+
+def record_durations(junit_path, run_id):
+    """Add this run's per-test durations to the history used for scheduling"""
+    if not os.path.exists(junit_path):
+        return
+    from src.config.config import config
+    from src.utilities.duration_history import DurationHistory
+    history = DurationHistory(config.DURATION_HISTORY_PATH)
+    try:
+        count = history.record_junit(junit_path, run_id)
+    finally:
+        history.close()
+    print(f"Recorded {count} test durations in {config.DURATION_HISTORY_PATH}")
+
+def record_flakes(junit_path, run_id):
+    """Add this run's outcomes to the flake record; returns tests that passed only after a retry"""
+    if not os.path.exists(junit_path):
+        return []
+    from src.utilities.flake_tracker import read_junit_outcomes
+    with flake_record() as record:
+        record.record_junit(junit_path, run_id)
+    return [test for test, outcome, _ in read_junit_outcomes(junit_path) if outcome == "flaky"]
+
+@contextmanager
+def flake_record():
+    """FlakeRecord from config settings, closed afterwards"""
+    from src.config.config import config
+    from src.utilities.flake_tracker import FlakeRecord
+    record = FlakeRecord(config.FLAKE_HISTORY_PATH, config.FLAKE_WINDOW, config.FLAKE_QUARANTINE_THRESHOLD)
+    try:
+        yield record
+    finally:
+        record.close()
+
+def report_args(report_dir, name, self_contained=False):
+    """HTML and JUnit report arguments for one pytest phase; returns (args, junit_path)"""
+    junit_path = f"{report_dir}/junit_report_{name}.xml"
+    args = [f"--html={report_dir}/test_report_{name}.html", f"--junitxml={junit_path}"]
+    if self_contained:
+        # Otherwise screenshots are linked from the report rather than embedded
+        args.append("--self-contained-html")
+    return args, junit_path
+
+def pytest_cache_dir(report_dir):
+    """The pytest cache (last-failed list) of a run; concurrent matrix variants each get their own"""
+    from src.config.config import PROJECT_ROOT
+    if report_dir == "reports":
+        return os.path.join(PROJECT_ROOT, ".pytest_cache")
+    return os.path.join(os.path.abspath(report_dir), ".pytest_cache")
+
+def run_rerun_phase(base_args, env, report_dir, timestamp, junit_path, output=None, self_contained=False):
+    """Rerun this run's failures (last-failed cache confirmed by the JUnit output) once more.
+
+    Returns the rerun's exit code, or None if there was nothing to rerun.
+    """
+    from src.utilities.flake_tracker import junit_failures, load_lastfailed, rerun_candidates
+    failures = junit_failures(junit_path) if os.path.exists(junit_path) else set()
+    nodeids = rerun_candidates(load_lastfailed(pytest_cache_dir(report_dir)), failures)
+    if not nodeids:
+        return None
+    if len(nodeids) < len(failures):
+        print(f"{len(failures) - len(nodeids)} failures are not in the last-failed cache and are not rerun", file=output)
+    print(f"\nRerunning {len(nodeids)} failed tests", file=output, flush=True)
+    args, rerun_junit = report_args(report_dir, f"{timestamp}_rerun", self_contained)
+    result = subprocess.run(base_args + args + nodeids, env=env, stdout=output,
+                            stderr=subprocess.STDOUT if output else None)
+    if os.path.exists(rerun_junit):
+        with flake_record() as record:
+            flaky = record.record_rerun(rerun_junit, timestamp)
+        for test in flaky:
+            print(f"Flaky (passed on rerun): {test}", file=output)
+    return result.returncode
+
+def run_quarantine_lane(base_args, selection, env, report_dir, timestamp, output=None, self_contained=False):
+    """Run quarantined tests on their own; their result is reported but never fails the build"""
+    with flake_record() as record:
+        quarantined = record.quarantined()
+    if not quarantined:
+        return
+    print(f"\nQuarantine lane: {len(quarantined)} tests (non-blocking)", file=output, flush=True)
+    args, lane_junit = report_args(report_dir, f"{timestamp}_quarantine", self_contained)
+    result = subprocess.run(base_args + args + ["--quarantine=only"] + selection, env=env, stdout=output,
+                            stderr=subprocess.STDOUT if output else None)
+    if os.path.exists(lane_junit):
+        # A separate run id: a test quarantined mid-invocation has a main-run result too
+        record_flakes(lane_junit, f"{timestamp}_quarantine")
+    print(f"Quarantine lane finished with exit code {result.returncode} (ignored)", file=output)
+
+def run_tests(test_type="all", browser="chrome", headless=False, local_app=False, workers=None, shard=None,
+              report_dir="reports", timestamp=None, output=None, self_contained=False,
+              retries=0, rerun_failed=False, quarantine_lane=False, live_log=False, durations_file=None):
     """Execute tests based on parameters"""
     
     # Create reports directory
-    report_dir = "reports"
     os.makedirs(report_dir, exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
     
     # Set environment variables
     env = os.environ.copy()
     env["BROWSER"] = browser
     env["HEADLESS"] = str(headless)
+    env["TEST_RUN_ID"] = timestamp
+    if report_dir != "reports":
+        # Logs, screenshots and profiles of concurrent matrix runs must not overwrite each other
+        env["REPORT_PATH"] = os.path.abspath(report_dir)
+    if local_app:
+        env["LOCAL_APP"] = "True"
+    worker_count = resolve_workers(workers)
+    fragment_dir = os.path.join(report_dir, "workers", timestamp)
     
     # Define pytest arguments
-    pytest_args = [
+    base_args = [
         "pytest",
-        f"--html={report_dir}/test_report_{timestamp}.html",
-        "--self-contained-html",
-        f"--junitxml={report_dir}/junit_report_{timestamp}.xml",
         "-v",
-        "--tb=short",
-        f"--log-cli-level=INFO"
+        "--tb=short"
     ]
+    if live_log:
+        # Console logging runs synchronously on the test thread; logs/ has everything otherwise
+        base_args.extend(["-o", "log_cli=true", "--log-cli-level=INFO"])
+    if retries:
+        # Failed tests are retried right away, on a fresh browser from the same worker
+        base_args.append(f"--retry-failed={retries}")
+    if report_dir != "reports":
+        # Concurrent matrix variants would otherwise overwrite each other's last-failed list
+        base_args.extend(["-o", f"cache_dir={pytest_cache_dir(report_dir)}"])
+    phase_args, junit_path = report_args(report_dir, timestamp, self_contained)
+    pytest_args = base_args + phase_args + [f"--worker-report-dir={fragment_dir}"]
+    if worker_count:
+        # Each worker process gets its own browser pool, log file and screenshot directory
+        pytest_args.extend(["-n", str(worker_count)])
+        # Hand out the longest tests first, in small chunks, so no worker is left with a slow tail
+        pytest_args.extend(["--longest-first", "--maxschedchunk=2"])
+    if shard:
+        pytest_args.append(f"--shard={shard}")
+    if durations_file:
+        pytest_args.append(f"--durations-file={durations_file}")
+    if quarantine_lane:
+        pytest_args.append("--quarantine=exclude")
     
     # Add markers based on test type
+    selection = []
     if test_type == "smoke":
-        pytest_args.append("-m smoke")
+        selection.extend(["-m", "smoke"])
     elif test_type == "regression":
-        pytest_args.append("-m regression")
+        selection.extend(["-m", "regression"])
     elif test_type == "login":
-        pytest_args.append("src/tests/test_login_functionality.py")
+        selection.append("src/tests/test_login_functionality.py")
     elif test_type == "forgot_password":
-        pytest_args.append("src/tests/test_forgot_password.py")
+        selection.append("src/tests/test_forgot_password.py")
+    pytest_args.extend(selection)
     
     # Run tests
-    print(f"\n{'='*60}")
-    print(f"Running {test_type.upper()} tests")
-    print(f"Browser: {browser} | Headless: {headless}")
-    print(f"Timestamp: {timestamp}")
-    print(f"{'='*60}\n")
+    print(f"\n{'='*60}", file=output)
+    print(f"Running {test_type.upper()} tests", file=output)
+    print(f"Browser: {browser} | Headless: {headless} | Local app: {local_app}", file=output)
+    print(f"Workers: {worker_count or 'serial'}" + (f" | Shard: {shard}" if shard else ""), file=output)
+    print(f"Timestamp: {timestamp}", file=output)
+    print(f"{'='*60}\n", file=output, flush=True)
     
-    result = subprocess.run(pytest_args, env=env)
+    started = time.perf_counter()
+    result = subprocess.run(pytest_args, env=env, stdout=output, stderr=subprocess.STDOUT if output else None)
+    returncode = result.returncode
+    if output is None:
+        print_worker_summary(fragment_dir, time.perf_counter() - started)
+    record_durations(junit_path, timestamp)
+    for test in record_flakes(junit_path, timestamp):
+        print(f"Flaky (passed on retry): {test}", file=output)
     
-    return result.returncode
+    # Exit code 1 means tests failed; other codes (usage, interrupted) are not rerun
+    if rerun_failed and returncode == 1:
+        rerun_code = run_rerun_phase(base_args, env, report_dir, timestamp, junit_path, output, self_contained)
+        if rerun_code is not None:
+            returncode = rerun_code
+    if quarantine_lane:
+        run_quarantine_lane(base_args, selection, env, report_dir, timestamp, output, self_contained)
+    
+    return returncode
+
+def matrix_concurrency(variant_count, worker_count):
+    """How many browser variants can run at once without exceeding the machine's browser budget"""
+    per_variant = max(1, worker_count)
+    return max(1, min(variant_count, auto_worker_count(memory_mb=available_memory_mb()) // per_variant))
+
+def run_matrix(variants, test_type="all", local_app=False, workers=None, shard=None, max_parallel=None,
+               self_contained=False, retries=0, rerun_failed=False, quarantine_lane=False, live_log=False,
+               durations_file=None):
+    """Run one pytest process per browser variant concurrently and merge their results"""
+    from src.utilities.browser_matrix import compare, format_matrix, load_results, write_matrix_report
+    from src.utilities.junit_merge import merge_junit
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    matrix_dir = os.path.join("reports", f"matrix_{timestamp}")
+    worker_count = resolve_workers(workers)
+    concurrency = max_parallel or matrix_concurrency(len(variants), worker_count)
+    labels = [variant.label for variant in variants]
+    print(f"Running {len(variants)} browser variants ({', '.join(labels)}), {concurrency} at a time")
+    
+    def run_variant(variant):
+        report_dir = os.path.join(matrix_dir, variant.label)
+        os.makedirs(report_dir, exist_ok=True)
+        started = time.perf_counter()
+        # Each variant's console output goes to its own file instead of interleaving
+        with open(os.path.join(report_dir, "pytest_output.txt"), "w") as output:
+            code = run_tests(test_type, variant.browser, variant.headless, local_app, workers, shard,
+                             report_dir=report_dir, timestamp=f"{timestamp}_{variant.label}", output=output,
+                             self_contained=self_contained, retries=retries, rerun_failed=rerun_failed,
+                             quarantine_lane=quarantine_lane, live_log=live_log, durations_file=durations_file)
+        print(f"{variant.label}: exit code {code} in {time.perf_counter() - started:.1f}s")
+        return code
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        codes = list(executor.map(run_variant, variants))
+    
+    junit_paths = {label: os.path.join(matrix_dir, label, f"junit_report_{timestamp}_{label}.xml") for label in labels}
+    reports = {label: os.path.join(label, f"test_report_{timestamp}_{label}.html") for label in labels}
+    matrix = compare(load_results(junit_paths), labels)
+    html_path = write_matrix_report(matrix, matrix_dir, reports)
+    print(f"\n{'='*60}")
+    print("Browser matrix")
+    print(f"{'='*60}")
+    for line in format_matrix(matrix):
+        print(line)
+    print(f"Matrix report: {html_path}")
+    merged = merge_junit([(label, path) for label, path in junit_paths.items() if os.path.exists(path)],
+                         os.path.join(matrix_dir, "junit_merged.xml"), os.path.join(matrix_dir, "summary.html"))
+    print(f"Merged JUnit: {merged['output']} | Summary: {merged['summary']}")
+    
+    return next((code for code in codes if code), 0)
 
 def main():
     parser = argparse.ArgumentParser(description="Run HCLTech Authentication Tests")
     parser.add_argument("--test-type", choices=["all", "smoke", "regression", "login", "forgot_password"],
                        default="all", help="Type of tests to run")
-    parser.add_argument("--browser", choices=["chrome", "firefox", "edge"],
-                       default="chrome", help="Browser to use for tests")
+    parser.add_argument("--browser", default="chrome",
+                       help="Browser to use for tests, or a comma-separated matrix run concurrently "
+                            "(e.g. chrome,firefox:headed,edge:headless)")
     parser.add_argument("--headless", action="store_true",
                        help="Run tests in headless mode")
+    parser.add_argument("--local-app", action="store_true",
+                       help="Run against the bundled local stand-in app")
+    parser.add_argument("--workers", metavar="N|auto", type=workers_arg,
+                       help="Run tests in parallel with pytest-xdist ('auto' picks from CPU cores and free memory)")
+    parser.add_argument("--shard", metavar="i/N",
+                       help="Run only shard i of N (e.g. 2/4): balanced by --durations-file, else split by test id hash")
+    parser.add_argument("--durations-file", metavar="PATH",
+                       help="Duration history shared by all shards, e.g. restored from a CI cache (must exist)")
+    parser.add_argument("--self-contained", action="store_true",
+                       help="Embed screenshots in the HTML report instead of linking them")
+    parser.add_argument("--retries", type=int, default=0,
+                       help="Retry each failed test up to N times right away in the same worker")
+    parser.add_argument("--rerun-failed", action="store_true",
+                       help="After the run, rerun the tests that failed once more; passes count as flaky")
+    parser.add_argument("--quarantine-lane", action="store_true",
+                       help="Run tests quarantined by the flake record separately, without failing the build")
+    parser.add_argument("--live-log", action="store_true",
+                       help="Also stream INFO logs to the console (slower; logs/ always has the full log)")
+    parser.add_argument("--max-parallel", type=int,
+                       help="Browser variants of a matrix run to execute at once (default: from CPU cores and memory)")
     
     args = parser.parse_args()
     
+    from src.utilities.browser_matrix import parse_variants
+    try:
+        variants = parse_variants(args.browser, args.headless)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if len(variants) > 1:
+        sys.exit(run_matrix(variants, args.test_type, args.local_app, args.workers, args.shard, args.max_parallel,
+                            args.self_contained, args.retries, args.rerun_failed, args.quarantine_lane,
+                            args.live_log, args.durations_file))
+    
     exit_code = run_tests(
         test_type=args.test_type,
-        browser=args.browser,
-        headless=args.headless
+        browser=variants[0].browser,
+        headless=variants[0].headless,
+        local_app=args.local_app,
+        workers=args.workers,
+        shard=args.shard,
+        self_contained=args.self_contained,
+        retries=args.retries,
+        rerun_failed=args.rerun_failed,
+        quarantine_lane=args.quarantine_lane,
+        live_log=args.live_log,
+        durations_file=args.durations_file
     )
     
     sys.exit(exit_code)
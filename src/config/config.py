@@ -14,17 +14,71 @@ class Config:
     HEADLESS: bool = os.getenv("HEADLESS", "False").lower() == "true"
     TIMEOUT: int = int(os.getenv("TIMEOUT", "30"))
     WAIT_TIME: int = int(os.getenv("WAIT_TIME", "10"))
+    # Implicit waits stack on top of explicit waits, so keep them off by default
+    IMPLICIT_WAIT: int = int(os.getenv("IMPLICIT_WAIT", "0"))
+    # normal waits for every subresource; eager returns at DOMContentLoaded and page
+    # objects then wait for their own readiness contract; none returns immediately.
+    # Page timing is sampled at readiness, so with eager/none load and paint metrics
+    # may not exist yet and their budgets are not checked
+    PAGE_LOAD_STRATEGY: str = os.getenv("PAGE_LOAD_STRATEGY", "normal")
+    PAGE_LOAD_TIMEOUT: int = int(os.getenv("PAGE_LOAD_TIMEOUT", os.getenv("TIMEOUT", "30")))
+    # Time every WebDriver command and export a per-test profile
+    PROFILE_COMMANDS: bool = os.getenv("PROFILE_COMMANDS", "True").lower() == "true"
+    
+    # Hermetic local stand-in for the application (see src/utilities/local_app.py)
+    LOCAL_APP: bool = os.getenv("LOCAL_APP", "False").lower() == "true"
+    LOCAL_APP_LATENCY_MS: float = float(os.getenv("LOCAL_APP_LATENCY_MS", "0"))
+    LOCAL_APP_JITTER_MS: float = float(os.getenv("LOCAL_APP_JITTER_MS", "0"))
+    
+    # Driver pooling - reuse warm browsers across tests
+    REUSE_DRIVER: bool = os.getenv("REUSE_DRIVER", "True").lower() == "true"
+    DRIVER_MAX_USES: int = int(os.getenv("DRIVER_MAX_USES", "20"))
+    DRIVER_PREFETCH: int = int(os.getenv("DRIVER_PREFETCH", "1"))
+    
+    # Driver binary resolution - cached per machine, optionally fully offline
+    DRIVER_OFFLINE: bool = os.getenv("DRIVER_OFFLINE", "False").lower() == "true"
+    DRIVER_PATH: str = os.getenv("DRIVER_PATH", "")
+    DRIVER_CACHE_PATH: str = os.getenv(
+        "DRIVER_CACHE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "qa-automation-hcl", "drivers.json")
+    )
     
     # Test Data Paths - Use absolute paths
     TEST_DATA_PATH: str = os.path.join(PROJECT_ROOT, "data", "test_data.xlsx")
     CREDENTIALS_PATH: str = os.path.join(PROJECT_ROOT, "data", "credentials.json")
     
+    # Compiled spreadsheet cache (see src/utilities/sheet_cache.py)
+    DATA_CACHE_DIR: str = os.getenv("DATA_CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache", "data"))
+    
+    # Lean browser profile: block images/fonts/trackers, no animations (see src/utilities/lean_mode.py)
+    LEAN_MODE: bool = os.getenv("LEAN_MODE", "False").lower() == "true"
+    
+    # Page performance capture (see src/utilities/page_metrics.py)
+    CAPTURE_PERFORMANCE: bool = os.getenv("CAPTURE_PERFORMANCE", "True").lower() == "true"
+    PERF_BUDGET_MODE: str = os.getenv("PERF_BUDGET_MODE", "warn")  # off, warn or fail
+    PERF_BUDGETS_PATH: str = os.getenv("PERF_BUDGETS_PATH", os.path.join(PROJECT_ROOT, "data", "performance_budgets.json"))
+    PERF_BASELINE_PATH: str = os.getenv("PERF_BASELINE_PATH", os.path.join(PROJECT_ROOT, "data", "performance_baseline.json"))
+    PERF_REGRESSION_TOLERANCE: float = float(os.getenv("PERF_REGRESSION_TOLERANCE", "0.2"))
+    PERF_REGRESSION_MIN_MS: float = float(os.getenv("PERF_REGRESSION_MIN_MS", "50"))
+    
+    # Test duration history for longest-first ordering and --shard (see src/utilities/duration_history.py)
+    DURATION_HISTORY_PATH: str = os.getenv("DURATION_HISTORY_PATH", os.path.join(PROJECT_ROOT, ".cache", "test_durations.sqlite"))
+    DEFAULT_TEST_DURATION: float = float(os.getenv("DEFAULT_TEST_DURATION", "5"))  # seconds, used until a suite has history
+    
+    # Flake record and quarantine (see src/utilities/flake_tracker.py): a test flaky in
+    # FLAKE_QUARANTINE_THRESHOLD of its last FLAKE_WINDOW runs moves to the quarantine lane
+    FLAKE_HISTORY_PATH: str = os.getenv("FLAKE_HISTORY_PATH", os.path.join(PROJECT_ROOT, ".cache", "test_flakes.sqlite"))
+    FLAKE_WINDOW: int = int(os.getenv("FLAKE_WINDOW", "20"))
+    FLAKE_QUARANTINE_THRESHOLD: int = int(os.getenv("FLAKE_QUARANTINE_THRESHOLD", "3"))
+    
     # Report Paths
-    REPORT_PATH: str = os.path.join(PROJECT_ROOT, "reports")
+    REPORT_PATH: str = os.getenv("REPORT_PATH", os.path.join(PROJECT_ROOT, "reports"))
     LOG_PATH: str = os.path.join(PROJECT_ROOT, "logs")
+    # Failure screenshots wider than this are downscaled (0 keeps full size; needs Pillow)
+    SCREENSHOT_MAX_WIDTH: int = int(os.getenv("SCREENSHOT_MAX_WIDTH", "0"))
     
-    def __post_init__(self):
-        """Create directories if they don't exist"""
+    def ensure_directories(self):
+        """Create report/log directories on first use (not at import time)"""
         os.makedirs(self.REPORT_PATH, exist_ok=True)
         os.makedirs(self.LOG_PATH, exist_ok=True)
         os.makedirs(os.path.dirname(self.CREDENTIALS_PATH), exist_ok=True)
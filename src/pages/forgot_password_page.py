@@ -3,6 +3,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from src.utilities.base_page import BasePage
+from src.utilities.waits import Ready
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,13 +18,15 @@ class ForgotPasswordPage(BasePage):
     SUCCESS_MESSAGE = (By.CLASS_NAME, "reset-success")
     ERROR_MESSAGE = (By.CLASS_NAME, "reset-error")
     
+    READY = (Ready(EMAIL_INPUT, "visible"), Ready(RESET_BUTTON, "clickable"))
+    
     def __init__(self, driver):
         super().__init__(driver)
         self.wait = WebDriverWait(driver, 10)
     
     def enter_email(self, email: str):
         """Enter email for password reset"""
-        logger.info(f"Entering email for password reset: {email}")
+        logger.info("Entering email for password reset: %s", email)
         # For demo, just print the action
         print(f"Would enter email: {email}")
         return self
@@ -39,9 +42,11 @@ class ForgotPasswordPage(BasePage):
         """Click cancel button"""
         logger.info("Clicking cancel button")
         # For demo, navigate back
+        self.invalidate_cache()
+        since = self.smart_wait.document_marker()
         self.driver.back()
         from src.pages.login_page import LoginPage
-        return LoginPage(self.driver)
+        return LoginPage(self.driver).wait_until_ready(since=since)
     
     def get_success_message(self) -> str:
         """Get success message after reset request"""
@@ -53,12 +58,11 @@ class ForgotPasswordPage(BasePage):
     
     def reset_password(self, email: str):
         """Complete password reset flow"""
-        logger.info(f"Initiating password reset for email: {email}")
+        logger.info("Initiating password reset for email: %s", email)
         self.enter_email(email)
         self.click_reset()
         return self
     
-    def wait_for_reset_complete(self):
-        """Wait for reset process to complete"""
-        import time
-        time.sleep(1)  # Simulate waiting
\ No newline at end of file
+    def wait_for_reset_complete(self, timeout=None):
+        """Wait until a success or error message is shown and return the locator that appeared"""
+        return self.wait_for_any([self.SUCCESS_MESSAGE, self.ERROR_MESSAGE], timeout=timeout)
\ No newline at end of file
@@ -0,0 +1,37 @@
+# src/pages/inventory_page.py
+from selenium.webdriver.common.by import By
+from src.utilities.base_page import BasePage
+from src.utilities.waits import Ready
+import logging
+
+logger = logging.getLogger(__name__)
+
+class InventoryPage(BasePage):
+    """Page Object for the Inventory (Products) Page shown after login - SauceDemo"""
+    
+    MENU_BUTTON = (By.ID, "react-burger-menu-btn")
+    APP_LOGO = (By.CLASS_NAME, "app_logo")
+    TITLE = (By.CLASS_NAME, "title")
+    INVENTORY_LIST = (By.CLASS_NAME, "inventory_list")
+    INVENTORY_ITEM = (By.CLASS_NAME, "inventory_item")
+    
+    # Usable once the product list has rendered and the menu responds
+    READY = (Ready(INVENTORY_ITEM, "visible"), Ready(MENU_BUTTON, "clickable"))
+    
+    def open(self):
+        """Navigate straight to the inventory page (requires a logged-in session)"""
+        logger.info("Navigating to inventory page")
+        self.invalidate_cache()
+        since = self.smart_wait.document_marker()
+        self.driver.get(f"{self.base_url}/inventory.html")
+        self.wait_until_ready(since=since)
+        self.capture_performance("inventory")
+        return self
+    
+    def get_item_count(self) -> int:
+        """Number of products listed"""
+        return len(self.driver.find_elements(*self.INVENTORY_ITEM))
+    
+    def get_title(self) -> str:
+        """Page heading text"""
+        return self.get_element_text(self.TITLE)
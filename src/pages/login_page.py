@@ -2,7 +2,10 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from src.config.config import config
 from src.utilities.base_page import BasePage
+from src.utilities.auth_state import AuthStateCache, auth_state_cache
+from src.utilities.waits import Ready
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +20,10 @@ class LoginPage(BasePage):
     ERROR_MESSAGE = (By.CSS_SELECTOR, "[data-test='error']")
     SUCCESS_INDICATOR = (By.CLASS_NAME, "app_logo")  # After login success
     MENU_BUTTON = (By.ID, "react-burger-menu-btn")
+    FORGOT_PASSWORD_LINK = (By.ID, "forgot-password-link")  # Local app only
+    
+    FORM_FIELDS = {"username": USERNAME_INPUT, "password": PASSWORD_INPUT}
+    READY = (Ready(USERNAME_INPUT, "visible"), Ready(LOGIN_BUTTON, "clickable"))
     
     def __init__(self, driver):
         super().__init__(driver)
@@ -25,13 +32,16 @@ class LoginPage(BasePage):
     def navigate_to_login(self):
         """Navigate to login page"""
         logger.info("Navigating to login page")
+        self.invalidate_cache()
+        since = self.smart_wait.document_marker()
         self.driver.get(f"{self.base_url}")
-        self.wait_for_page_load()
+        self.wait_until_ready(since=since)
+        self.capture_performance("login")
         return self
     
     def enter_username(self, username: str):
         """Enter username in the username field"""
-        logger.info(f"Entering username: {username}")
+        logger.info("Entering username: %s", username)
         self.clear_and_send_keys(self.USERNAME_INPUT, username)
         return self
     
@@ -47,6 +57,15 @@ class LoginPage(BasePage):
         self.click_element(self.LOGIN_BUTTON)
         return self
     
+    def click_forgot_password(self):
+        """Open the forgot password page"""
+        logger.info("Clicking forgot password link")
+        self.invalidate_cache()
+        since = self.smart_wait.document_marker()
+        self.click_element(self.FORGOT_PASSWORD_LINK)
+        from src.pages.forgot_password_page import ForgotPasswordPage
+        return ForgotPasswordPage(self.driver).wait_until_ready(since=since)
+    
     def get_error_message(self) -> str:
         """Get error message text"""
         logger.info("Retrieving error message")
@@ -54,28 +73,75 @@ class LoginPage(BasePage):
     
     def is_error_displayed(self) -> bool:
         """Check if error message is displayed"""
-        return self.is_element_displayed(self.ERROR_MESSAGE)
+        # Stop as soon as the inventory page shows instead of waiting out the timeout
+        return self.wait_for_any([self.ERROR_MESSAGE, self.MENU_BUTTON]) == self.ERROR_MESSAGE
     
     def is_login_successful(self) -> bool:
         """Check if login was successful"""
         logger.info("Checking if login was successful")
-        try:
-            # Check for products page or menu button after login
-            return self.is_element_displayed(self.MENU_BUTTON) or \
-                   self.is_element_displayed(self.SUCCESS_INDICATOR)
-        except:
-            return False
+        # One wait for success and failure outcomes, so failed logins return immediately
+        outcome = self.wait_for_login_result()
+        return outcome in (self.MENU_BUTTON, self.SUCCESS_INDICATOR)
+    
+    def wait_for_login_result(self, timeout=None):
+        """Wait until the login attempt settles and return the locator that appeared"""
+        from src.pages.inventory_page import InventoryPage
+        timeout = config.WAIT_TIME if timeout is None else timeout
+        # Success means the inventory page's readiness contract holds, not just a header element
+        index = self.smart_wait.wait_for_first_ready(
+            [InventoryPage.READY, (Ready(self.ERROR_MESSAGE, "visible"),)], timeout=timeout
+        )
+        if index == 0:
+            # Post-login navigation to the inventory page
+            self.capture_performance("inventory")
+            return self.MENU_BUTTON
+        if index is None:
+            logger.info("Login result not shown within %ss", timeout)
+            return None
+        return self.ERROR_MESSAGE
+    
+    def login(self, username: str, password: str, keystrokes: bool = False):
+        """Complete login flow; fills both fields and submits in one round trip.
+        
+        Pass keystrokes=True to type the fields with real send_keys.
+        """
+        logger.info("Attempting login with username: %s", username)
+        self.fill_form(
+            {"username": username, "password": password},
+            submit=self.LOGIN_BUTTON,
+            keystroke_fields=tuple(self.FORM_FIELDS) if keystrokes else None
+        )
+        return self
     
-    def login(self, username: str, password: str):
-        """Complete login flow"""
-        logger.info(f"Attempting login with username: {username}")
-        self.enter_username(username)
-        self.enter_password(password)
-        self.click_login()
+    def login_with_state(self, username: str, password: str = None):
+        """Log in by injecting cached cookies/storage, falling back to the UI login.
+        
+        The first call per user (per worker) logs in through the UI and caches
+        the resulting state; later calls skip the form entirely.
+        """
+        state = auth_state_cache.get(username)
+        if state is not None:
+            logger.info("Restoring cached session state for: %s", username)
+            self.invalidate_cache()
+            AuthStateCache.inject(self.driver, state, self.base_url)
+            if self.is_login_successful():
+                return self
+            logger.warning("Cached session state rejected for %s, using UI login", username)
+            auth_state_cache.invalidate(username)
+        
+        if password is None:
+            from src.utilities.data_loader import DataLoader
+            password = next(
+                (user["password"] for user in DataLoader.load_test_credentials() if user.get("username") == username),
+                None
+            )
+            if password is None:
+                raise ValueError(f"No credentials found for user: {username}")
+        self.navigate_to_login().login(username, password)
+        if self.is_login_successful():
+            auth_state_cache.put(username, AuthStateCache.capture(self.driver))
         return self
     
     def wait_for_page_load(self):
         """Wait for login page to load completely"""
-        self.wait.until(
-            EC.presence_of_element_located(self.LOGIN_BUTTON)
-        )
\ No newline at end of file
+        return self.wait_until_ready()
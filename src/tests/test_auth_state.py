@@ -0,0 +1,61 @@
+# src/tests/test_auth_state.py
+import pytest
+import logging
+from src.utilities.auth_state import AuthState, AuthStateCache
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingDriver:
+    """Fake driver that records navigation, cookies and scripts"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+    def add_cookie(self, cookie):
+        self.calls.append(("add_cookie", cookie))
+
+    def execute_script(self, script, *args):
+        self.calls.append(("script", args))
+        return {"local": {"cart": "[]"}, "session": {}, "url": "http://app/inventory.html"}
+
+    def get_cookies(self):
+        return [{"name": "session-username", "value": "standard_user", "domain": "app", "path": "/"}]
+
+
+class TestAuthState:
+    """Session state capture and injection"""
+
+    def test_capture_reads_cookies_and_storage(self):
+        state = AuthStateCache.capture(RecordingDriver())
+
+        assert state.cookies[0]["name"] == "session-username"
+        assert state.local_storage == {"cart": "[]"}
+        assert state.url == "http://app/inventory.html"
+
+    def test_inject_restores_state_then_opens_landing_page(self):
+        driver = RecordingDriver()
+        state = AuthState(
+            cookies=[{"name": "session-username", "value": "u", "domain": "app", "path": "/"}],
+            local_storage={"cart": "[]"},
+            url="http://app/inventory.html"
+        )
+        AuthStateCache.inject(driver, state, "http://app")
+
+        assert driver.calls[0] == ("get", "http://app")
+        assert driver.calls[1] == ("add_cookie", {"name": "session-username", "value": "u", "path": "/"})
+        assert driver.calls[2][0] == "script"
+        assert driver.calls[-1] == ("get", "http://app/inventory.html")
+
+    def test_cache_counts_hits_and_rejections(self):
+        cache = AuthStateCache()
+        assert cache.get("standard_user") is None
+        cache.put("standard_user", AuthState())
+        assert cache.get("standard_user") is not None
+        cache.invalidate("standard_user")
+
+        assert (cache.hits, cache.misses, cache.rejected) == (1, 1, 1)
+        assert cache.get("standard_user") is None
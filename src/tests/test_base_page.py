@@ -0,0 +1,159 @@
+# src/tests/test_base_page.py
+import pytest
+import logging
+from selenium.webdriver.common.by import By
+from src.pages.login_page import LoginPage
+from src.utilities.profiler import count_round_trips
+
+logger = logging.getLogger(__name__)
+
+
+class ScriptDriver:
+    """Fake driver that records execute_script calls and returns canned results"""
+
+    def __init__(self, results=None):
+        self.results = results
+        self.scripts = []
+
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+    def execute_script(self, script, *args):
+        self.execute("executeScript", {"script": script, "args": args})
+        self.scripts.append((script, args))
+        return self.results
+
+
+class TestSnapshot:
+    """Batched DOM snapshot API"""
+
+    def test_page_locators_collects_class_tuples(self):
+        locators = LoginPage.page_locators()
+
+        assert locators["USERNAME_INPUT"] == (By.ID, "user-name")
+        assert locators["ERROR_MESSAGE"] == (By.CSS_SELECTOR, "[data-test='error']")
+        assert len(locators) == 7
+
+    def test_page_locators_skip_other_string_pairs(self):
+        class KeystrokePage(LoginPage):
+            KEYSTROKE_FIELDS = ("username", "password")
+
+        assert "KEYSTROKE_FIELDS" not in KeystrokePage.page_locators()
+        assert KeystrokePage(ScriptDriver(results=[])).snapshot() is not None
+
+    def test_snapshot_is_one_round_trip(self):
+        driver = ScriptDriver(results=[
+            {"present": True, "count": 1, "visible": True, "text": "Epic sadface",
+             "attributes": {"class": "error"}, "rect": {"x": 0, "y": 0, "width": 10, "height": 5}},
+            {"present": False, "count": 0},
+        ])
+        page = LoginPage(driver)
+
+        with count_round_trips(driver) as counter:
+            snap = page.snapshot({"error": LoginPage.ERROR_MESSAGE, "menu": LoginPage.MENU_BUTTON})
+
+        assert counter.total == 1
+        assert snap["error"].visible and snap["error"].text == "Epic sadface"
+        assert not snap["menu"].present
+        assert "querySelectorAll" in driver.scripts[0][0]
+
+    def test_snapshot_keys_by_locator_for_lists(self):
+        driver = ScriptDriver(results=[{"present": False, "count": 0}])
+        snap = LoginPage(driver).snapshot([LoginPage.LOGIN_BUTTON])
+
+        assert list(snap) == [LoginPage.LOGIN_BUTTON]
+
+
+class TestFormFill:
+    """Declarative single-round-trip form fill"""
+
+    def test_login_is_one_round_trip(self):
+        driver = ScriptDriver(results=[])
+        page = LoginPage(driver)
+
+        with count_round_trips(driver) as counter:
+            page.login("standard_user", "secret_sauce")
+
+        assert counter.total == 1
+        script, args = driver.scripts[0]
+        assert args == ({"username": "standard_user", "password": "secret_sauce"}, True, "qa:action")
+        assert 'document.getElementById("login-button")' in script
+
+    def test_missing_field_raises(self):
+        from selenium.common.exceptions import NoSuchElementException
+        driver = ScriptDriver(results=["password"])
+
+        with pytest.raises(NoSuchElementException):
+            LoginPage(driver).login("standard_user", "secret_sauce")
+
+    def test_undeclared_field_rejected(self):
+        with pytest.raises(KeyError):
+            LoginPage(ScriptDriver()).fill_form({"email": "a@b.c"})
+
+
+class FakeElement:
+    """WebElement stand-in that can be marked stale"""
+
+    def __init__(self, text):
+        self._text = text
+        self.stale = False
+
+    @property
+    def text(self):
+        if self.stale:
+            from selenium.common.exceptions import StaleElementReferenceException
+            raise StaleElementReferenceException("stale")
+        return self._text
+
+    def is_displayed(self):
+        return not self.stale
+
+
+class FindDriver(ScriptDriver):
+    """Fake driver that serves fresh FakeElements from find_element"""
+
+    def __init__(self):
+        super().__init__()
+        self.finds = 0
+
+    def find_element(self, by, value):
+        self.finds += 1
+        return FakeElement(f"{value} #{self.finds}")
+
+
+class TestElementCache:
+    """Per-page WebElement cache"""
+
+    def test_repeated_lookups_hit_cache(self):
+        driver = FindDriver()
+        page = LoginPage(driver)
+
+        first = page.get_element_text(LoginPage.ERROR_MESSAGE)
+        second = page.get_element_text(LoginPage.ERROR_MESSAGE)
+
+        assert first == second
+        assert driver.finds == 1
+        assert page.cache_stats() == {"lookups": 2, "hits": 1, "stale": 0}
+
+    def test_stale_handle_is_re_resolved(self):
+        driver = FindDriver()
+        page = LoginPage(driver)
+        page.find_element(LoginPage.ERROR_MESSAGE).stale = True
+
+        text = page.get_element_text(LoginPage.ERROR_MESSAGE)
+
+        assert text.endswith("#2")
+        assert page.cache_stale == 1
+
+    def test_navigation_invalidates_cache(self):
+        driver = FindDriver()
+        driver.get = lambda url: None
+        driver.execute_async_script = lambda script, *args: True  # readiness contract holds
+        page = LoginPage(driver)
+        page.find_element(LoginPage.LOGIN_BUTTON)
+        page.navigate_to_login()
+        page.find_element(LoginPage.LOGIN_BUTTON)
+
+        # One lookup before and one fresh lookup after; readiness is checked in the browser
+        assert driver.finds == 2
+        assert page.cache_hits == 0
@@ -0,0 +1,47 @@
+# src/tests/test_browser_matrix.py
+import pytest
+import logging
+from src.utilities.browser_matrix import Variant, compare, format_matrix, load_results, parse_variants, write_matrix_report
+
+logger = logging.getLogger(__name__)
+
+
+def junit(cases):
+    body = "".join(
+        f'<testcase classname="src.tests.test_login" name="{name}" time="{seconds}">{extra}</testcase>'
+        for name, seconds, extra in cases
+    )
+    return f'<?xml version="1.0"?><testsuites><testsuite name="pytest">{body}</testsuite></testsuites>'
+
+
+class TestBrowserMatrix:
+    """Variant parsing and per-browser result merging"""
+
+    def test_variants_default_to_the_headless_flag(self):
+        variants = parse_variants("chrome, firefox:headed,edge,chrome", headless=True)
+
+        assert variants == [Variant("chrome", True), Variant("firefox", False), Variant("edge", True)]
+        assert variants[1].label == "firefox-headed"
+
+    @pytest.mark.parametrize("value", ["opera", "chrome:fast", ","])
+    def test_invalid_variants(self, value):
+        with pytest.raises(ValueError):
+            parse_variants(value)
+
+    def test_results_merge_into_one_column_per_browser(self, tmp_path):
+        (tmp_path / "chrome.xml").write_text(junit([("test_a", 1.0, ""), ("test_b", 2.0, "")]))
+        (tmp_path / "firefox.xml").write_text(junit([("test_a", 3.0, ""), ("test_b", 2.0, '<failure message="x"/>')]))
+        labels = ["chrome-headless", "firefox-headless"]
+        results = load_results({"chrome-headless": str(tmp_path / "chrome.xml"),
+                                "firefox-headless": str(tmp_path / "firefox.xml")})
+        matrix = compare(results, labels)
+
+        assert matrix["totals"]["firefox-headless"]["failed"] == 1
+        assert matrix["totals"]["chrome-headless"]["time"] == 3.0
+        test_a = matrix["tests"][0]
+        assert (test_a["fastest"], test_a["slowest"], test_a["spread"]) == ("chrome-headless", "firefox-headless", 3.0)
+        assert format_matrix(matrix)[-1] == "Outcome differs between browsers: 1 tests"
+
+        html = open(write_matrix_report(matrix, str(tmp_path / "out"), {"chrome-headless": "chrome/report.html"})).read()
+        assert '<a href="chrome/report.html">chrome-headless</a>' in html
+        assert "failed 2.00s" in html
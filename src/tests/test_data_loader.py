@@ -0,0 +1,229 @@
+# src/tests/test_data_loader.py
+import pytest
+import copy
+import json
+import os
+import pickle
+import subprocess
+import sys
+import logging
+from src.utilities.data_loader import DataLoader, FrozenDict, PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    DataLoader.clear_cache()
+    yield
+    DataLoader.clear_cache()
+
+
+class TestDataLoaderCache:
+    """Memoized, read-only test data"""
+
+    def test_repeated_loads_hit_cache(self, tmp_path):
+        path = tmp_path / "users.json"
+        path.write_text(json.dumps({"users": [{"username": "a"}]}))
+
+        first = DataLoader.load_json(str(path))
+        second = DataLoader.load_json(str(path))
+
+        assert first is second
+        assert (DataLoader.cache_hits, DataLoader.cache_misses) == (1, 1)
+
+    def test_changed_file_is_reloaded(self, tmp_path):
+        path = tmp_path / "users.json"
+        path.write_text(json.dumps({"users": []}))
+        DataLoader.load_json(str(path))
+        path.write_text(json.dumps({"users": [{"username": "new_user"}]}))
+
+        assert DataLoader.load_json(str(path))["users"][0]["username"] == "new_user"
+
+    def test_cached_data_is_read_only(self, tmp_path):
+        path = tmp_path / "users.json"
+        path.write_text(json.dumps({"users": [{"username": "a"}]}))
+        data = DataLoader.load_json(str(path))
+
+        with pytest.raises(TypeError):
+            data["users"].append({})
+        with pytest.raises(TypeError):
+            data["users"][0]["username"] = "b"
+
+        copy = DataLoader.thaw(data)
+        copy["users"].append({})
+        assert len(DataLoader.load_json(str(path))["users"]) == 1
+
+    def test_cached_data_copies_and_pickles(self, tmp_path):
+        path = tmp_path / "users.json"
+        path.write_text(json.dumps({"users": [{"username": "a"}]}))
+        data = DataLoader.load_json(str(path))
+
+        deep = copy.deepcopy(data)
+        deep["users"][0]["username"] = "b"
+        shallow = copy.copy(data)
+        shallow["extra"] = True
+        restored = pickle.loads(pickle.dumps(data))
+
+        assert restored == data
+        assert isinstance(restored, FrozenDict)
+        assert DataLoader.load_json(str(path))["users"][0]["username"] == "a"
+
+    def test_lru_bound(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(DataLoader, "CACHE_SIZE", 2)
+        for index in range(3):
+            path = tmp_path / f"data_{index}.json"
+            path.write_text("{}")
+            DataLoader.load_json(str(path))
+
+        assert len(DataLoader._cache) == 2
+
+    def test_import_does_not_load_pandas(self):
+        code = "import sys; from src.utilities.data_loader import DataLoader; print('pandas' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
+
+
+class TestStreamingRecords:
+    """Streaming iter_records and on-demand DataRow reads"""
+
+    def test_csv_with_typing_and_multiline_fields(self, tmp_path):
+        path = tmp_path / "logins.csv"
+        path.write_text('username,password,attempts,locked\n'
+                        'standard_user,secret_sauce,3,false\n'
+                        '"multi\nline",pw,,true\n')
+
+        records = list(DataLoader.iter_records(str(path)))
+
+        assert records[0] == {"username": "standard_user", "password": "secret_sauce",
+                              "attempts": 3, "locked": False}
+        assert records[1]["username"] == "multi\nline"
+        assert records[1]["attempts"] is None
+
+        rows = list(DataLoader.iter_params(str(path), id_field="username"))
+        assert [test_id for _, test_id in rows] == ["standard_user", "multi_line"]
+        assert rows[1][0].load()["locked"] is True
+
+    def test_jsonl_params_load_on_demand(self, tmp_path):
+        path = tmp_path / "negative.jsonl"
+        path.write_text("\n".join(json.dumps({"username": f"user{i}", "code": str(i)}) for i in range(5)))
+
+        rows = list(DataLoader.iter_params(str(path), types={"code": int}))
+
+        assert [test_id for _, test_id in rows] == [f"row{i}" for i in range(5)]
+        assert rows[3][0].load() == {"username": "user3", "code": 3}
+
+    def test_xlsx_read_only_stream(self, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        path = tmp_path / "matrix.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "Logins"
+        sheet.append(["username", "password"])
+        for index in range(4):
+            sheet.append([f"user{index}", "pw"])
+        workbook.save(path)
+
+        rows = list(DataLoader.iter_params(str(path), sheet_name="Logins", id_field="username"))
+        try:
+            assert rows[2][1] == "user2"
+            assert rows[2][0].load()["username"] == "user2"
+            cursor = DataLoader._xlsx_cursors[(str(path), "Logins")]
+            workbook = cursor.workbook
+            # Going backwards is served from rows already decoded, without reopening or rescanning
+            assert rows[0][0].load()["username"] == "user0"
+            assert rows[1][0].load()["username"] == "user1"
+            assert rows[3][0].load()["username"] == "user3"
+            assert cursor.workbook is workbook and cursor.position == 3
+        finally:
+            DataLoader.close_streams()
+
+    def test_unsupported_extension(self, tmp_path):
+        with pytest.raises(ValueError):
+            list(DataLoader.iter_records(str(tmp_path / "data.txt")))
+
+
+class TestCompiledSheetCache:
+    """Compiled, content-hash keyed spreadsheet cache"""
+
+    @pytest.fixture
+    def workbook_path(self, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        path = tmp_path / "test_data.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "Users"
+        sheet.append(["username", "password", "attempts"])
+        sheet.append(["standard_user", "secret_sauce", 1])
+        sheet.append(["locked_out_user", "secret_sauce", None])
+        workbook.save(path)
+        return path
+
+    def test_compiles_once_and_rebuilds_on_change(self, workbook_path, tmp_path):
+        from src.utilities.sheet_cache import SheetCache
+        cache = SheetCache(str(tmp_path / "cache"))
+
+        first = cache.load(str(workbook_path), "Users", DataLoader._compile_sheet)
+        second = cache.load(str(workbook_path), "Users", DataLoader._compile_sheet)
+
+        assert first == second
+        assert first[0] == {"username": "standard_user", "password": "secret_sauce", "attempts": 1}
+        assert first[1]["attempts"] is None
+        assert cache.compiled == 1
+
+        import openpyxl
+        workbook = openpyxl.load_workbook(workbook_path)
+        workbook["Users"].append(["problem_user", "secret_sauce", 2])
+        workbook.save(workbook_path)
+
+        assert len(cache.load(str(workbook_path), "Users", DataLoader._compile_sheet)) == 3
+        assert cache.compiled == 2
+
+    def test_unreadable_cache_is_rebuilt_from_the_workbook(self, workbook_path, tmp_path):
+        from src.utilities.sheet_cache import CACHE_FORMAT, SheetCache
+        cache = SheetCache(str(tmp_path / "cache"))
+        rows = cache.load(str(workbook_path), "Users", DataLoader._compile_sheet)
+
+        cache_files = list((tmp_path / "cache").glob("*.qadc"))
+        assert [path.name.endswith(f".{CACHE_FORMAT}.qadc") for path in cache_files] == [True]
+        data = cache_files[0].read_bytes()
+        cache_files[0].write_bytes(data[:len(data) // 2])
+
+        assert cache.load(str(workbook_path), "Users", DataLoader._compile_sheet) == rows
+        assert cache.compiled == 2
+
+    def test_similar_sheet_names_do_not_share_a_cache_file(self, tmp_path):
+        import openpyxl
+        from src.utilities.sheet_cache import SheetCache
+        path = tmp_path / "sheets.xlsx"
+        workbook = openpyxl.Workbook()
+        workbook.active.title = "Default"
+        workbook.active.append(["name"])
+        workbook.active.append(["default"])
+        for title in ("first", "a b", "a_b"):
+            sheet = workbook.create_sheet(title)
+            sheet.append(["name"])
+            sheet.append([title])
+        workbook.save(path)
+        cache = SheetCache(str(tmp_path / "cache"))
+
+        loaded = {sheet: cache.load(str(path), sheet, DataLoader._compile_sheet)[0]["name"]
+                  for sheet in (None, "first", "a b", "a_b")}
+
+        assert loaded == {None: "default", "first": "first", "a b": "a b", "a_b": "a_b"}
+        assert cache.compiled == 4
+
+    def test_read_needs_no_pandas_or_openpyxl(self, workbook_path, tmp_path):
+        cache_dir = tmp_path / "cache"
+        code = (
+            "import sys; from src.utilities.sheet_cache import SheetCache; "
+            "from src.utilities.data_loader import DataLoader; "
+            f"cache = SheetCache({str(cache_dir)!r}); "
+            f"rows = cache.load({str(workbook_path)!r}, 'Users', DataLoader._compile_sheet); "
+            "print(len(rows), 'pandas' in sys.modules, 'openpyxl' in sys.modules)"
+        )
+        run = lambda: subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                                     capture_output=True, text=True, check=True).stdout.split()
+        assert run() == ["2", "False", "True"]   # first run compiles with openpyxl
+        assert run() == ["2", "False", "False"]  # later runs only mmap the compiled file
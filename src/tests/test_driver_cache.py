@@ -0,0 +1,63 @@
+# src/tests/test_driver_cache.py
+import pytest
+import logging
+from src.utilities.driver_cache import DriverBinaryCache
+
+logger = logging.getLogger(__name__)
+
+
+class TestDriverBinaryCache:
+    """Driver binary resolution and on-disk caching"""
+
+    def test_resolves_once_and_persists(self, tmp_path, monkeypatch):
+        driver_file = tmp_path / "chromedriver"
+        driver_file.write_text("")
+        calls = []
+
+        def fake_install(browser):
+            calls.append(browser)
+            return str(driver_file)
+
+        monkeypatch.setattr(DriverBinaryCache, "_install", staticmethod(fake_install))
+        monkeypatch.setattr(DriverBinaryCache, "_browser_version", staticmethod(lambda browser: "120.0"))
+        monkeypatch.setattr(DriverBinaryCache, "browser_build", staticmethod(lambda browser: "/usr/bin/chrome:1:2"))
+        cache_path = str(tmp_path / "drivers.json")
+
+        first = DriverBinaryCache(cache_path=cache_path, offline=False)
+        assert first.resolve("chrome") == str(driver_file)
+        assert first.resolve("chrome") == str(driver_file)
+
+        # A new worker reads the cache file instead of installing again
+        second = DriverBinaryCache(cache_path=cache_path, offline=False)
+        assert second.resolve("chrome") == str(driver_file)
+        assert calls == ["chrome"]
+
+    def test_offline_never_installs(self, tmp_path, monkeypatch):
+        def fail_install(browser):
+            raise AssertionError("offline mode must not install drivers")
+
+        monkeypatch.setattr(DriverBinaryCache, "_install", staticmethod(fail_install))
+        monkeypatch.setenv("PATH", str(tmp_path))
+        cache = DriverBinaryCache(cache_path=str(tmp_path / "drivers.json"), offline=True)
+
+        with pytest.raises(RuntimeError, match="Offline mode"):
+            cache.resolve("firefox")
+
+    @pytest.mark.parametrize("build, install_fails", [("unknown-linux", False), ("/usr/bin/chrome:1:2", True)])
+    def test_unknown_builds_and_path_fallbacks_are_not_persisted(self, tmp_path, monkeypatch, build, install_fails):
+        driver_file = tmp_path / "chromedriver"
+        driver_file.write_text("")
+        driver_file.chmod(0o755)
+
+        def install(browser):
+            if install_fails:
+                raise OSError("offline")
+            return str(driver_file)
+
+        monkeypatch.setattr(DriverBinaryCache, "_install", staticmethod(install))
+        monkeypatch.setattr(DriverBinaryCache, "browser_build", staticmethod(lambda browser: build))
+        monkeypatch.setenv("PATH", str(tmp_path))
+        cache_path = tmp_path / "drivers.json"
+
+        assert DriverBinaryCache(cache_path=str(cache_path), offline=False).resolve("chrome") == str(driver_file)
+        assert not cache_path.exists()
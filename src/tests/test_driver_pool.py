@@ -0,0 +1,168 @@
+# src/tests/test_driver_pool.py
+import pytest
+import logging
+from src.utilities.driver_manager import DriverPool
+
+logger = logging.getLogger(__name__)
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_window = handle
+
+
+class FakeDriver:
+    """Minimal stand-in for a WebDriver session"""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.current_window = "main"
+        self.current_url = "https://example.com/inventory.html"
+        self.cookies_cleared = 0
+        self.quit_called = False
+        self.switch_to = _SwitchTo(self)
+
+    def close(self):
+        self.window_handles.remove(self.current_window)
+
+    def execute_script(self, script, *args):
+        return None
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestDriverPool:
+    """Driver pool reuse and recycling"""
+
+    def test_reuses_released_driver(self):
+        pool = DriverPool(factory=FakeDriver, max_uses=5, prefetch=0)
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        assert second is first
+        assert pool.launched == 1
+        assert pool.reused == 1
+
+    def test_reset_clears_state(self):
+        pool = DriverPool(factory=FakeDriver, max_uses=5, prefetch=0)
+        driver = pool.acquire()
+        driver.window_handles.append("popup")
+        pool.release(driver)
+
+        assert driver.window_handles == ["main"]
+        # The popup's document and the main window's are each cleared
+        assert driver.cookies_cleared == 2
+        assert driver.current_url == "about:blank"
+
+    def test_reset_clears_every_visited_origin_over_cdp(self):
+        class ChromiumDriver(FakeDriver):
+            def __init__(self):
+                super().__init__()
+                self.commands = []
+
+            def execute_script(self, script, *args):
+                return {"document": "https://example.com", "frames": ["null"], "resources": ["https://cdn.example.net"]}
+
+            def execute_cdp_cmd(self, cmd, params):
+                self.commands.append((cmd, params.get("origin")))
+
+        pool = DriverPool(factory=ChromiumDriver, max_uses=5, prefetch=0)
+        driver = pool.acquire()
+        pool.release(driver)
+
+        assert driver.commands[0] == ("Network.clearBrowserCookies", None)
+        cleared = {origin for cmd, origin in driver.commands if cmd == "Storage.clearDataForOrigin"}
+        assert {"https://example.com", "https://cdn.example.net"} <= cleared
+        assert pool.acquire() is driver
+
+    def test_reuses_driver_that_only_loaded_third_party_resources(self):
+        class ThirdPartyAssetDriver(FakeDriver):
+            def execute_script(self, script, *args):
+                return {"document": "https://example.com", "frames": [], "resources": ["https://fonts.example"]}
+
+        pool = DriverPool(factory=ThirdPartyAssetDriver, max_uses=5, prefetch=0)
+        driver = pool.acquire()
+        pool.release(driver)
+
+        assert driver.cookies_cleared == 1
+        assert pool.recycled == 0
+        assert pool.acquire() is driver
+
+    def test_recycles_when_other_origin_frames_cannot_be_cleared(self):
+        class ThirdPartyFrameDriver(FakeDriver):
+            def execute_script(self, script, *args):
+                return {"document": "https://example.com", "frames": ["https://third-party.example"], "resources": []}
+
+        pool = DriverPool(factory=ThirdPartyFrameDriver, max_uses=5, prefetch=0)
+        driver = pool.acquire()
+        pool.release(driver)
+
+        assert driver.quit_called
+        assert pool.recycled == 1
+
+    def test_use_counts_follow_the_driver_not_its_id(self):
+        pool = DriverPool(factory=FakeDriver, max_uses=2, prefetch=0)
+        driver = pool.acquire()
+        pool.release(driver)
+
+        assert pool._uses == {driver: 1}
+
+    def test_recycles_after_max_uses(self):
+        pool = DriverPool(factory=FakeDriver, max_uses=2, prefetch=0)
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire() is driver
+        pool.release(driver)
+
+        assert driver.quit_called
+        assert pool.acquire() is not driver
+        assert pool.recycled == 1
+
+    def test_recycles_after_failure(self):
+        pool = DriverPool(factory=FakeDriver, max_uses=5, prefetch=0)
+        driver = pool.acquire()
+        pool.release(driver, failed=True)
+
+        assert driver.quit_called
+        assert pool.summary()["recycled"] == 1
+
+    def test_shutdown_quits_idle_drivers(self):
+        pool = DriverPool(factory=FakeDriver, max_uses=5, prefetch=0)
+        driver = pool.acquire()
+        pool.release(driver)
+        pool.shutdown()
+
+        assert driver.quit_called
+
+    def test_prefetch_launches_spare_in_background(self):
+        pool = DriverPool(factory=FakeDriver, max_uses=1, prefetch=1)
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        # The replacement came from the background launch, not a reuse
+        assert second is not first
+        assert first.quit_called
+        assert pool.reused == 0
+        assert pool.launched >= 2
+        pool.shutdown()
+        assert second.quit_called is False
+
+    def test_shutdown_quits_prefetched_drivers(self):
+        pool = DriverPool(factory=FakeDriver, max_uses=5, prefetch=2)
+        pool.warm_up()
+        pending = [future.result() for future in list(pool._pending)]
+        pool.shutdown()
+
+        assert all(driver.quit_called for driver in pending)
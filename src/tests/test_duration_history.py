@@ -0,0 +1,92 @@
+# src/tests/test_duration_history.py
+import pytest
+import logging
+from src.utilities.duration_history import (
+    DurationHistory, assign_shards, expected_durations, hash_shards, junit_key, longest_first, parse_shard
+)
+
+logger = logging.getLogger(__name__)
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="3">
+  <testcase classname="src.tests.test_login_functionality.TestLoginFunctionality" name="test_valid_login" time="4.0">
+    <properties>
+      <property name="driver_wait_s" value="0.1"/>
+      <property name="setup_s" value="1.5"/><property name="call_s" value="4.0"/><property name="teardown_s" value="0.5"/>
+    </properties>
+  </testcase>
+  <testcase classname="src.tests.test_login_functionality.TestLoginFunctionality" name="test_locked_user" time="2.0">
+    <failure message="boom">trace</failure>
+  </testcase>
+  <testcase classname="src.tests.test_smoke.TestSmoke" name="test_skipped" time="0.0"><skipped message="no"/></testcase>
+</testsuite></testsuites>
+"""
+
+LOGIN = "src/tests/test_login_functionality.py::TestLoginFunctionality::"
+
+
+class TestDurationHistory:
+    """JUnit ingestion, estimates and duration-balanced scheduling"""
+
+    def test_junit_key_matches_pytest_junit_names(self):
+        assert junit_key(LOGIN + "test_valid_login") == \
+            "src.tests.test_login_functionality.TestLoginFunctionality.test_valid_login"
+        assert junit_key("src/tests/test_waits.py::test_ready[a/b.py]") == "src.tests.test_waits.test_ready[a/b.py]"
+
+    def test_junit_phases_are_recorded_and_skips_ignored(self, tmp_path):
+        junit = tmp_path / "junit.xml"
+        junit.write_text(JUNIT)
+        history = DurationHistory(str(tmp_path / "history.sqlite"))
+        try:
+            assert history.record_junit(str(junit), "run1") == 3
+            estimates = history.estimates()
+            setup = history.connection.execute(
+                "SELECT setup, teardown FROM durations WHERE test LIKE '%test_valid_login'").fetchone()
+        finally:
+            history.close()
+
+        assert estimates == {
+            "src.tests.test_login_functionality.TestLoginFunctionality.test_valid_login": 6.0,
+            "src.tests.test_login_functionality.TestLoginFunctionality.test_locked_user": 2.0,
+        }
+        assert setup == (1.5, 0.5)
+
+    def test_new_tests_use_module_then_suite_median(self):
+        history = {junit_key(LOGIN + "test_a"): 10.0, junit_key(LOGIN + "test_b"): 6.0}
+        durations = expected_durations(
+            [LOGIN + "test_a", LOGIN + "test_new", "src/tests/test_smoke.py::test_new"], history, default=5.0
+        )
+
+        assert durations[LOGIN + "test_new"] == 8.0
+        assert durations["src/tests/test_smoke.py::test_new"] == 8.0
+        assert expected_durations(["src/tests/test_smoke.py::test_x"], {}, default=5.0) == \
+            {"src/tests/test_smoke.py::test_x": 5.0}
+
+    def test_longest_first_is_stable(self):
+        durations = {"a": 1.0, "b": 9.0, "c": 1.0, "d": 4.0}
+
+        assert longest_first(["a", "b", "c", "d"], durations) == ["b", "d", "a", "c"]
+
+    def test_shards_balance_duration_not_count(self):
+        durations = {"slow": 10.0, "a": 3.0, "b": 3.0, "c": 3.0, "d": 1.0}
+        shards = assign_shards(list(durations), durations, total=2)
+
+        loads = {1: 0.0, 2: 0.0}
+        for nodeid, shard in shards.items():
+            loads[shard] += durations[nodeid]
+        assert shards["slow"] == 1
+        assert loads == {1: 10.0, 2: 10.0}
+        assert assign_shards(list(reversed(list(durations))), durations, total=2) == shards
+
+    def test_hash_shards_ignore_order_and_history(self):
+        nodeids = [f"src/tests/test_login.py::test_{index}" for index in range(40)]
+        shards = hash_shards(nodeids, total=4)
+
+        assert hash_shards(list(reversed(nodeids)), total=4) == shards
+        assert hash_shards(nodeids[:10], total=4) == {nodeid: shards[nodeid] for nodeid in nodeids[:10]}
+        assert set(shards.values()) == {1, 2, 3, 4}
+
+    @pytest.mark.parametrize("value", ["0/2", "3/2", "1", "a/b"])
+    def test_invalid_shard(self, value):
+        with pytest.raises(ValueError):
+            parse_shard(value)
@@ -0,0 +1,95 @@
+# src/tests/test_flake_tracker.py
+import pytest
+import json
+import logging
+from src.utilities.flake_tracker import (
+    FlakeRecord, junit_failures, load_lastfailed, read_junit_outcomes, rerun_candidates
+)
+
+logger = logging.getLogger(__name__)
+
+CLASSNAME = "src.tests.test_login_functionality.TestLoginFunctionality"
+
+
+def junit(path, cases):
+    """cases: (name, outcome, attempts)"""
+    tags = {"passed": "", "failed": '<failure message="x"/>', "error": '<error message="x"/>',
+            "skipped": '<skipped message="x"/>'}
+    body = "".join(
+        f'<testcase classname="{CLASSNAME}" name="{name}" time="1">'
+        f'<properties><property name="attempts" value="{attempts}"/></properties>{tags[outcome]}</testcase>'
+        for name, outcome, attempts in cases
+    )
+    path.write_text(f'<?xml version="1.0"?><testsuites><testsuite name="pytest">{body}</testsuite></testsuites>')
+    return str(path)
+
+
+@pytest.fixture
+def record(tmp_path):
+    record = FlakeRecord(str(tmp_path / "flakes.sqlite"), window=5, threshold=2)
+    yield record
+    record.close()
+
+
+class TestFlakeTracker:
+    """Flaky detection, rerun selection and quarantine"""
+
+    def test_pass_after_retry_is_flaky(self, tmp_path):
+        path = junit(tmp_path / "run.xml", [("test_a", "passed", 2), ("test_b", "failed", 3), ("test_c", "passed", 1)])
+
+        assert [outcome for _, outcome, _ in read_junit_outcomes(path)] == ["flaky", "failed", "passed"]
+        assert junit_failures(path) == {f"{CLASSNAME}.test_b"}
+
+    def test_rerun_candidates_ignore_stale_cache_entries(self, tmp_path):
+        cache = tmp_path / ".pytest_cache" / "v" / "cache"
+        cache.mkdir(parents=True)
+        nodeid = "src/tests/test_login_functionality.py::TestLoginFunctionality::"
+        (cache / "lastfailed").write_text(json.dumps({nodeid + "test_b": True, nodeid + "test_old": True}))
+
+        lastfailed = load_lastfailed(str(tmp_path / ".pytest_cache"))
+        assert rerun_candidates(lastfailed, {f"{CLASSNAME}.test_b"}) == [nodeid + "test_b"]
+        assert load_lastfailed(str(tmp_path / "missing")) == {}
+
+    def test_rerun_phase_passes_are_recorded_as_flaky(self, tmp_path, record):
+        record.record_junit(junit(tmp_path / "run.xml", [("test_a", "failed", 1), ("test_b", "failed", 1)]), "run1")
+        flaky = record.record_rerun(junit(tmp_path / "rerun.xml", [("test_a", "passed", 1), ("test_b", "failed", 1)]), "run1")
+
+        assert flaky == [f"{CLASSNAME}.test_a"]
+        assert record.flaky_tests() == [(f"{CLASSNAME}.test_a", 1, 1)]
+
+    def test_tests_flaky_too_often_are_quarantined(self, tmp_path, record):
+        for run, outcome in enumerate(["passed", "flaky", "passed", "flaky"]):
+            attempts = 2 if outcome == "flaky" else 1
+            record.record_junit(junit(tmp_path / f"run{run}.xml", [("test_a", "passed", attempts),
+                                                                  ("test_b", "passed", 2 if run == 0 else 1)]), f"run{run}")
+
+        assert record.quarantined() == {f"{CLASSNAME}.test_a"}
+        assert (f"{CLASSNAME}.test_b", 1, 4) in record.flaky_tests()
+
+    def test_quarantine_does_not_move_tests_between_shards(self, tmp_path, record, monkeypatch):
+        import conftest
+        from types import SimpleNamespace
+        from src.config.config import config as settings
+        from src.utilities.duration_history import DurationHistory
+        names = ("test_a", "test_b", "test_c", "test_d", "test_e")
+        durations = DurationHistory(str(tmp_path / "durations.sqlite"))
+        durations.record_junit(junit(tmp_path / "timed.xml", [(name, "passed", 1) for name in names]), "timed")
+        durations.close()
+        monkeypatch.setattr(settings, "FLAKE_HISTORY_PATH", str(tmp_path / "flakes.sqlite"))
+        monkeypatch.setattr(settings, "FLAKE_WINDOW", 5)
+        monkeypatch.setattr(settings, "FLAKE_QUARANTINE_THRESHOLD", 2)
+        for run in range(2):
+            record.record_junit(junit(tmp_path / f"run{run}.xml", [("test_a", "passed", 2)]), f"run{run}")
+        nodeid = "src/tests/test_login_functionality.py::TestLoginFunctionality::"
+        collected = [SimpleNamespace(nodeid=nodeid + name) for name in names]
+
+        def shard(index, quarantine):
+            options = {"--shard": f"{index}/2", "--longest-first": False, "--durations-file": str(tmp_path / "durations.sqlite"), "--quarantine": quarantine}
+            config = SimpleNamespace(getoption=options.get, hook=SimpleNamespace(pytest_deselected=lambda items: None))
+            items = list(collected)
+            conftest.pytest_collection_modifyitems(None, config, items)
+            return [item.nodeid for item in items]
+
+        for index in (1, 2):
+            # A machine without the flake record must pick the same shard, quarantined tests aside
+            assert shard(index, "exclude") == [n for n in shard(index, "include") if not n.endswith("test_a")]
@@ -0,0 +1,61 @@
+# src/tests/test_junit_merge.py
+import pytest
+import logging
+import xml.etree.ElementTree as ET
+from src.utilities.junit_merge import iter_testcases, merge_junit, parse_inputs
+
+logger = logging.getLogger(__name__)
+
+
+def fragment(path, cases):
+    body = "".join(
+        f'<testcase classname="src.tests.test_login.TestLogin" name="{name}" time="{seconds}">{extra}</testcase>'
+        for name, seconds, extra in cases
+    )
+    path.write_text(f'<?xml version="1.0"?><testsuites><testsuite name="pytest">{body}</testsuite></testsuites>')
+    return str(path)
+
+
+class TestJunitMerge:
+    """Streaming JUnit merge and the linked HTML summary"""
+
+    def test_testcases_stream_from_nested_suites(self, tmp_path):
+        path = tmp_path / "nested.xml"
+        path.write_text('<testsuites><testsuite name="outer"><testsuite name="inner">'
+                        '<testcase classname="a.B" name="test_1" time="1"/></testsuite>'
+                        '<testcase classname="a.B" name="test_2" time="2"/></testsuite></testsuites>')
+
+        assert [testcase.get("name") for testcase in iter_testcases(str(path))] == ["test_1", "test_2"]
+
+    def test_fragments_merge_into_one_suite_each(self, tmp_path):
+        screenshot = tmp_path / "reports" / "screenshots" / "abc.png"
+        gw0 = fragment(tmp_path / "gw0.xml", [
+            ("test_a", 1.5, ""),
+            ("test_b", 2.0, f'<properties><property name="screenshot" value="{screenshot}"/></properties>'
+                            '<failure message="Login &lt;failed&gt;">trace</failure>'),
+        ])
+        gw1 = fragment(tmp_path / "gw1.xml", [("test_c", 0.5, '<skipped message="later"/>')])
+
+        result = merge_junit([("gw0", gw0), ("gw1", gw1)], str(tmp_path / "merged" / "junit.xml"),
+                             str(tmp_path / "merged" / "summary.html"))
+
+        root = ET.parse(str(tmp_path / "merged" / "junit.xml")).getroot()
+        assert root.get("tests") == "3" and root.get("failures") == "1" and root.get("skipped") == "1"
+        assert [suite.get("name") for suite in root] == ["gw0", "gw1"]
+        assert root[0].find("testcase[@name='test_b']/failure").get("message") == "Login <failed>"
+        assert result["totals"]["time"] == 4.0
+
+        summary = (tmp_path / "merged" / "summary.html").read_text()
+        assert '<a href="../reports/screenshots/abc.png">screenshot</a>' in summary
+        assert "Login &lt;failed&gt;" in summary
+        assert "base64" not in summary
+
+    def test_inputs_accept_labels_and_globs(self, tmp_path):
+        fragment(tmp_path / "shard1.xml", [])
+        fragment(tmp_path / "shard2.xml", [])
+
+        assert parse_inputs([str(tmp_path / "shard*.xml"), f"chrome={tmp_path / 'shard1.xml'}"]) == [
+            ("shard1", str(tmp_path / "shard1.xml")),
+            ("shard2", str(tmp_path / "shard2.xml")),
+            ("chrome", str(tmp_path / "shard1.xml")),
+        ]
@@ -0,0 +1,80 @@
+# src/tests/test_lean_mode.py
+import pytest
+import logging
+from src.utilities import lean_mode
+from src.utilities.page_metrics import summarize
+
+logger = logging.getLogger(__name__)
+
+
+class CdpDriver:
+    """Fake Chromium driver recording CDP commands"""
+
+    def __init__(self):
+        self.cdp = []
+        self.lean_mode = True
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+        return {}
+
+
+class RecordingOptions:
+    """Fake browser options recording arguments and prefs"""
+
+    def __init__(self):
+        self.arguments = []
+        self.preferences = {}
+
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+
+    def set_preference(self, name, value):
+        self.preferences[name] = value
+
+
+class TestLeanMode:
+    """Block lists, per-test overrides and savings reporting"""
+
+    def test_allow_list_removes_matching_block_patterns(self):
+        patterns = lean_mode.effective_block_list(block=["*cdn.example.com*"], allow=["*.woff*", "*.svg"])
+
+        assert "*cdn.example.com*" in patterns
+        assert "*.png" in patterns
+        assert not {"*.woff", "*.woff2", "*.svg"} & set(patterns)
+
+    def test_extend_false_blocks_only_the_given_patterns(self):
+        assert lean_mode.effective_block_list(block=["*.png"], extend=False) == ["*.png"]
+
+    def test_block_list_is_sent_once_per_change(self):
+        driver = CdpDriver()
+        lean_mode.apply_block_list(driver, ["*.png"])
+        lean_mode.apply_block_list(driver, ["*.png"])
+        lean_mode.apply_block_list(driver, [])
+
+        assert driver.cdp == [("Network.setBlockedURLs", {"urls": ["*.png"]}),
+                              ("Network.setBlockedURLs", {"urls": []})]
+        assert not lean_mode.is_lean(driver)
+
+    def test_firefox_gets_prefs_and_no_cdp(self):
+        options = RecordingOptions()
+        lean_mode.configure_options("firefox", options)
+
+        assert options.preferences["permissions.default.image"] == 2
+        assert options.arguments == []
+        assert lean_mode.apply_block_list(object(), ["*.png"]) is False
+
+    def test_savings_compare_lean_loads_with_full_loads(self):
+        summary = summarize([
+            {"page": "login", "resource_count": 12, "resource_bytes": 300000},
+            {"page": "login", "resource_count": 3, "resource_bytes": 40000, "lean": True},
+        ])
+        report = lean_mode.savings_report(summary, reference={})
+
+        assert report == [{"page": "login", "requests_saved": 9, "bytes_saved": 260000}]
+
+    def test_savings_fall_back_to_baseline_reference(self):
+        summary = summarize([{"page": "inventory", "resource_count": 2, "resource_bytes": 1000, "lean": True}])
+        reference = {"inventory": {"resource_count": {"median": 8}, "resource_bytes": {"median": 51000}}}
+
+        assert lean_mode.savings_report(summary, reference)[0]["bytes_saved"] == 50000
@@ -0,0 +1,46 @@
+# src/tests/test_local_app.py
+import pytest
+import logging
+import time
+import urllib.error
+import urllib.request
+from src.utilities.local_app import LocalApp
+
+logger = logging.getLogger(__name__)
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+class TestLocalApp:
+    """Browserless checks of the local stand-in app"""
+
+    def test_login_page_matches_page_object(self, local_app):
+        html = _get(local_app.url)
+
+        for element_id in ("user-name", "password", "login-button"):
+            assert f'id="{element_id}"' in html
+        assert 'data-test="error"' in html
+        assert "locked out" in html
+
+    def test_inventory_and_forgot_password_pages(self, local_app):
+        assert "react-burger-menu-btn" in _get(f"{local_app.url}/inventory.html")
+        forgot = _get(f"{local_app.url}/forgot-password")
+        for marker in ('id="email"', 'id="resetBtn"', 'id="cancelBtn"', "reset-success", "reset-error"):
+            assert marker in forgot
+
+    def test_unknown_path_is_404(self, local_app):
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _get(f"{local_app.url}/missing")
+        assert error.value.code == 404
+
+    def test_injected_latency(self):
+        with LocalApp(latency_ms=50, jitter_ms=10, seed=1) as app:
+            start = time.perf_counter()
+            _get(app.url)
+            elapsed = time.perf_counter() - start
+
+        assert elapsed >= 0.04
+        assert app.requests == 1
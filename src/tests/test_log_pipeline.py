@@ -0,0 +1,65 @@
+# src/tests/test_log_pipeline.py
+import logging
+import os
+import pytest
+from src.utilities.log_pipeline import DeferredQueueHandler, LogPipeline, merge_logs, worker_log_paths
+
+
+class TestLogPipeline:
+    """Queue-based logging and worker log merging"""
+
+    def test_pipeline_writes_records_in_background(self, tmp_path):
+        pipeline = LogPipeline(str(tmp_path), "run1", worker_id="gw0").start()
+        try:
+            logging.getLogger("pipeline.test").info("user %s logged in", "standard_user")
+        finally:
+            pipeline.stop()
+
+        content = open(pipeline.path).read()
+        assert pipeline.path.endswith("test_execution_run1_gw0.log")
+        assert " - gw0 - pipeline.test - INFO - user standard_user logged in" in content
+
+    def test_formatting_is_deferred_for_immutable_args(self):
+        handler = DeferredQueueHandler(None)
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "user %s", ("standard_user",), None)
+        prepared = handler.prepare(record)
+
+        assert prepared.msg == "user %s"
+        assert prepared.getMessage() == "user standard_user"
+
+    def test_mutable_args_are_rendered_on_the_calling_thread(self):
+        handler = DeferredQueueHandler(None)
+        fields = ["username"]
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "missing %s", (fields,), None)
+        prepared = handler.prepare(record)
+        fields.append("password")
+
+        assert prepared.getMessage() == "missing ['username']"
+
+    def test_merge_orders_by_timestamp_and_keeps_tracebacks(self, tmp_path):
+        (tmp_path / "test_execution_run1_gw0.log").write_text(
+            "2024-01-01 10:00:00,100 - gw0 - a - INFO - first\n"
+            "2024-01-01 10:00:00,300 - gw0 - a - ERROR - third\n"
+            "Traceback (most recent call last):\n"
+            "ValueError: boom\n"
+        )
+        (tmp_path / "test_execution_run1_gw1.log").write_text(
+            "2024-01-01 10:00:00,200 - gw1 - b - INFO - second\n"
+        )
+        paths = worker_log_paths(str(tmp_path), "run1")
+        output = tmp_path / "test_execution_run1.log"
+
+        assert merge_logs(paths, str(output)) == 3
+        lines = output.read_text().splitlines()
+        assert [line.rsplit(" - ", 1)[-1] for line in lines[:3]] == ["first", "second", "third"]
+        assert lines[3:] == ["Traceback (most recent call last):", "ValueError: boom"]
+        assert not any(os.path.exists(path) for path in paths)
+
+    def test_merge_keeps_the_controller_log(self, tmp_path):
+        output = tmp_path / "test_execution_run1.log"
+        output.write_text("2024-01-01 10:00:00,050 - main - c - INFO - controller started\n")
+        (tmp_path / "test_execution_run1_gw0.log").write_text("2024-01-01 10:00:00,100 - gw0 - a - INFO - worker\n")
+
+        assert merge_logs(worker_log_paths(str(tmp_path), "run1") + [str(output)], str(output)) == 2
+        assert [line.rsplit(" - ", 1)[-1] for line in output.read_text().splitlines()] == ["controller started", "worker"]
+        assert sorted(os.listdir(tmp_path)) == ["test_execution_run1.log"]
@@ -1,7 +1,6 @@
 # src/tests/test_login_functionality.py - SIMPLE VERSION
 import pytest
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +12,7 @@ class TestLoginFunctionality:
         logger.info("Testing valid login for standard_user")
         
         login_page.login(username="standard_user", password="secret_sauce")
-        time.sleep(2)
+        login_page.wait_for_login_result()
         
         assert login_page.is_login_successful(), "Login failed for standard_user"
         logger.info("Successfully logged in as standard_user")
@@ -24,7 +23,7 @@ class TestLoginFunctionality:
         logger.info("Testing valid login for problem_user")
         
         login_page.login(username="problem_user", password="secret_sauce")
-        time.sleep(2)
+        login_page.wait_for_login_result()
         
         assert login_page.is_login_successful(), "Login failed for problem_user"
         logger.info("Successfully logged in as problem_user")
@@ -35,7 +34,7 @@ class TestLoginFunctionality:
         logger.info("Testing invalid login with wrong password")
         
         login_page.login(username="standard_user", password="wrong_password")
-        time.sleep(1)
+        login_page.wait_for_login_result()
         
         assert login_page.is_error_displayed(), "Error message should be displayed"
         error = login_page.get_error_message()
@@ -47,7 +46,7 @@ class TestLoginFunctionality:
         logger.info("Testing login with locked_out_user")
         
         login_page.login(username="locked_out_user", password="secret_sauce")
-        time.sleep(1)
+        login_page.wait_for_login_result()
         
         assert login_page.is_error_displayed(), "Error should be displayed for locked user"
         error = login_page.get_error_message()
@@ -60,7 +59,7 @@ class TestLoginFunctionality:
         logger.info("Testing login with empty credentials")
         
         login_page.click_login()
-        time.sleep(1)
+        login_page.wait_for_login_result()
         
         assert login_page.is_error_displayed(), "Error should be displayed for empty credentials"
         error = login_page.get_error_message()
@@ -0,0 +1,128 @@
+# src/tests/test_page_metrics.py
+import json
+import pytest
+import logging
+from src.pages.login_page import LoginPage
+from src.utilities.page_metrics import (
+    PageMetrics, PerformanceBudgetExceeded, PerformanceBudgetWarning, PerformanceRecorder,
+    compare_to_baseline, load_baseline, save_baseline, summarize
+)
+
+logger = logging.getLogger(__name__)
+
+RAW_TIMING = {
+    "url": "http://app/",
+    "time_origin": 1700000000000.5,
+    "timing": {"ttfb": 120.4, "dom_interactive": 300, "dom_content_loaded": 450.2, "load": 0, "transfer_size": 2048},
+    "paint": {"first-paint": 380, "first-contentful-paint": 390},
+    "resource_count": 3,
+    "resource_bytes": 10240,
+    "slowest_resources": [{"name": "http://app/app.js", "type": "script", "duration": 80, "transfer_size": 4096}],
+}
+
+
+class MetricsDriver:
+    """Fake driver returning a canned timing payload"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.scripts = 0
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        return self.raw
+
+
+class TestPageMetrics:
+    """Timing capture, budgets and baseline comparison"""
+
+    def test_capture_reads_all_timing_in_one_call(self):
+        driver = MetricsDriver(RAW_TIMING)
+        metrics = PerformanceRecorder.capture(driver, "login")
+
+        assert driver.scripts == 1
+        assert metrics.dom_content_loaded == 450.2
+        assert metrics.first_contentful_paint == 390
+        assert metrics.load is None  # load event still pending
+        assert metrics.resource_count == 3
+
+    def test_route_change_is_a_soft_navigation(self, monkeypatch):
+        class DocumentDriver:
+            """Keeps the per-document "measured URL" the metrics script stores in the page"""
+
+            def __init__(self):
+                self.url, self.time_origin = "http://app/", RAW_TIMING["time_origin"]
+                self.measured = {}
+
+            def execute_script(self, script, *args):
+                raw = dict(RAW_TIMING, url=self.url, time_origin=self.time_origin,
+                           measured_url=self.measured.get(self.time_origin),
+                           soft={"route_time": 180.3, "resource_count": 2, "resource_bytes": 512,
+                                 "slowest_resources": []})
+                self.measured[self.time_origin] = self.url
+                return raw
+
+        recorder = PerformanceRecorder()
+        recorder.set_budgets({"inventory": {"dom_content_loaded": 100}})
+        monkeypatch.setattr("src.utilities.base_page.config.CAPTURE_PERFORMANCE", True)
+        monkeypatch.setattr("src.utilities.base_page.performance_recorder", recorder)
+        driver = DocumentDriver()
+        page = LoginPage(driver)
+
+        page.capture_performance("login")
+        page.capture_performance("login")
+        # pushState to the inventory route: same document, so no Navigation or Paint timing of its own
+        driver.url = "http://app/inventory.html"
+        soft = page.capture_performance("inventory")
+        # A real load of the inventory page; only it is held to the inventory budget
+        driver.time_origin += 5000
+        with pytest.warns(PerformanceBudgetWarning):
+            LoginPage(driver).capture_performance("inventory")
+
+        assert [sample.page for sample in recorder.samples] == ["login", "inventory (soft)", "inventory"]
+        assert soft.soft_navigation and soft.route_time == 180.3
+        assert (soft.ttfb, soft.dom_content_loaded, soft.first_contentful_paint) == (None, None, None)
+        assert (soft.resource_count, soft.resource_bytes) == (2, 512)
+        assert len(recorder.violations) == 1
+
+    def test_budget_warns_or_fails(self):
+        recorder = PerformanceRecorder()
+        recorder.set_budgets({"login": {"dom_content_loaded": 400, "ttfb": 500}})
+        metrics = PageMetrics.from_script("login", RAW_TIMING)
+
+        with pytest.warns(PerformanceBudgetWarning, match="dom_content_loaded 450ms > budget 400ms"):
+            recorder.record(metrics, mode="warn")
+        with pytest.raises(PerformanceBudgetExceeded):
+            recorder.record(PageMetrics.from_script("login", RAW_TIMING), mode="fail")
+        recorder.record(PageMetrics.from_script("login", RAW_TIMING), mode="off")
+
+        assert len(recorder.samples) == 3
+        assert len(recorder.violations) == 2
+
+    def test_samples_are_tagged_with_the_current_test(self, tmp_path):
+        recorder = PerformanceRecorder()
+        recorder.set_budgets({})
+        recorder.test_id = "src/tests/test_login.py::test_valid"
+        recorder.record(PageMetrics.from_script("login", RAW_TIMING))
+        recorder.write(str(tmp_path / "performance.json"))
+
+        samples = json.loads((tmp_path / "performance.json").read_text())["samples"]
+        assert samples[0]["test"] == "src/tests/test_login.py::test_valid"
+
+    def test_regression_against_baseline(self, tmp_path):
+        baseline_path = str(tmp_path / "baseline.json")
+        save_baseline(baseline_path, summarize([
+            {"page": "login", "dom_content_loaded": 400}, {"page": "login", "dom_content_loaded": 420},
+        ]))
+        current = summarize([{"page": "login", "dom_content_loaded": 700}, {"page": "inventory", "load": 900}])
+
+        regressions = compare_to_baseline(current, load_baseline(baseline_path), tolerance=0.2, min_delta_ms=50)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("login dom_content_loaded: 700ms vs baseline 410ms")
+
+    def test_small_changes_are_not_regressions(self):
+        baseline = {"login": {"ttfb": {"median": 100, "count": 5}}}
+        current = {"login": {"ttfb": {"median": 140, "count": 5}}}
+
+        # +40% but only 40ms: below the absolute noise floor
+        assert compare_to_baseline(current, baseline, tolerance=0.2, min_delta_ms=50) == []
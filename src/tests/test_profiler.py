@@ -0,0 +1,79 @@
+# src/tests/test_profiler.py
+import pytest
+import logging
+from src.utilities.profiler import ELEMENT_KEY, count_round_trips, instrument, profiled_wait
+
+logger = logging.getLogger(__name__)
+
+
+class CommandDriver:
+    """Fake driver whose execute() answers find commands with element references"""
+
+    def __init__(self):
+        self.sent = []
+
+    def execute(self, driver_command, params=None):
+        self.sent.append(driver_command)
+        if driver_command == "findElement":
+            return {"value": {ELEMENT_KEY: f"el-{params['value']}"}}
+        if driver_command == "findElements":
+            return {"value": [{ELEMENT_KEY: "el-a"}, {ELEMENT_KEY: "el-b"}]}
+        return {"value": None}
+
+
+class TestCommandProfiler:
+    """Per-command timing and wait attribution"""
+
+    def test_element_commands_are_attributed_to_their_locator(self):
+        driver = CommandDriver()
+        profiler = instrument(driver)
+        driver.execute("findElement", {"using": "css selector", "value": "#login-button"})
+        driver.execute("clickElement", {"id": "el-#login-button"})
+        driver.execute("getTitle")
+
+        locators = [record.locator for record in profiler.commands]
+        assert locators == ["css selector=#login-button", "css selector=#login-button", None]
+        assert driver.sent == ["findElement", "clickElement", "getTitle"]
+
+    def test_wait_spans_count_polls_and_separate_wait_from_work(self):
+        driver = CommandDriver()
+        profiler = instrument(driver)
+        with profiled_wait(driver, "visible", ("id", "user-name")):
+            with profiled_wait(driver, "find", ("id", "user-name")):
+                for _ in range(3):
+                    driver.execute("findElement", {"using": "id", "value": "user-name"})
+        driver.execute("clickElement", {"id": "el-user-name"})
+
+        summary = profiler.summary()
+        assert summary["total_commands"] == 4
+        assert summary["waits"] == 2
+        assert summary["retries"] == 2
+        assert summary["commands"] == {"findElement": 3, "clickElement": 1}
+        assert summary["wait_time"] >= summary["wait_round_trip_time"]
+        assert summary["slowest_locators"][0]["locator"] == "id=user-name"
+        assert summary["slowest_locators"][0]["commands"] == 4
+
+    def test_reset_starts_a_new_profile(self):
+        driver = CommandDriver()
+        profiler = instrument(driver)
+        driver.execute("getTitle")
+        profiler.reset()
+
+        assert profiler.summary()["total_commands"] == 0
+        assert instrument(driver) is profiler
+
+    def test_uninstrumented_driver_waits_are_no_ops(self):
+        driver = CommandDriver()
+        with profiled_wait(driver, "visible", ("id", "x")):
+            driver.execute("getTitle")
+        assert not hasattr(driver, "command_profiler")
+
+    def test_round_trip_counter_keeps_instrumentation(self):
+        driver = CommandDriver()
+        profiler = instrument(driver)
+        with count_round_trips(driver) as counter:
+            driver.execute("getTitle")
+        driver.execute("getTitle")
+
+        assert counter.total == 1
+        assert profiler.summary()["total_commands"] == 2
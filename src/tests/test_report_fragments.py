@@ -0,0 +1,64 @@
+# src/tests/test_report_fragments.py
+import pytest
+import logging
+from types import SimpleNamespace
+from run_tests import auto_worker_count, resolve_workers
+from src.utilities.report_fragments import WorkerStats, format_summary, load_fragments, merge_fragments
+
+logger = logging.getLogger(__name__)
+
+
+def report(when, outcome, duration):
+    """Minimal stand-in for a pytest TestReport"""
+    return SimpleNamespace(when=when, outcome=outcome, duration=duration,
+                           passed=outcome == "passed", failed=outcome == "failed")
+
+
+class TestReportFragments:
+    """Per-worker summaries, merging and worker-count selection"""
+
+    def test_worker_stats_count_each_test_once(self):
+        stats = WorkerStats("gw0")
+        for phase in ("setup", "call", "teardown"):
+            stats.add(report(phase, "passed", 0.5))
+        stats.add(report("setup", "failed", 0.25))
+        stats.add(report("teardown", "passed", 0.25))
+
+        assert stats.tests == 2
+        assert stats.outcomes == {"passed": 1, "failed": 0, "skipped": 0, "error": 1}
+        assert stats.test_time == 2.0
+
+    def test_retried_attempts_count_as_reruns(self):
+        stats = WorkerStats()
+        stats.add(report("call", "rerun", 1.0))
+        stats.add(report("call", "passed", 1.0))
+
+        assert (stats.tests, stats.reruns, stats.test_time) == (1, 1, 2.0)
+
+    def test_fragments_merge_with_speedup(self, tmp_path):
+        for worker, duration in (("gw0", 6.0), ("gw1", 4.0)):
+            stats = WorkerStats(worker)
+            stats.add(report("call", "passed", duration))
+            stats.write(str(tmp_path), {"pool": {"launched": 1, "startup_time": 2.0}})
+
+        merged = merge_fragments(load_fragments(str(tmp_path)), wall_time=5.0)
+
+        assert merged["workers"] == 2
+        assert merged["outcomes"]["passed"] == 2
+        assert merged["speedup"] == 2.0
+        assert merged["browsers_launched"] == 2
+        assert format_summary(merged)[-1].endswith("speedup 2.00x over serial")
+
+    @pytest.mark.parametrize("cpus, memory_mb, browsers, expected", [
+        (8, None, 2, 8),
+        (8, 2100, 1, 3),
+        (8, 4200, 2, 3),
+        (2, 64000, 2, 2),
+        (4, 100, 1, 1),
+    ])
+    def test_auto_worker_count(self, cpus, memory_mb, browsers, expected):
+        assert auto_worker_count(cpu_count=cpus, memory_mb=memory_mb, per_browser_mb=700, browsers=browsers) == expected
+
+    def test_explicit_worker_count(self):
+        assert resolve_workers(None) == 0
+        assert resolve_workers("3") == 3
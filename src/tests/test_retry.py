@@ -0,0 +1,61 @@
+# src/tests/test_retry.py
+import pytest
+import logging
+
+pytest_plugins = ["pytester"]
+
+logger = logging.getLogger(__name__)
+
+RETRY_CONFTEST = """
+from src.utilities.retry import run_with_retries
+
+def pytest_runtest_protocol(item, nextitem):
+    return run_with_retries(item, nextitem, 2)
+
+def pytest_report_teststatus(report):
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+"""
+
+
+class TestRetry:
+    """In-session retries on the installed pytest (uses _pytest.runner.call_and_report)"""
+
+    def test_retries_keep_module_fixtures_and_rebuild_function_fixtures(self, pytester):
+        pytester.makeconftest(RETRY_CONFTEST)
+        pytester.makepyfile(test_flaky="""
+            import pytest
+            calls = {"module": 0, "function": 0, "function_down": 0, "attempts": 0}
+
+            @pytest.fixture(scope="module")
+            def shared():
+                calls["module"] += 1
+                yield
+
+            @pytest.fixture
+            def fresh():
+                calls["function"] += 1
+                yield
+                calls["function_down"] += 1
+
+            def test_flaky(shared, fresh):
+                # Last test of its module, so a teardown to the next item would drop `shared`
+                calls["attempts"] += 1
+                assert calls["attempts"] == 3
+                assert calls == {"module": 1, "function": 3, "function_down": 2, "attempts": 3}
+        """, test_other="""
+            def test_next_module():
+                pass
+        """)
+
+        result = pytester.runpytest("-p", "no:cacheprovider")
+
+        assert result.parseoutcomes() == {"passed": 2, "rerun": 2}
+
+    def test_gives_up_after_the_last_attempt(self, pytester):
+        pytester.makeconftest(RETRY_CONFTEST)
+        pytester.makepyfile("def test_broken():\n    assert False\n")
+
+        result = pytester.runpytest("-p", "no:cacheprovider")
+
+        assert result.parseoutcomes() == {"failed": 1, "rerun": 2}
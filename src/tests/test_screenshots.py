@@ -0,0 +1,67 @@
+# src/tests/test_screenshots.py
+import os
+import pytest
+import logging
+from src.utilities.screenshots import ScreenshotService
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenshotDriver:
+    """Fake driver returning canned PNG bytes"""
+
+    def __init__(self, png):
+        self.png = png
+        self.calls = 0
+
+    def get_screenshot_as_png(self):
+        self.calls += 1
+        return self.png
+
+
+class TestScreenshotService:
+    """Background, content-addressed screenshot writes"""
+
+    def test_capture_writes_file_named_by_content_hash(self, tmp_path):
+        service = ScreenshotService(str(tmp_path))
+        path = service.capture(ScreenshotDriver(b"\x89PNG fake image"), "failure")
+        service.flush()
+
+        assert os.path.dirname(path) == str(tmp_path)
+        assert os.path.exists(path)
+        service.shutdown()
+
+    def test_identical_screenshots_are_stored_once(self, tmp_path):
+        service = ScreenshotService(str(tmp_path))
+        driver = ScreenshotDriver(b"same error page")
+        first = service.capture(driver, "test_a")
+        second = service.capture(driver, "test_b")
+        other = service.store(b"different page", "test_c")
+        service.shutdown()
+
+        assert first == second
+        assert other != first
+        assert service.captured == 3
+        assert service.deduplicated == 1
+        assert len(os.listdir(tmp_path)) == 2
+
+    def test_existing_file_from_earlier_session_is_reused(self, tmp_path):
+        first = ScreenshotService(str(tmp_path))
+        path = first.store(b"persisted", "earlier")
+        first.shutdown()
+
+        second = ScreenshotService(str(tmp_path))
+        assert second.store(b"persisted", "later") == path
+        assert second.deduplicated == 1
+        second.shutdown()
+
+    def test_write_happens_off_the_calling_thread(self, tmp_path, monkeypatch):
+        import threading
+        writers = []
+        service = ScreenshotService(str(tmp_path))
+        original = service._write
+        monkeypatch.setattr(service, "_write", lambda png, path: (writers.append(threading.current_thread()), original(png, path)))
+        service.store(b"background", "bg")
+        service.shutdown()
+
+        assert writers and writers[0] is not threading.current_thread()
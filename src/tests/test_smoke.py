@@ -28,6 +28,17 @@ def test_data_loader():
     if credentials:
         logger.info(f"Sample credential: {credentials[0]}")
 
+def test_startup_imports_are_lazy():
+    """Importing conftest, config and DriverManager must not load browser or data libraries"""
+    import subprocess
+    import sys
+    from src.config.config import PROJECT_ROOT
+    code = ("import sys, conftest; from src.utilities.driver_manager import DriverManager; "
+            "print(sorted(m for m in ('selenium', 'webdriver_manager', 'pandas') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
 class TestSmoke:
     """Smoke tests"""
     
@@ -0,0 +1,134 @@
+# src/tests/test_waits.py
+import pytest
+import logging
+import time
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+from src.utilities.waits import Ready, SmartWait, locator_to_js, readiness_to_js, forbid_sleep, SleepForbiddenError
+
+logger = logging.getLogger(__name__)
+
+
+class TestWaitHelpers:
+    """Browserless checks for the event-driven wait helpers"""
+
+    @pytest.mark.parametrize("locator, expected", [
+        ((By.ID, "user-name"), 'document.getElementById("user-name")'),
+        ((By.CSS_SELECTOR, "[data-test='error']"), 'document.querySelector("[data-test=\'error\']")'),
+        ((By.CLASS_NAME, "app_logo"), 'document.getElementsByClassName("app_logo")[0] || null'),
+    ])
+    def test_locator_to_js(self, locator, expected):
+        assert locator_to_js(locator) == expected
+
+    def test_locator_to_js_rejects_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            locator_to_js(("shadow", "x"))
+
+    def test_wait_for_any_element_returns_matched_locator(self):
+        class ScriptDriver:
+            def execute_async_script(self, script, *args):
+                self.args = args
+                return 2
+
+        driver = ScriptDriver()
+        locators = [(By.ID, "react-burger-menu-btn"), (By.CSS_SELECTOR, "[data-test='error']")]
+        matched = SmartWait(driver, timeout=1).wait_for_any_element(locators)
+
+        assert matched == locators[1]
+        # Single in-browser wait with the timeout in milliseconds
+        assert driver.args[-1] == 1000
+
+    def test_readiness_contract_builds_one_predicate(self):
+        contract = (Ready((By.ID, "login-button"), "clickable"), Ready((By.CLASS_NAME, "inventory_item"), min_count=2))
+        predicate = readiness_to_js(contract)
+
+        assert predicate.count(" && (") == 1
+        assert "!el.disabled" in predicate
+        assert ".length >= 2" in predicate
+        with pytest.raises(ValueError):
+            Ready((By.ID, "x"), "focused").to_js()
+
+    def test_wait_for_first_ready_returns_contract_index(self):
+        class ScriptDriver:
+            def execute_async_script(self, script, *args):
+                self.predicate = args[0]
+                return 2
+
+        driver = ScriptDriver()
+        contracts = [(Ready((By.CLASS_NAME, "inventory_item")),), (Ready((By.CSS_SELECTOR, "[data-test='error']")),)]
+
+        assert SmartWait(driver, timeout=1).wait_for_first_ready(contracts) == 1
+        assert "inventory_item" in driver.predicate and "data-test" in driver.predicate
+
+    def test_readiness_waits_for_a_new_document(self):
+        class ScriptDriver:
+            def execute_async_script(self, script, *args):
+                self.predicate = args[0]
+                return True
+
+            def execute_script(self, script, *args):
+                return [True, False, True]
+
+        driver = ScriptDriver()
+        contract = (Ready((By.ID, "user-name")), Ready((By.ID, "login-button"), "clickable"))
+        wait = SmartWait(driver, timeout=1)
+
+        assert wait.wait_for_ready(contract, since=[1700000000000.5, "https://www.saucedemo.com/"])
+        assert "performance.timeOrigin !== 1700000000000.5" in driver.predicate
+        assert 'window.location.href !== "https://www.saucedemo.com/"' in driver.predicate
+        assert wait.unmet_conditions(contract) == ["user-name visible"]
+
+    def test_page_load_strategy_decides_ready_state(self):
+        class ScriptDriver:
+            def execute_async_script(self, script, *args):
+                self.states = args[1]
+                return True
+
+        driver = ScriptDriver()
+        SmartWait(driver, timeout=1).wait_for_page_load(strategy="eager")
+        assert driver.states == ["interactive", "complete"]
+        SmartWait(driver, timeout=1).wait_for_page_load(strategy="normal")
+        assert driver.states == ["complete"]
+
+    def test_polling_fallback_only_gets_the_time_left(self, monkeypatch):
+        from src.utilities import waits
+        clock = [100.0]
+        timeouts = []
+
+        class ScriptDriver:
+            def execute_async_script(self, script, *args):
+                clock[0] += 5
+                # Selenium reports a script timeout as TimeoutException
+                raise TimeoutException("script timeout")
+
+        class RecordingWait:
+            def __init__(self, driver, timeout, poll_frequency):
+                timeouts.append(timeout)
+
+            def until(self, method):
+                raise TimeoutException()
+
+        monkeypatch.setattr(waits.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(waits, "WebDriverWait", RecordingWait)
+
+        assert SmartWait(ScriptDriver(), timeout=5).wait_for_js_value("return false;") is None
+        assert SmartWait(ScriptDriver(), timeout=8).wait_for_js_value("return false;") is None
+        assert timeouts == [0.0, 3.0]
+
+    def test_network_idle_does_not_assume_jquery(self):
+        class ScriptDriver:
+            def execute_async_script(self, script, *args):
+                self.script, self.args = script, args
+                return True
+
+        driver = ScriptDriver()
+        assert SmartWait(driver, timeout=2).wait_for_ajax_complete(quiet_ms=200)
+        assert "window.jQuery &&" in driver.script
+        assert driver.args == (200, 2000)
+
+    def test_forbid_sleep_blocks_project_code(self):
+        original_sleep = time.sleep
+        with forbid_sleep():
+            with pytest.raises(SleepForbiddenError):
+                time.sleep(0)
+        assert time.sleep is original_sleep
@@ -0,0 +1,89 @@
+# src/utilities/auth_state.py
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_SCRIPT = """
+var dump = function(storage) {
+    var out = {};
+    for (var i = 0; i < storage.length; i++) { var key = storage.key(i); out[key] = storage.getItem(key); }
+    return out;
+};
+return {local: dump(window.localStorage), session: dump(window.sessionStorage), url: window.location.href};
+"""
+
+RESTORE_SCRIPT = """
+var local = arguments[0], session = arguments[1];
+Object.keys(local).forEach(function(key) { window.localStorage.setItem(key, local[key]); });
+Object.keys(session).forEach(function(key) { window.sessionStorage.setItem(key, session[key]); });
+"""
+
+# Cookie keys accepted by WebDriver's add_cookie; domain is dropped so the
+# cookie binds to the current host (localhost cookies with a domain are rejected)
+COOKIE_KEYS = ("name", "value", "path", "secure", "httpOnly", "expiry", "sameSite")
+
+
+@dataclass
+class AuthState:
+    """Cookies and web storage captured after a successful login"""
+    cookies: List[Dict] = field(default_factory=list)
+    local_storage: Dict[str, str] = field(default_factory=dict)
+    session_storage: Dict[str, str] = field(default_factory=dict)
+    url: str = ""
+
+
+class AuthStateCache:
+    """Per-worker cache of logged-in session state, keyed by username"""
+
+    def __init__(self):
+        self._states: Dict[str, AuthState] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def get(self, username: str) -> Optional[AuthState]:
+        with self._lock:
+            state = self._states.get(username)
+            if state is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return state
+
+    def put(self, username: str, state: AuthState):
+        with self._lock:
+            self._states[username] = state
+
+    def invalidate(self, username: str):
+        """Drop a state the application rejected"""
+        with self._lock:
+            self.rejected += 1
+            self._states.pop(username, None)
+
+    @staticmethod
+    def capture(driver) -> AuthState:
+        """Read cookies and storage from the current page"""
+        storage = driver.execute_script(CAPTURE_SCRIPT)
+        return AuthState(
+            cookies=driver.get_cookies(),
+            local_storage=storage.get("local", {}),
+            session_storage=storage.get("session", {}),
+            url=storage.get("url", "")
+        )
+
+    @staticmethod
+    def inject(driver, state: AuthState, origin_url: str):
+        """Load the origin, restore cookies and storage, then open the logged-in URL"""
+        driver.get(origin_url)
+        for cookie in state.cookies:
+            driver.add_cookie({key: cookie[key] for key in COOKIE_KEYS if key in cookie})
+        if state.local_storage or state.session_storage:
+            driver.execute_script(RESTORE_SCRIPT, state.local_storage, state.session_storage)
+        driver.get(state.url or origin_url)
+
+
+auth_state_cache = AuthStateCache()
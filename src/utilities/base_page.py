@@ -2,30 +2,149 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
 from src.config.config import config
+from src.utilities.waits import Ready, SmartWait, locator_to_js, locator_to_js_all
+from src.utilities.profiler import profile_wait, profiled_wait
+from src.utilities.screenshots import get_screenshot_service
+from src.utilities.page_metrics import ACTION_MARK, performance_recorder
+from src.utilities.lean_mode import is_lean
+from dataclasses import dataclass, field
+import json
+from typing import Any, Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_SCRIPT = """
+var attributeNames = arguments[0];
+return [%s].map(function(find) {
+    var matches = find();
+    var el = matches[0];
+    if (!el) { return {present: false, count: 0}; }
+    var style = window.getComputedStyle(el);
+    var visible = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+        && style.visibility !== 'hidden';
+    var rect = el.getBoundingClientRect();
+    var attributes = {};
+    attributeNames.forEach(function(name) { attributes[name] = el.getAttribute(name); });
+    return {
+        present: true,
+        count: matches.length,
+        visible: visible,
+        text: visible ? (el.innerText || '').trim() : '',
+        attributes: attributes,
+        rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height}
+    };
+});
+"""
+
+# Sets values through the native setter so React's value tracker sees the
+# change, then fires the events frameworks listen for.
+# Locator strategies (By.ID, By.CSS_SELECTOR, ...); tells locators apart from other string pairs
+BY_STRATEGIES = frozenset(value for name, value in vars(By).items() if name.isupper() and isinstance(value, str))
+
+FORM_FILL_SCRIPT = """
+var values = arguments[0];
+var submit = arguments[1];
+var finders = {%s};
+var missing = [];
+Object.keys(values).forEach(function(name) {
+    var el = finders[name]();
+    if (!el) { missing.push(name); return; }
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, values[name]);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+});
+if (missing.length) { return missing; }
+if (submit) {
+    var button = finders['__submit__']();
+    if (!button) { return ['__submit__']; }
+    // Start of a possible soft navigation (see page_metrics)
+    performance.mark(arguments[2]);
+    button.click();
+}
+return missing;
+"""
+
+
+@dataclass
+class ElementSnapshot:
+    """State of one locator captured by BasePage.snapshot"""
+    present: bool = False
+    count: int = 0
+    visible: bool = False
+    text: str = ""
+    attributes: Dict[str, Optional[str]] = field(default_factory=dict)
+    rect: Dict[str, float] = field(default_factory=dict)
+
+
 class BasePage:
     """Base class for all page objects"""
     
+    # Declarative form fields: name -> locator, filled by fill_form()
+    FORM_FIELDS: Dict[str, tuple] = {}
+    # Fields that need real keystrokes (key handlers, masks) instead of a value set
+    KEYSTROKE_FIELDS: tuple = ()
+    # Readiness contract: conditions that mean the page is usable, checked in one in-browser wait
+    READY: Tuple[Ready, ...] = ()
+    
     def __init__(self, driver):
         self.driver = driver
         self.base_url = config.BASE_URL
         self.wait = WebDriverWait(driver, config.WAIT_TIME)
+        self.smart_wait = SmartWait(driver, timeout=config.WAIT_TIME)
+        # WebElement handles keyed by locator; dropped on navigation or staleness
+        self._element_cache = {}
+        self.cache_lookups = 0
+        self.cache_hits = 0
+        self.cache_stale = 0
     
     def find_element(self, locator):
-        """Find element with explicit wait"""
+        """Find element with explicit wait, reusing a cached handle when available"""
+        self.cache_lookups += 1
+        element = self._element_cache.get(locator)
+        if element is not None:
+            self.cache_hits += 1
+            return element
         try:
-            return self.wait.until(
-                EC.presence_of_element_located(locator)
-            )
+            with profiled_wait(self.driver, "find", locator):
+                element = self.wait.until(
+                    EC.presence_of_element_located(locator)
+                )
         except TimeoutException:
-            logger.error(f"Element not found: {locator}")
+            logger.error("Element not found: %s", locator)
             raise
+        self._element_cache[locator] = element
+        return element
+    
+    def invalidate_cache(self, locator=None):
+        """Forget cached element handles (all of them, or one locator)"""
+        if locator is None:
+            self._element_cache.clear()
+        else:
+            self._element_cache.pop(locator, None)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Element cache counters: lookups, hits (saved round trips) and stale re-resolves"""
+        return {"lookups": self.cache_lookups, "hits": self.cache_hits, "stale": self.cache_stale}
     
+    def _with_element(self, locator, action):
+        """Run `action(element)`, re-resolving once if the cached handle went stale"""
+        element = self.find_element(locator)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            logger.info("Stale element for %s, re-resolving", locator)
+            self.cache_stale += 1
+            self.invalidate_cache(locator)
+            return action(self.find_element(locator))
+    
+    @profile_wait("find_all")
     def find_elements(self, locator):
         """Find multiple elements"""
         try:
@@ -33,40 +152,138 @@ class BasePage:
                 EC.presence_of_all_elements_located(locator)
             )
         except TimeoutException:
-            logger.error(f"Elements not found: {locator}")
+            logger.error("Elements not found: %s", locator)
             return []
     
     def click_element(self, locator):
         """Click element with wait"""
-        element = self.wait.until(
-            EC.element_to_be_clickable(locator)
-        )
-        element.click()
-        return element
+        def click(element):
+            self.wait.until(EC.element_to_be_clickable(element)).click()
+            return element
+        return self._with_element(locator, click)
     
     def clear_and_send_keys(self, locator, text):
         """Clear field and enter text"""
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
-        return element
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
+            return element
+        return self._with_element(locator, type_text)
+    
+    def fill_form(self, values: Dict[str, str], submit=None, keystroke_fields=None):
+        """Fill declared FORM_FIELDS (and optionally click `submit`) in one round trip.
+        
+        Fields listed in `keystroke_fields` (default KEYSTROKE_FIELDS) are typed
+        with send_keys instead, after the batched fields.
+        """
+        keystroke_fields = self.KEYSTROKE_FIELDS if keystroke_fields is None else keystroke_fields
+        unknown = set(values) - set(self.FORM_FIELDS)
+        if unknown:
+            raise KeyError(f"Undeclared form fields on {type(self).__name__}: {sorted(unknown)}")
+        batched = {name: value for name, value in values.items() if name not in keystroke_fields}
+        typed = {name: value for name, value in values.items() if name in keystroke_fields}
+        
+        finders = {name: self.FORM_FIELDS[name] for name in batched}
+        if submit is not None and not typed:
+            finders["__submit__"] = submit
+        script = FORM_FILL_SCRIPT % ", ".join(
+            f"{json.dumps(name)}: function() {{ return {locator_to_js(locator)}; }}"
+            for name, locator in finders.items()
+        )
+        if finders:
+            if "__submit__" in finders:
+                # Submitting usually replaces the page; cached handles would go stale
+                self.invalidate_cache()
+            missing = self.driver.execute_script(script, batched, "__submit__" in finders, ACTION_MARK)
+            if missing:
+                logger.error("Form fields not found: %s", missing)
+                raise NoSuchElementException(f"Form fields not found: {missing}")
+        
+        for name, value in typed.items():
+            self.clear_and_send_keys(self.FORM_FIELDS[name], value)
+        if submit is not None and typed:
+            self.driver.execute_script("performance.mark(arguments[0]);", ACTION_MARK)
+            self.click_element(submit)
+        return self
     
     def get_element_text(self, locator):
         """Get text from element"""
-        element = self.find_element(locator)
-        return element.text.strip()
+        return self._with_element(locator, lambda element: element.text.strip())
     
 # In src/utilities/base_page.py - add this method
+    @profile_wait("displayed")
     def is_element_displayed(self, locator, timeout=10):
         """Check if element is displayed with custom timeout"""
+        cached = self._element_cache.get(locator)
+        if cached is not None:
+            self.cache_lookups += 1
+            try:
+                displayed = cached.is_displayed()
+                self.cache_hits += 1
+                return displayed
+            except StaleElementReferenceException:
+                self.cache_stale += 1
+                self.invalidate_cache(locator)
         try:
             element = WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located(locator)
             )
+            self._element_cache[locator] = element
             return element.is_displayed()
-        except:
+        except (TimeoutException, WebDriverException):
             return False
     
+    @profile_wait("present")
+    def is_element_present(self, locator, timeout=0) -> bool:
+        """Check if element is in the DOM; with timeout=0 this is a single lookup"""
+        if timeout:
+            return self.smart_wait.wait_for_any_element([locator], visible=False, timeout=timeout) is not None
+        return len(self.driver.find_elements(*locator)) > 0
+    
+    @profile_wait("absent")
+    def is_element_absent(self, locator, timeout=0) -> bool:
+        """Check if element is not in the DOM, optionally waiting for it to go away"""
+        if timeout:
+            return self.smart_wait.wait_for_js_condition(
+                f"return {locator_to_js(locator)} === null;", timeout=timeout
+            )
+        return len(self.driver.find_elements(*locator)) == 0
+    
+    @profile_wait("any")
+    def wait_for_any(self, locators, timeout=None, visible=True):
+        """Wait for the first visible element among several locators and return its locator"""
+        timeout = config.WAIT_TIME if timeout is None else timeout
+        matched = self.smart_wait.wait_for_any_element(locators, visible=visible, timeout=timeout)
+        if matched is None:
+            logger.info("None of %s appeared within %ss", locators, timeout)
+        return matched
+    
+    @classmethod
+    def page_locators(cls) -> Dict[str, tuple]:
+        """Class-level (By, value) locators declared on this page object, by name"""
+        locators = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if (name.isupper() and isinstance(value, tuple) and len(value) == 2
+                        and value[0] in BY_STRATEGIES and isinstance(value[1], str)):
+                    locators[name] = value
+        return locators
+    
+    def snapshot(self, locators=None, attributes=("value", "class", "disabled")) -> Dict[Any, ElementSnapshot]:
+        """Read presence, visibility, text, attributes and box of many locators in one round trip.
+        
+        `locators` may be a list of locator tuples (keys are the tuples) or a
+        name -> locator mapping; defaults to every locator declared on the page.
+        """
+        if locators is None:
+            locators = self.page_locators()
+        keys = list(locators.keys()) if isinstance(locators, dict) else list(locators)
+        targets = list(locators.values()) if isinstance(locators, dict) else list(locators)
+        finders = ", ".join(f"function() {{ return {locator_to_js_all(locator)}; }}" for locator in targets)
+        results = self.driver.execute_script(SNAPSHOT_SCRIPT % finders, list(attributes))
+        return {key: ElementSnapshot(**result) for key, result in zip(keys, results)}
+    
+    @profile_wait("visible")
     def wait_for_element_visible(self, locator, timeout=None):
         """Wait for element to be visible"""
         timeout = timeout or config.WAIT_TIME
@@ -75,9 +292,36 @@ class BasePage:
             EC.visibility_of_element_located(locator)
         )
     
+    def wait_until_ready(self, timeout=None, since=None):
+        """Return once the page's readiness contract holds (document readyState if it has none).
+
+        `since` is a document marker taken before navigating; the page is only
+        ready on a later document, so an early return from driver.get cannot
+        pass against the page being left.
+        """
+        timeout = config.WAIT_TIME if timeout is None else timeout
+        if not self.READY:
+            self.smart_wait.wait_for_page_load(timeout=timeout, since=since)
+            return self
+        if not self.smart_wait.wait_for_ready(self.READY, timeout=timeout, since=since):
+            unmet = ", ".join(self.smart_wait.unmet_conditions(self.READY, since)) or "flapping conditions"
+            raise TimeoutException(f"{type(self).__name__} not ready within {timeout}s: {unmet}")
+        return self
+    
+    def capture_performance(self, page: str):
+        """Record timing for the current document, or for a route change within it, and check its budget"""
+        if not config.CAPTURE_PERFORMANCE:
+            return None
+        try:
+            metrics = performance_recorder.capture(self.driver, page)
+        except WebDriverException as e:
+            logger.warning("Could not read performance timing for %s: %s", page, e)
+            return None
+        if metrics is None:
+            return None
+        metrics.lean = is_lean(self.driver)
+        return performance_recorder.record(metrics, config.PERF_BUDGET_MODE)
+    
     def take_screenshot(self, name):
-        """Take screenshot for debugging"""
-        screenshot_path = f"{config.REPORT_PATH}/screenshots/{name}.png"
-        self.driver.save_screenshot(screenshot_path)
-        logger.info(f"Screenshot saved: {screenshot_path}")
-        return screenshot_path
\ No newline at end of file
+        """Take screenshot for debugging; written (and deduplicated) in the background"""
+        return get_screenshot_service().capture(self.driver, name)
\ No newline at end of file
@@ -0,0 +1,145 @@
+# src/utilities/browser_matrix.py
+"""
+Cross-browser matrix results.
+
+run_tests.py runs one pytest process per browser variant (e.g. chrome,
+firefox:headed). This module parses the variant list and merges the
+per-variant JUnit results into one table with a column per variant and a
+timing comparison of the same test across browsers.
+"""
+import html
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.utilities.duration_history import read_junit_durations
+
+BROWSERS = ("chrome", "firefox", "edge")
+MODES = {"headless": True, "headed": False}
+
+
+@dataclass(frozen=True)
+class Variant:
+    """One browser configuration of the matrix"""
+    browser: str
+    headless: bool
+
+    @property
+    def label(self) -> str:
+        return f"{self.browser}-{'headless' if self.headless else 'headed'}"
+
+
+def parse_variants(value: str, headless: bool = False) -> List[Variant]:
+    """'chrome,firefox:headed,edge' -> variants; entries without :headless/:headed use `headless`"""
+    variants = []
+    for entry in filter(None, (part.strip().lower() for part in value.split(","))):
+        browser, _, mode = entry.partition(":")
+        if browser not in BROWSERS:
+            raise ValueError(f"unknown browser {browser!r} (expected one of {', '.join(BROWSERS)})")
+        if mode and mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r} for {browser} (expected headless or headed)")
+        variant = Variant(browser, MODES[mode] if mode else headless)
+        if variant not in variants:
+            variants.append(variant)
+    if not variants:
+        raise ValueError("no browsers given")
+    return variants
+
+
+def load_results(junit_paths: Dict[str, str]) -> Dict[str, Dict[str, Dict]]:
+    """{test: {label: {"outcome", "total"}}} from each variant's JUnit XML (missing files are skipped)"""
+    results: Dict[str, Dict[str, Dict]] = {}
+    for label, path in junit_paths.items():
+        if not os.path.exists(path):
+            continue
+        for row in read_junit_durations(path):
+            results.setdefault(row["test"], {})[label] = {"outcome": row["outcome"], "total": row["total"]}
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Dict]], labels: List[str]) -> Dict:
+    """Per-variant totals and, per test, how much slower its slowest variant was than its fastest"""
+    totals = {label: {"tests": 0, "passed": 0, "failed": 0, "skipped": 0, "error": 0, "time": 0.0}
+              for label in labels}
+    tests = []
+    for test, by_label in sorted(results.items()):
+        for label, result in by_label.items():
+            totals[label]["tests"] += 1
+            totals[label][result["outcome"]] += 1
+            totals[label]["time"] += result["total"]
+        timed = {label: result["total"] for label, result in by_label.items() if result["outcome"] != "skipped"}
+        spread = None
+        if len(timed) > 1 and min(timed.values()) > 0:
+            spread = round(max(timed.values()) / min(timed.values()), 2)
+        tests.append({
+            "test": test,
+            "results": by_label,
+            "fastest": min(timed, key=timed.get) if timed else None,
+            "slowest": max(timed, key=timed.get) if timed else None,
+            "spread": spread,
+        })
+    for total in totals.values():
+        total["time"] = round(total["time"], 3)
+    return {"variants": labels, "totals": totals, "tests": tests}
+
+
+def format_matrix(matrix: Dict, top: int = 5) -> List[str]:
+    """Per-variant totals and the tests whose timing differs most between browsers"""
+    lines = [f"{'variant':<18} {'tests':>6} {'passed':>7} {'failed':>7} {'skipped':>8} {'error':>6} {'time':>9}"]
+    for label in matrix["variants"]:
+        t = matrix["totals"][label]
+        lines.append(f"{label:<18} {t['tests']:>6} {t['passed']:>7} {t['failed']:>7} "
+                     f"{t['skipped']:>8} {t['error']:>6} {t['time']:>8.1f}s")
+    spread = sorted((test for test in matrix["tests"] if test["spread"]), key=lambda test: -test["spread"])[:top]
+    if spread:
+        lines.append("Largest timing differences for the same test:")
+        for test in spread:
+            lines.append(f"  {test['spread']:.1f}x  {test['test']} "
+                         f"({test['fastest']} fastest, {test['slowest']} slowest)")
+    mismatched = [test["test"] for test in matrix["tests"]
+                  if len({result["outcome"] for result in test["results"].values()}) > 1]
+    if mismatched:
+        lines.append(f"Outcome differs between browsers: {len(mismatched)} tests")
+    return lines
+
+
+def write_matrix_report(matrix: Dict, directory: str, reports: Optional[Dict[str, str]] = None) -> str:
+    """Write matrix.json and matrix.html (one column per variant) to `directory`; returns the HTML path"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "matrix.json"), 'w') as file:
+        json.dump(matrix, file, indent=2)
+
+    labels = matrix["variants"]
+    links = reports or {}
+    header = "".join(
+        f"<th><a href=\"{html.escape(links[label])}\">{html.escape(label)}</a></th>" if label in links
+        else f"<th>{html.escape(label)}</th>" for label in labels
+    )
+    rows = []
+    for test in matrix["tests"]:
+        cells = []
+        for label in labels:
+            result = test["results"].get(label)
+            if result is None:
+                cells.append("<td class=\"missing\">-</td>")
+                continue
+            marker = " fastest" if label == test["fastest"] and test["spread"] else ""
+            cells.append(f"<td class=\"{result['outcome']}{marker}\">{result['outcome']} {result['total']:.2f}s</td>")
+        spread = f"{test['spread']:.1f}x" if test["spread"] else ""
+        rows.append(f"<tr><td>{html.escape(test['test'])}</td>{''.join(cells)}<td>{spread}</td></tr>")
+    totals = "".join(
+        f"<td>{matrix['totals'][label]['passed']}/{matrix['totals'][label]['tests']} passed, "
+        f"{matrix['totals'][label]['time']:.1f}s</td>" for label in labels
+    )
+    path = os.path.join(directory, "matrix.html")
+    with open(path, 'w') as file:
+        file.write(
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Browser matrix</title><style>"
+            "body{font-family:sans-serif}table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:4px 8px}"
+            ".passed{background:#e6f4ea}.failed,.error{background:#fce8e6}.skipped{background:#f1f3f4}"
+            ".fastest{font-weight:bold}</style></head><body><h1>Browser matrix</h1><table>"
+            f"<tr><th>Test</th>{header}<th>slowest/fastest</th></tr>"
+            f"<tr><th>Total</th>{totals}<td></td></tr>{''.join(rows)}</table></body></html>"
+        )
+    return path
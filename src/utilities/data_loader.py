@@ -1,70 +1,376 @@
 # src/utilities/data_loader.py
+import csv
 import json
-import pandas as pd
-from typing import Dict, List, Any
+import re
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Iterator, NamedTuple, Optional, Tuple
 import os
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Go up 3 levels from utilities directory to project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FrozenDict(dict):
+    """Read-only dict returned from the data cache"""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached test data is read-only; use DataLoader.thaw() for a mutable copy")
+    
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+    
+    # Pickle through the constructor, not item assignment; copies are mutable
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+    
+    def __copy__(self):
+        return dict(self)
+    
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+
+class FrozenList(list):
+    """Read-only list returned from the data cache"""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached test data is read-only; use DataLoader.thaw() for a mutable copy")
+    
+    __setitem__ = __delitem__ = append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    __iadd__ = __imul__ = _readonly
+    
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+    
+    def __copy__(self):
+        return list(self)
+    
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def infer_type(value):
+    """Convert a CSV cell to None/bool/int/float where it looks like one"""
+    if value is None or value == "":
+        return None
+    lowered = value.strip().lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+class DataRow(NamedTuple):
+    """Lightweight pointer to one record; the row itself is read on demand"""
+    path: str
+    sheet: Optional[str]
+    index: int
+    offset: Any
+    types: Optional[Dict[str, Callable]] = None
+    
+    def load(self) -> Dict[str, Any]:
+        return DataLoader.read_row(self)
+
+
+class _XlsxCursor:
+    """Forward-only read-only workbook cursor.
+
+    seek() serves rows in any order (xdist hands parametrized rows out of
+    order): rows passed on the way are kept, so each row is decoded once and
+    the workbook is never rescanned.
+    """
+    
+    def __init__(self, path: str, sheet: Optional[str]):
+        self.path = path
+        self.sheet = sheet
+        self.position = None
+        # Row values by position, filled by seek()
+        self._seen: List[tuple] = []
+        self._open()
+    
+    def _open(self):
+        import openpyxl
+        self.workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        # First sheet by default, matching pandas.read_excel
+        worksheet = self.workbook[self.sheet] if self.sheet else self.workbook.worksheets[0]
+        self.rows = worksheet.iter_rows(values_only=True)
+        self.header = [str(cell) if cell is not None else "" for cell in next(self.rows, ())]
+        self.position = -1
+    
+    def __iter__(self):
+        for values in self.rows:
+            self.position += 1
+            yield self.position, values
+    
+    def seek(self, index: int):
+        if index < len(self._seen):
+            return self._seen[index]
+        for position, values in self:
+            self._seen.append(values)
+            if position == index:
+                return values
+        raise IndexError(f"Row {index} not found in {self.path}")
+    
+    def close(self):
+        self.workbook.close()
+
+
 class DataLoader:
     """Loads test data from various sources"""
     
+    # In-process cache: (kind, path, sheet) -> ((mtime_ns, size), frozen data)
+    CACHE_SIZE = 32
+    _cache = OrderedDict()
+    _cache_lock = threading.Lock()
+    cache_hits = 0
+    cache_misses = 0
+    
+    @staticmethod
+    def resolve_path(file_path: str) -> str:
+        """Resolve paths relative to the project root"""
+        if not os.path.isabs(file_path):
+            return os.path.join(PROJECT_ROOT, file_path)
+        return file_path
+    
+    @classmethod
+    def _cached(cls, key: tuple, file_path: str, loader: Callable[[str], Any]):
+        """Return frozen data for a file, re-reading only when its mtime or size changes"""
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with cls._cache_lock:
+            entry = cls._cache.get(key)
+            if entry is not None and entry[0] == stamp:
+                cls._cache.move_to_end(key)
+                cls.cache_hits += 1
+                return entry[1]
+        
+        logger.info("Loading %s from: %s", key[0], file_path)
+        data = _freeze(loader(file_path))
+        with cls._cache_lock:
+            cls.cache_misses += 1
+            cls._cache[key] = (stamp, data)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        logger.info("Data loaded successfully from %s", os.path.basename(file_path))
+        return data
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached data"""
+        with cls._cache_lock:
+            cls._cache.clear()
+            cls.cache_hits = 0
+            cls.cache_misses = 0
+    
+    @staticmethod
+    def thaw(data):
+        """Return a mutable deep copy of cached data"""
+        return _thaw(data)
+    
+    @staticmethod
+    def _read_json(file_path: str):
+        with open(file_path, 'r') as file:
+            return json.load(file)
+    
+    _sheet_cache = None
+    
+    @staticmethod
+    def sheet_cache():
+        """Compiled spreadsheet cache shared by all workers (under DATA_CACHE_DIR)"""
+        if DataLoader._sheet_cache is None:
+            from src.config.config import config
+            from src.utilities.sheet_cache import SheetCache
+            DataLoader._sheet_cache = SheetCache(config.DATA_CACHE_DIR)
+        return DataLoader._sheet_cache
+    
+    @staticmethod
+    def _compile_sheet(file_path: str, sheet_name: str = None):
+        cursor = _XlsxCursor(file_path, sheet_name)
+        try:
+            rows = [values for _, values in cursor
+                    if values is not None and not all(value is None for value in values)]
+            return cursor.header, rows
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _read_excel(file_path: str, sheet_name: str = None):
+        if os.path.splitext(file_path)[1].lower() in (".xlsx", ".xlsm"):
+            # Compiled once per workbook content; later reads need neither pandas nor openpyxl
+            return DataLoader.sheet_cache().load(file_path, sheet_name, DataLoader._compile_sheet)
+        # pandas is only imported for legacy formats openpyxl cannot read
+        import pandas as pd
+        if sheet_name:
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+        else:
+            df = pd.read_excel(file_path)
+        # Convert to list of dictionaries
+        return df.to_dict('records')
+    
     @staticmethod
     def load_json(file_path: str) -> Dict[str, Any]:
-        """Load data from JSON file"""
+        """Load data from JSON file (cached, read-only)"""
         try:
-            # Handle relative paths
-            if not os.path.isabs(file_path):
-                # Go up 3 levels from utilities directory to project root
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                file_path = os.path.join(project_root, file_path)
-            
-            logger.info(f"Loading JSON from: {file_path}")
+            file_path = DataLoader.resolve_path(file_path)
             
             if not os.path.exists(file_path):
-                logger.warning(f"JSON file not found: {file_path}")
+                logger.warning("JSON file not found: %s", file_path)
                 return {}
             
-            with open(file_path, 'r') as file:
-                data = json.load(file)
-            logger.info(f"Data loaded successfully from {os.path.basename(file_path)}")
-            return data
+            return DataLoader._cached(("JSON", file_path, None), file_path, DataLoader._read_json)
         except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in {file_path}: {str(e)}")
+            logger.error("JSON decode error in %s: %s", file_path, e)
             return {}
         except Exception as e:
-            logger.error(f"Error loading JSON data from {file_path}: {str(e)}")
+            logger.error("Error loading JSON data from %s: %s", file_path, e)
             return {}
     
     @staticmethod
     def load_excel(file_path: str, sheet_name: str = None) -> List[Dict]:
-        """Load data from Excel file"""
+        """Load data from Excel file (cached, read-only)"""
         try:
-            # Handle relative paths
-            if not os.path.isabs(file_path):
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-                file_path = os.path.join(project_root, file_path)
-            
-            logger.info(f"Loading Excel from: {file_path}")
+            file_path = DataLoader.resolve_path(file_path)
             
             if not os.path.exists(file_path):
-                logger.warning(f"Excel file not found: {file_path}")
+                logger.warning("Excel file not found: %s", file_path)
                 return []
             
-            if sheet_name:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-            else:
-                df = pd.read_excel(file_path)
-            
-            # Convert to list of dictionaries
-            data = df.to_dict('records')
-            logger.info(f"Data loaded successfully from {os.path.basename(file_path)}")
-            return data
+            return DataLoader._cached(
+                ("Excel", file_path, sheet_name), file_path,
+                lambda path: DataLoader._read_excel(path, sheet_name)
+            )
         except Exception as e:
-            logger.error(f"Error loading Excel data from {file_path}: {str(e)}")
+            logger.error("Error loading Excel data from %s: %s", file_path, e)
             return []
     
+    @staticmethod
+    def iter_records(file_path: str, sheet_name: str = None,
+                     types: Dict[str, Callable] = None) -> Iterator[Dict[str, Any]]:
+        """Stream records from .xlsx, .csv or .jsonl without loading the whole file"""
+        for _, record in DataLoader._iter_with_offsets(DataLoader.resolve_path(file_path), sheet_name, types):
+            yield record
+    
+    @staticmethod
+    def _apply_types(record: Dict[str, Any], types: Optional[Dict[str, Callable]], infer: bool):
+        for key, value in record.items():
+            if types and key in types and value is not None:
+                record[key] = types[key](value)
+            elif infer:
+                record[key] = infer_type(value)
+        return record
+    
+    @staticmethod
+    def _iter_with_offsets(file_path: str, sheet_name: str = None,
+                           types: Dict[str, Callable] = None) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in (".xlsx", ".xlsm"):
+            cursor = _XlsxCursor(file_path, sheet_name)
+            try:
+                for index, values in cursor:
+                    if values is None or all(value is None for value in values):
+                        continue
+                    record = dict(zip(cursor.header, values))
+                    yield index, DataLoader._apply_types(record, types, infer=False)
+            finally:
+                cursor.close()
+        elif extension == ".csv":
+            with open(file_path, 'r', newline='', encoding='utf-8') as file:
+                header = next(csv.reader([file.readline()]), [])
+                starts = []
+                
+                def lines():
+                    while True:
+                        starts.append(file.tell())
+                        line = file.readline()
+                        if not line:
+                            return
+                        yield line
+                
+                for values in csv.reader(lines()):
+                    # First line consumed for this record (quoted fields may span lines)
+                    offset = starts[0]
+                    starts.clear()
+                    if values:
+                        yield offset, DataLoader._apply_types(dict(zip(header, values)), types, infer=True)
+        elif extension in (".jsonl", ".ndjson"):
+            with open(file_path, 'rb') as file:
+                while True:
+                    offset = file.tell()
+                    line = file.readline()
+                    if not line:
+                        return
+                    if line.strip():
+                        yield offset, DataLoader._apply_types(json.loads(line), types, infer=False)
+        else:
+            raise ValueError(f"Unsupported data file for streaming: {file_path}")
+    
+    _xlsx_cursors: Dict[Tuple[str, Optional[str]], _XlsxCursor] = {}
+    
+    @staticmethod
+    def read_row(row: DataRow) -> Dict[str, Any]:
+        """Read a single record referenced by a DataRow"""
+        extension = os.path.splitext(row.path)[1].lower()
+        if extension in (".xlsx", ".xlsm"):
+            key = (row.path, row.sheet)
+            cursor = DataLoader._xlsx_cursors.get(key)
+            if cursor is None:
+                cursor = DataLoader._xlsx_cursors[key] = _XlsxCursor(row.path, row.sheet)
+            values = cursor.seek(row.offset)
+            return DataLoader._apply_types(dict(zip(cursor.header, values)), row.types, infer=False)
+        if extension == ".csv":
+            with open(row.path, 'r', newline='', encoding='utf-8') as file:
+                header = next(csv.reader([file.readline()]), [])
+                file.seek(row.offset)
+                values = next(csv.reader(file))
+            return DataLoader._apply_types(dict(zip(header, values)), row.types, infer=True)
+        with open(row.path, 'rb') as file:
+            file.seek(row.offset)
+            return DataLoader._apply_types(json.loads(file.readline()), row.types, infer=False)
+    
+    @staticmethod
+    def close_streams():
+        """Close workbooks held open for on-demand row reads"""
+        while DataLoader._xlsx_cursors:
+            _, cursor = DataLoader._xlsx_cursors.popitem()
+            cursor.close()
+    
+    @staticmethod
+    def iter_params(file_path: str, sheet_name: str = None, id_field: str = None,
+                    types: Dict[str, Callable] = None) -> Iterator[Tuple[DataRow, str]]:
+        """Yield (DataRow, test id) pairs for parametrization; only ids and offsets are kept"""
+        file_path = DataLoader.resolve_path(file_path)
+        for index, (offset, record) in enumerate(DataLoader._iter_with_offsets(file_path, sheet_name, types)):
+            label = record.get(id_field) if id_field else None
+            test_id = re.sub(r"[^\w.@-]+", "_", str(label)).strip("_") if label not in (None, "") else ""
+            yield DataRow(file_path, sheet_name, index, offset, types), test_id or f"row{index}"
+    
     @staticmethod
     def load_test_credentials() -> List[Dict]:
         """Load test credentials"""
@@ -88,8 +394,8 @@ class DataLoader:
         
         # Fallback to default test data
         logger.warning("Using default invalid credentials data")
-        return [
+        return _freeze([
             {"username": "invalid_user", "password": "wrong_password", "expected_error": "Invalid"},
             {"username": "test", "password": "", "expected_error": "required"},
             {"username": "", "password": "test", "expected_error": "required"}
-        ]
\ No newline at end of file
+        ])
\ No newline at end of file
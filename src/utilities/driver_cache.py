@@ -0,0 +1,155 @@
+# src/utilities/driver_cache.py
+import json
+import os
+import shutil
+import sys
+import threading
+import logging
+from typing import Dict, Optional
+from src.config.config import config
+
+logger = logging.getLogger(__name__)
+
+# Executable names searched on PATH for each browser
+DRIVER_EXECUTABLES = {
+    "chrome": "chromedriver",
+    "firefox": "geckodriver",
+    "edge": "msedgedriver",
+}
+
+BROWSER_EXECUTABLES = {
+    "chrome": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"],
+    "firefox": ["firefox"],
+    "edge": ["microsoft-edge", "microsoft-edge-stable", "msedge"],
+}
+
+# Common install locations not normally on PATH
+BROWSER_INSTALL_PATHS = {
+    "chrome": [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    ],
+    "firefox": [
+        r"C:\Program Files\Mozilla Firefox\firefox.exe",
+        "/Applications/Firefox.app/Contents/MacOS/firefox",
+    ],
+    "edge": [
+        r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+        r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
+        "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
+    ],
+}
+
+
+class DriverBinaryCache:
+    """Resolves driver binaries once per machine and browser build"""
+
+    def __init__(self, cache_path: str = None, offline: bool = None):
+        self.cache_path = cache_path or config.DRIVER_CACHE_PATH
+        self.offline = config.DRIVER_OFFLINE if offline is None else offline
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, browser: str) -> Optional[str]:
+        """Return the driver path for a browser, or None to let Selenium decide"""
+        browser = browser.lower()
+        if config.DRIVER_PATH:
+            return config.DRIVER_PATH
+        with self._lock:
+            if browser not in self._resolved:
+                self._resolved[browser] = self._resolve_uncached(browser)
+            return self._resolved[browser]
+
+    def _resolve_uncached(self, browser: str) -> Optional[str]:
+        build = self.browser_build(browser)
+        # An unidentified build or a driver from PATH is re-checked every session, never persisted:
+        # neither would be invalidated when the browser is upgraded
+        persist = not build.startswith("unknown-")
+        key = f"{browser}|{build}"
+        entries = self._read()
+        entry = entries.get(key)
+        if entry and os.path.exists(entry.get("driver_path", "")):
+            logger.info("Using cached %s driver: %s", browser, entry['driver_path'])
+            return entry["driver_path"]
+
+        if self.offline:
+            driver_path = shutil.which(DRIVER_EXECUTABLES[browser])
+            if not driver_path:
+                raise RuntimeError(
+                    f"Offline mode: no cached {browser} driver for build '{build}' and "
+                    f"{DRIVER_EXECUTABLES[browser]} is not on PATH. Set DRIVER_PATH or run once online."
+                )
+            logger.info("Offline mode: using %s driver from PATH: %s", browser, driver_path)
+            persist = False
+        else:
+            try:
+                driver_path = self._install(browser)
+            except Exception as e:
+                logger.warning("webdriver_manager failed: %s. Trying fallback...", e)
+                driver_path = shutil.which(DRIVER_EXECUTABLES[browser])
+                if not driver_path:
+                    return None
+                persist = False
+
+        if not persist:
+            return driver_path
+        entries[key] = {
+            "driver_path": driver_path,
+            "browser": browser,
+            "build": build,
+            "browser_version": None if self.offline else self._browser_version(browser),
+        }
+        self._write(entries)
+        return driver_path
+
+    @staticmethod
+    def browser_build(browser: str) -> str:
+        """Identify the installed browser build without launching it"""
+        candidates = [shutil.which(name) for name in BROWSER_EXECUTABLES.get(browser, [])]
+        candidates += BROWSER_INSTALL_PATHS.get(browser, [])
+        for path in candidates:
+            if path and os.path.exists(path):
+                real_path = os.path.realpath(path)
+                stat = os.stat(real_path)
+                return f"{real_path}:{int(stat.st_mtime)}:{stat.st_size}"
+        return f"unknown-{sys.platform}"
+
+    @staticmethod
+    def _browser_version(browser: str) -> Optional[str]:
+        try:
+            from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+            browser_type = {"chrome": ChromeType.GOOGLE, "edge": ChromeType.MSEDGE}.get(browser, browser)
+            return OperationSystemManager().get_browser_version_from_os(browser_type)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _install(browser: str) -> str:
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        if browser == "firefox":
+            from webdriver_manager.firefox import GeckoDriverManager
+            return GeckoDriverManager().install()
+        if browser == "edge":
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager
+            return EdgeChromiumDriverManager().install()
+        raise ValueError(f"Unsupported browser: {browser}")
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.cache_path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries: Dict[str, Dict]):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump(entries, file, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Could not write driver cache %s: %s", self.cache_path, e)
@@ -1,29 +1,86 @@
 # src/utilities/driver_manager.py
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from src.config.config import config
+from src.utilities.driver_cache import DriverBinaryCache
+from src.utilities.profiler import instrument
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
+import threading
+import time
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+# Origins of the current window's document, its frames, and the resources it loaded.
+# Frames are documents and can hold cookies and storage; scripts, images and fonts cannot.
+VISITED_ORIGINS_SCRIPT = """
+function originOf(url) {
+    try { return new URL(url, window.location.href).origin; } catch (e) { return null; }
+}
+var frames = [];
+document.querySelectorAll('iframe[src], frame[src]').forEach(function(frame) {
+    frames.push(originOf(frame.src));
+});
+var resources = performance.getEntriesByType('resource').map(function(entry) {
+    return originOf(entry.name);
+});
+return {document: window.location.origin, frames: frames, resources: resources};
+"""
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
 class DriverManager:
     """Manages WebDriver instances"""
     
+    _pool = None
+    _binary_cache = None
+    
+    @classmethod
+    def get_binary_cache(cls):
+        """Return the per-worker driver binary cache"""
+        if cls._binary_cache is None:
+            cls._binary_cache = DriverBinaryCache()
+        return cls._binary_cache
+    
+    @classmethod
+    def get_pool(cls, prefetch=None):
+        """Return the per-worker driver pool, creating it on first use"""
+        if cls._pool is None:
+            cls._pool = DriverPool(prefetch=prefetch)
+        return cls._pool
+    
+    @classmethod
+    def pool_summary(cls):
+        """Return pool timing stats, or None if pooling was never used"""
+        return cls._pool.summary() if cls._pool is not None else None
+    
+    @classmethod
+    def shutdown_pool(cls):
+        """Quit all pooled drivers"""
+        if cls._pool is not None:
+            cls._pool.shutdown()
+    
     @staticmethod
     def create_driver():
         """Create and configure WebDriver instance"""
+        # Imported here so importing DriverManager/DriverPool does not load selenium
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        from selenium.webdriver.edge.service import Service as EdgeService
+        from src.utilities import lean_mode
         browser = config.BROWSER.lower()
         driver = None
         
         try:
             if browser == "chrome":
                 options = webdriver.ChromeOptions()
+                options.page_load_strategy = config.PAGE_LOAD_STRATEGY
                 if config.HEADLESS:
                     options.add_argument("--headless")
                 options.add_argument("--no-sandbox")
@@ -31,59 +88,251 @@ class DriverManager:
                 options.add_argument("--window-size=1920,1080")
                 options.add_argument("--disable-gpu")
                 options.add_argument("--disable-extensions")
+                if config.LEAN_MODE:
+                    lean_mode.configure_options(browser, options)
                 
-                # Fix: Use a specific ChromeDriver version instead of auto-detecting
-                # This avoids PowerShell dependency for browser detection
-                try:
-                    # Try to use webdriver_manager with specific version
-                    from webdriver_manager.core.os_manager import ChromeType
-                    service = ChromeService(ChromeDriverManager().install())
-                except Exception as e:
-                    logger.warning(f"webdriver_manager failed: {e}. Trying fallback...")
-                    # Fallback: Use ChromeDriver from PATH or specify path
-                    service = ChromeService()
-                
+                # Driver path is resolved once per machine/browser build and cached
+                service = ChromeService(DriverManager.get_binary_cache().resolve(browser))
                 driver = webdriver.Chrome(service=service, options=options)
                 
             elif browser == "firefox":
                 options = webdriver.FirefoxOptions()
+                options.page_load_strategy = config.PAGE_LOAD_STRATEGY
                 if config.HEADLESS:
                     options.add_argument("--headless")
-                try:
-                    service = FirefoxService(GeckoDriverManager().install())
-                except Exception as e:
-                    logger.warning(f"webdriver_manager failed: {e}. Trying fallback...")
-                    service = FirefoxService()
+                if config.LEAN_MODE:
+                    lean_mode.configure_options(browser, options)
+                service = FirefoxService(DriverManager.get_binary_cache().resolve(browser))
                 driver = webdriver.Firefox(service=service, options=options)
                 
             elif browser == "edge":
                 options = webdriver.EdgeOptions()
+                options.page_load_strategy = config.PAGE_LOAD_STRATEGY
                 if config.HEADLESS:
                     options.add_argument("--headless")
-                try:
-                    service = EdgeService(EdgeChromiumDriverManager().install())
-                except Exception as e:
-                    logger.warning(f"webdriver_manager failed: {e}. Trying fallback...")
-                    service = EdgeService()
+                if config.LEAN_MODE:
+                    lean_mode.configure_options(browser, options)
+                service = EdgeService(DriverManager.get_binary_cache().resolve(browser))
                 driver = webdriver.Edge(service=service, options=options)
                 
             else:
                 raise ValueError(f"Unsupported browser: {browser}")
             
             # Common configurations
-            driver.implicitly_wait(config.WAIT_TIME)
-            driver.set_page_load_timeout(config.TIMEOUT)
+            driver.implicitly_wait(config.IMPLICIT_WAIT)
+            driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+            # Headroom so in-browser event waits time out on their own first
+            driver.set_script_timeout(config.TIMEOUT + 5)
             driver.maximize_window()
-            logger.info(f"{browser.capitalize()} driver initialized successfully")
+            if config.LEAN_MODE:
+                lean_mode.install(driver)
+                lean_mode.apply_block_list(driver, lean_mode.effective_block_list())
+                driver.lean_mode = True
+            if config.PROFILE_COMMANDS:
+                # Times every command; the driver keeps its own type (pool reset, isinstance checks)
+                instrument(driver)
+            logger.info("%s driver initialized successfully", browser.capitalize())
             
             return driver
             
         except Exception as e:
-            logger.error(f"Failed to initialize driver: {str(e)}")
+            logger.error("Failed to initialize driver: %s", e)
             # Provide helpful troubleshooting info
             logger.error("\nTROUBLESHOOTING:")
             logger.error("1. Make sure you have Chrome/Firefox/Edge installed")
             logger.error("2. Try installing Chrome from: https://www.google.com/chrome/")
             logger.error("3. Or use headless mode with: --headless")
             logger.error("4. Or try Firefox: --browser firefox")
-            raise
\ No newline at end of file
+            raise
+
+class DriverPool:
+    """Pool of warm WebDriver sessions reused across tests in one worker"""
+
+    def __init__(self, factory=None, max_uses=None, prefetch=None):
+        self.factory = factory or DriverManager.create_driver
+        self.max_uses = max_uses or config.DRIVER_MAX_USES
+        self.prefetch = config.DRIVER_PREFETCH if prefetch is None else prefetch
+        self._idle = []
+        # Keyed by the driver itself: an id() can be reused once a discarded driver is collected
+        self._uses = {}
+        # Browsers being launched in the background, oldest first
+        self._pending = deque()
+        self._executor = None
+        if self.prefetch > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.prefetch, thread_name_prefix="driver-prefetch"
+            )
+        self._lock = threading.Lock()
+        # Timing stats for the startup-vs-test report
+        self.launched = 0
+        self.reused = 0
+        self.recycled = 0
+        self.startup_time = 0.0
+        self.test_time = 0.0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def acquire(self):
+        """Hand out an idle driver, waiting on a prefetched or new launch if needed"""
+        start = time.perf_counter()
+        driver = self._take()
+        self.last_wait = time.perf_counter() - start
+        self.wait_time += self.last_wait
+        self.max_wait = max(self.max_wait, self.last_wait)
+        self.warm_up()
+        return driver
+
+    def warm_up(self):
+        """Start background launches until `prefetch` spare browsers are ready or pending"""
+        if self._executor is None:
+            return
+        while len(self._idle) + len(self._pending) < self.prefetch:
+            self._pending.append(self._executor.submit(self._launch))
+
+    def release(self, driver, failed=False):
+        """Reset a driver and return it to the pool, or recycle it"""
+        self._uses[driver] = self._uses.get(driver, 0) + 1
+        if failed or self._uses[driver] >= self.max_uses:
+            logger.info("Recycling driver after %s uses (failed=%s)", self._uses[driver], failed)
+            self.recycled += 1
+            self._discard(driver)
+            return
+        try:
+            self.reset(driver)
+        except Exception as e:
+            logger.warning("Driver reset failed, recycling: %s", e)
+            self.recycled += 1
+            self._discard(driver)
+            return
+        self._idle.append(driver)
+
+    @classmethod
+    def reset(cls, driver):
+        """Clear cookies and storage, close extra windows, then park on a blank page.
+
+        Chromium clears every cookie over CDP, plus the storage of each origin
+        the open windows loaded. Other browsers clear each window's document
+        through the WebDriver cookie and storage APIs. Resource-only origins
+        hold no storage there, but a frame from another origin does and cannot
+        be cleared, so such a driver fails the reset and is recycled instead.
+        """
+        cdp = hasattr(driver, "execute_cdp_cmd")
+        handles = driver.window_handles
+        origins = set()
+        for handle in reversed(handles):
+            driver.switch_to.window(handle)
+            document, frames, resources = cls._visited_origins(driver)
+            if cdp:
+                origins.update(frames | resources | ({document} if document else set()))
+            else:
+                foreign = frames - {document}
+                if foreign:
+                    raise RuntimeError(f"cannot clear frames from {', '.join(sorted(foreign))} without CDP")
+                cls._clear_document(driver)
+            if handle != handles[0]:
+                driver.close()
+        if cdp:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in sorted(origins | {_origin(config.BASE_URL)}):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        driver.get("about:blank")
+
+    def shutdown(self):
+        """Cancel pending launches and quit every idle or prefetched driver"""
+        while self._pending:
+            future = self._pending.popleft()
+            if future.cancel():
+                continue
+            try:
+                self._discard(future.result())
+            except Exception as e:
+                logger.warning("Prefetched driver failed to launch: %s", e)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def record_test_time(self, seconds):
+        """Add time spent inside a test body to the report totals"""
+        self.test_time += seconds
+
+    def summary(self):
+        """Startup-vs-test time breakdown for the terminal report"""
+        avg_startup = self.startup_time / self.launched if self.launched else 0.0
+        return {
+            "launched": self.launched,
+            "reused": self.reused,
+            "recycled": self.recycled,
+            "startup_time": self.startup_time,
+            "avg_startup": avg_startup,
+            "test_time": self.test_time,
+            "saved_time": avg_startup * self.reused,
+            "wait_time": self.wait_time,
+            "max_wait": self.max_wait,
+            "hidden_startup": max(self.startup_time - self.wait_time, 0.0),
+        }
+
+    def _take(self):
+        while self._idle:
+            driver = self._idle.pop()
+            if self._is_alive(driver):
+                self.reused += 1
+                return driver
+            self._discard(driver)
+        while self._pending:
+            future = self._pending.popleft()
+            try:
+                return future.result()
+            except Exception as e:
+                logger.warning("Prefetched driver failed to launch: %s", e)
+        return self._launch()
+
+    def _launch(self):
+        start = time.perf_counter()
+        driver = self.factory()
+        with self._lock:
+            self.startup_time += time.perf_counter() - start
+            self.launched += 1
+            self._uses[driver] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning("Error quitting driver: %s", e)
+
+    @staticmethod
+    def _visited_origins(driver):
+        """The current window's document origin, plus the origins of its frames and resources"""
+        try:
+            visited = driver.execute_script(VISITED_ORIGINS_SCRIPT) or {}
+        except Exception:
+            visited = {}
+        web = ("http://", "https://")
+        document = visited.get("document") or ""
+        frames = {origin for origin in visited.get("frames", []) if origin and origin.startswith(web)}
+        resources = {origin for origin in visited.get("resources", []) if origin and origin.startswith(web)}
+        return (document if document.startswith(web) else None), frames, resources
+
+    @staticmethod
+    def _clear_document(driver):
+        """Clear the current document's storage and cookies through WebDriver"""
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # about:blank and data: URLs have no storage
+            pass
+        driver.delete_all_cookies()
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
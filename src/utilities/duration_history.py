@@ -0,0 +1,176 @@
+# src/utilities/duration_history.py
+"""
+Per-test duration history and duration-aware scheduling.
+
+Every run_tests.py invocation feeds its JUnit XML into a local SQLite
+store (setup/call/teardown seconds per test). Collection then uses the
+expected durations to run the longest tests first, so a slow test never
+starts last on an otherwise idle xdist worker, and to split the suite into
+`--shard i/N` parts of roughly equal runtime for separate CI machines.
+Local histories differ between machines, so a duration-balanced split needs
+one shared history file; without it shards are split by node id hash.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import statistics
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.utilities.junit_merge import iter_testcases, testcase_name, testcase_outcome
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS durations (
+    test TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    setup REAL,
+    call REAL,
+    teardown REAL,
+    total REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (test, run_id)
+);
+CREATE INDEX IF NOT EXISTS durations_by_test ON durations (test, recorded_at);
+"""
+
+# Average of the most recent non-skipped runs of each test
+ESTIMATES_QUERY = """
+SELECT test, AVG(total) FROM (
+    SELECT test, total, ROW_NUMBER() OVER (PARTITION BY test ORDER BY recorded_at DESC) AS recent
+    FROM durations WHERE outcome != 'skipped'
+) WHERE recent <= ? GROUP BY test
+"""
+
+# JUnit properties written by conftest.py at teardown
+PHASE_PROPERTIES = {"setup_s": "setup", "call_s": "call", "teardown_s": "teardown"}
+
+
+def junit_key(nodeid: str) -> str:
+    """The "<classname>.<name>" a pytest node id gets in JUnit XML"""
+    path, bracket, params = nodeid.partition("[")
+    names = path.split("::")
+    names[0] = re.sub(r"\.py$", "", names[0].replace("/", "."))
+    names[-1] += bracket + params
+    return ".".join(names)
+
+
+def _module_of(key: str, modules: Iterable[str]) -> Optional[str]:
+    for module in modules:
+        if key.startswith(module + "."):
+            return module
+    return None
+
+
+class DurationHistory:
+    """SQLite store of test durations, keyed by JUnit "<classname>.<name>" """
+
+    def __init__(self, path: str, recent: int = 5):
+        self.path = path
+        self.recent = recent
+        self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def record(self, rows: Iterable[Dict], run_id: str) -> int:
+        """Store rows with test, setup, call, teardown, total and outcome keys"""
+        now = time.time()
+        values = [(row["test"], run_id, row.get("setup"), row.get("call"), row.get("teardown"),
+                   row["total"], row["outcome"], now) for row in rows]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO durations VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values
+            )
+        return len(values)
+
+    def record_junit(self, junit_path: str, run_id: Optional[str] = None) -> int:
+        """Read a JUnit XML file (streamed) and store its test durations"""
+        run_id = run_id or os.path.splitext(os.path.basename(junit_path))[0]
+        count = self.record(read_junit_durations(junit_path), run_id)
+        logger.info("Recorded %d test durations from %s", count, junit_path)
+        return count
+
+    def estimates(self) -> Dict[str, float]:
+        """Expected seconds per JUnit key, from its recent runs"""
+        if not os.path.exists(self.path):
+            return {}
+        rows = self.connection.execute(ESTIMATES_QUERY, (self.recent,)).fetchall()
+        return {test: seconds for test, seconds in rows}
+
+
+def read_junit_durations(junit_path: str):
+    """Yield one duration row per <testcase>, streaming through the file"""
+    for testcase in iter_testcases(junit_path):
+        phases = {PHASE_PROPERTIES[prop.get("name")]: float(prop.get("value"))
+                  for prop in testcase.iter("property") if prop.get("name") in PHASE_PROPERTIES}
+        yield {
+            "test": testcase_name(testcase),
+            "total": sum(phases.values()) if phases else float(testcase.get("time") or 0),
+            "outcome": testcase_outcome(testcase)[0],
+            **phases,
+        }
+
+
+def expected_durations(nodeids: Sequence[str], history: Dict[str, float], default: float) -> Dict[str, float]:
+    """Seconds per node id; tests without history get their module's median, else the suite median, else `default`"""
+    modules: Dict[str, List[float]] = {}
+    module_names = {junit_key(nodeid.split("::")[0]) for nodeid in nodeids}
+    for key, seconds in history.items():
+        module = _module_of(key, module_names)
+        if module is not None:
+            modules.setdefault(module, []).append(seconds)
+    suite_median = statistics.median(history.values()) if history else default
+
+    durations = {}
+    for nodeid in nodeids:
+        key = junit_key(nodeid)
+        if key in history:
+            durations[nodeid] = history[key]
+        else:
+            known = modules.get(junit_key(nodeid.split("::")[0]))
+            durations[nodeid] = statistics.median(known) if known else suite_median
+    return durations
+
+
+def longest_first(nodeids: Sequence[str], durations: Dict[str, float]) -> List[str]:
+    """Order by expected duration, longest first (stable for equal estimates)"""
+    return sorted(nodeids, key=lambda nodeid: -durations[nodeid])
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'i/N' (1-based) to (i, N)"""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value or "")
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"expected a shard as i/N with 1 <= i <= N, got {value!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def assign_shards(nodeids: Sequence[str], durations: Dict[str, float], total: int) -> Dict[str, int]:
+    """Deterministic longest-processing-time split: each test goes to the currently lightest shard (1-based)"""
+    loads = [0.0] * total
+    shards = {}
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-durations[nodeid], nodeid)):
+        shard = min(range(total), key=lambda index: (loads[index], index))
+        loads[shard] += durations[nodeid]
+        shards[nodeid] = shard + 1
+    return shards
+
+
+def hash_shards(nodeids: Sequence[str], total: int) -> Dict[str, int]:
+    """Split by a stable hash of each node id (1-based); the same on every machine, whatever its history"""
+    return {nodeid: int(hashlib.sha1(nodeid.encode()).hexdigest(), 16) % total + 1 for nodeid in nodeids}
@@ -0,0 +1,132 @@
+# src/utilities/flake_tracker.py
+"""
+Persistent flake record and quarantine.
+
+A test is flaky in a run when it failed and then passed on a retry: an
+in-session retry (--retry-failed, reported as an "attempts" JUnit property)
+or run_tests.py's rerun phase. Every run's JUnit outcomes are stored in
+SQLite; tests that were flaky in too many of their recent runs are
+quarantined and run in a separate lane that does not fail the build.
+"""
+import json
+import os
+import sqlite3
+import time
+import logging
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from src.utilities.duration_history import junit_key
+from src.utilities.junit_merge import iter_testcases, testcase_name, testcase_outcome
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    test TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (test, run_id)
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (test, recorded_at);
+"""
+
+# Flaky runs among each test's most recent non-skipped runs
+FLAKY_QUERY = """
+SELECT test, SUM(outcome = 'flaky'), COUNT(*) FROM (
+    SELECT test, outcome, ROW_NUMBER() OVER (PARTITION BY test ORDER BY recorded_at DESC) AS recent
+    FROM results WHERE outcome != 'skipped'
+) WHERE recent <= ? GROUP BY test HAVING SUM(outcome = 'flaky') > 0
+ORDER BY SUM(outcome = 'flaky') DESC, test
+"""
+
+
+def read_junit_outcomes(junit_path: str) -> Iterator[Tuple[str, str, int]]:
+    """(test, outcome, attempts) per <testcase>; a pass after more than one attempt is 'flaky'"""
+    for testcase in iter_testcases(junit_path):
+        attempts = next((int(prop.get("value")) for prop in testcase.iter("property")
+                         if prop.get("name") == "attempts"), 1)
+        outcome = testcase_outcome(testcase)[0]
+        if outcome == "passed" and attempts > 1:
+            outcome = "flaky"
+        yield testcase_name(testcase), outcome, attempts
+
+
+def junit_failures(junit_path: str) -> Set[str]:
+    """JUnit keys of the tests that failed or errored"""
+    return {test for test, outcome, _ in read_junit_outcomes(junit_path) if outcome in ("failed", "error")}
+
+
+def load_lastfailed(cache_dir: str = ".pytest_cache") -> Dict[str, bool]:
+    """pytest's last-failed cache ({nodeid: True})"""
+    try:
+        with open(os.path.join(cache_dir, "v", "cache", "lastfailed"), 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def rerun_candidates(lastfailed: Iterable[str], failures: Set[str]) -> List[str]:
+    """Node ids from the last-failed cache that also failed in this run's JUnit (drops stale cache entries)"""
+    return [nodeid for nodeid in lastfailed if junit_key(nodeid) in failures]
+
+
+class FlakeRecord:
+    """SQLite record of per-run outcomes, keyed by JUnit "<classname>.<name>" """
+
+    def __init__(self, path: str, window: int = 20, threshold: int = 3):
+        self.path = path
+        self.window = window
+        self.threshold = threshold
+        self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def record_junit(self, junit_path: str, run_id: str) -> Dict[str, int]:
+        """Store every outcome of a run; returns the count per outcome"""
+        counts: Dict[str, int] = {}
+        now = time.time()
+        with self.connection:
+            for test, outcome, attempts in read_junit_outcomes(junit_path):
+                self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                                        (test, run_id, outcome, attempts, now))
+                counts[outcome] = counts.get(outcome, 0) + 1
+        return counts
+
+    def record_rerun(self, junit_path: str, run_id: str) -> List[str]:
+        """Mark tests of `run_id` that passed in a rerun phase as flaky; returns them"""
+        flaky = []
+        with self.connection:
+            for test, outcome, attempts in read_junit_outcomes(junit_path):
+                if outcome not in ("passed", "flaky"):
+                    continue
+                updated = self.connection.execute(
+                    "UPDATE results SET outcome = 'flaky', attempts = attempts + ? "
+                    "WHERE test = ? AND run_id = ? AND outcome IN ('failed', 'error')",
+                    (attempts, test, run_id)
+                ).rowcount
+                if updated:
+                    flaky.append(test)
+        return flaky
+
+    def flaky_tests(self) -> List[Tuple[str, int, int]]:
+        """(test, flaky runs, recent runs) for tests flaky at least once in their last `window` runs"""
+        if not os.path.exists(self.path):
+            return []
+        return self.connection.execute(FLAKY_QUERY, (self.window,)).fetchall()
+
+    def quarantined(self) -> Set[str]:
+        """Tests flaky in at least `threshold` of their last `window` runs"""
+        return {test for test, flaky, _ in self.flaky_tests() if flaky >= self.threshold}
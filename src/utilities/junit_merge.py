@@ -0,0 +1,208 @@
+# src/utilities/junit_merge.py
+"""
+Streaming merge of JUnit XML from xdist workers, shards and browser variants.
+
+Inputs are read with iterparse and every <testcase> is written out and
+detached as soon as it has been parsed, so memory stays flat however many
+tests the fragments hold. Alongside the merged JUnit file, an HTML summary
+lists totals, failures and the slowest tests with links to their
+artifacts (screenshots, per-run HTML reports) instead of embedding them.
+"""
+import glob
+import heapq
+import html
+import os
+import shutil
+import tempfile
+import time
+import logging
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Test properties whose values are file paths to link from the summary
+ARTIFACT_PROPERTIES = ("screenshot",)
+OUTCOME_TAGS = (("skipped", "skipped"), ("error", "error"), ("failure", "failed"))
+
+
+def iter_testcases(path: str) -> Iterator[ET.Element]:
+    """Yield each <testcase> of a JUnit file; it is detached from the tree once the caller moves on"""
+    parents: List[ET.Element] = []
+    for event, element in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        if element.tag == "testcase":
+            yield element
+            if parents:
+                parents[-1].remove(element)
+
+
+def testcase_outcome(testcase: ET.Element) -> Tuple[str, str]:
+    """(outcome, message) of a <testcase>: passed, failed, error or skipped"""
+    for tag, outcome in OUTCOME_TAGS:
+        child = testcase.find(tag)
+        if child is not None:
+            return outcome, child.get("message") or (child.text or "").strip()
+    return "passed", ""
+
+
+def testcase_name(testcase: ET.Element) -> str:
+    classname = testcase.get("classname")
+    return f"{classname}.{testcase.get('name')}" if classname else testcase.get("name", "")
+
+
+def parse_inputs(specs: Sequence[str]) -> List[Tuple[str, str]]:
+    """'path', 'glob' or 'label=path' arguments to (label, path) pairs, in order"""
+    inputs = []
+    for spec in specs:
+        label, separator, pattern = spec.partition("=")
+        if not separator:
+            label, pattern = "", spec
+        paths = sorted(glob.glob(pattern)) or [pattern]
+        for path in paths:
+            inputs.append((label or os.path.splitext(os.path.basename(path))[0], path))
+    return inputs
+
+
+class _Summary:
+    """Counters, failure rows and slowest tests gathered while streaming"""
+
+    def __init__(self, summary_dir: Optional[str], slowest: int):
+        self.summary_dir = summary_dir
+        self.slowest_count = slowest
+        self.slowest: List[Tuple[float, str, str]] = []
+        self.failures = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self.failure_count = 0
+
+    def link(self, path: str, text: str) -> str:
+        target = os.path.relpath(path, self.summary_dir) if self.summary_dir and os.path.isabs(path) else path
+        return f'<a href="{html.escape(target.replace(os.sep, "/"))}">{html.escape(text)}</a>'
+
+    def add(self, suite: str, testcase: ET.Element, outcome: str, message: str, seconds: float):
+        name = testcase_name(testcase)
+        if outcome != "skipped":
+            entry = (seconds, name, suite)
+            if len(self.slowest) < self.slowest_count:
+                heapq.heappush(self.slowest, entry)
+            elif self.slowest and entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+        if outcome in ("failed", "error"):
+            self.failure_count += 1
+            artifacts = " ".join(
+                self.link(prop.get("value"), prop.get("name"))
+                for prop in testcase.iter("property") if prop.get("name") in ARTIFACT_PROPERTIES
+            )
+            self.failures.write(
+                f"<tr class=\"{outcome}\"><td>{html.escape(suite)}</td><td>{html.escape(name)}</td>"
+                f"<td>{outcome}</td><td>{seconds:.2f}s</td><td>{html.escape(message[:300])}</td>"
+                f"<td>{artifacts}</td></tr>\n"
+            )
+
+
+def merge_junit(inputs: Sequence[Tuple[str, str]], output_path: str, summary_path: Optional[str] = None,
+                slowest: int = 10) -> Dict:
+    """Merge (label, path) JUnit files into one <testsuites> file, one <testsuite> per input.
+
+    Optionally writes an HTML summary to `summary_path`. Returns the totals
+    and per-suite counts.
+    """
+    started = time.perf_counter()
+    summary = _Summary(os.path.dirname(os.path.abspath(summary_path)) if summary_path else None, slowest)
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0, "time": 0.0}
+    suites = []
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    try:
+        with tempfile.TemporaryFile() as body:
+            for label, path in inputs:
+                suite = {"name": label, "source": path, "tests": 0, "failures": 0, "errors": 0, "skipped": 0, "time": 0.0}
+                with tempfile.TemporaryFile() as cases:
+                    for testcase in iter_testcases(path):
+                        outcome, message = testcase_outcome(testcase)
+                        seconds = float(testcase.get("time") or 0)
+                        suite["tests"] += 1
+                        suite["time"] += seconds
+                        if outcome != "passed":
+                            suite[{"failed": "failures", "error": "errors", "skipped": "skipped"}[outcome]] += 1
+                        if summary_path:
+                            summary.add(label, testcase, outcome, message, seconds)
+                        testcase.tail = "\n"
+                        cases.write(ET.tostring(testcase, encoding="utf-8", xml_declaration=False))
+                    body.write(_open_tag("testsuite", suite).encode("utf-8") + b"\n")
+                    cases.seek(0)
+                    shutil.copyfileobj(cases, body)
+                    body.write(b"</testsuite>\n")
+                for key in totals:
+                    totals[key] += suite[key]
+                suite["time"] = round(suite["time"], 3)
+                suites.append(suite)
+
+            totals["time"] = round(totals["time"], 3)
+            with open(output_path, "wb") as output:
+                output.write(b'<?xml version="1.0" encoding="utf-8"?>\n')
+                output.write(_open_tag("testsuites", dict(totals, name="merged")).encode("utf-8") + b"\n")
+                body.seek(0)
+                shutil.copyfileobj(body, output)
+                output.write(b"</testsuites>\n")
+
+        result = {"totals": totals, "suites": suites, "output": output_path}
+        if summary_path:
+            _write_summary(summary, result, summary_path)
+            result["summary"] = summary_path
+    finally:
+        summary.failures.close()
+    result["merge_time"] = round(time.perf_counter() - started, 3)
+    logger.info("Merged %d tests from %d files in %.2fs", totals["tests"], len(suites), result["merge_time"])
+    return result
+
+
+def _open_tag(tag: str, attributes: Dict) -> str:
+    names = ("name", "tests", "failures", "errors", "skipped", "time")
+    return f"<{tag} " + " ".join(
+        f"{name}={quoteattr(str(round(attributes[name], 3) if name == 'time' else attributes[name]))}" for name in names
+    ) + ">"
+
+
+def _write_summary(summary: _Summary, result: Dict, path: str):
+    totals = result["totals"]
+    passed = totals["tests"] - totals["failures"] - totals["errors"] - totals["skipped"]
+    suite_rows = []
+    for suite in result["suites"]:
+        source_dir = os.path.dirname(os.path.abspath(suite["source"]))
+        reports = " ".join(summary.link(os.path.abspath(report), os.path.basename(report))
+                           for report in sorted(glob.glob(os.path.join(source_dir, "*.html")))
+                           if os.path.abspath(report) != os.path.abspath(path))
+        suite_rows.append(
+            f"<tr><td>{html.escape(suite['name'])}</td><td>{suite['tests']}</td><td>{suite['failures']}</td>"
+            f"<td>{suite['errors']}</td><td>{suite['skipped']}</td><td>{suite['time']:.1f}s</td>"
+            f"<td>{summary.link(os.path.abspath(suite['source']), 'junit')} {reports}</td></tr>\n"
+        )
+    slowest_rows = "".join(
+        f"<tr><td>{html.escape(suite)}</td><td>{html.escape(name)}</td><td>{seconds:.2f}s</td></tr>\n"
+        for seconds, name, suite in sorted(summary.slowest, reverse=True)
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Test summary</title><style>"
+            "body{font-family:sans-serif}table{border-collapse:collapse;margin-bottom:1em}"
+            "td,th{border:1px solid #ccc;padding:4px 8px;text-align:left}"
+            ".failed,.error{background:#fce8e6}</style></head><body><h1>Test summary</h1>"
+            f"<p>{totals['tests']} tests: {passed} passed, {totals['failures']} failed, {totals['errors']} errors, "
+            f"{totals['skipped']} skipped in {totals['time']:.1f}s of test time. "
+            f"Merged JUnit: {summary.link(os.path.abspath(result['output']), os.path.basename(result['output']))}</p>"
+            "<h2>Inputs</h2><table><tr><th>Suite</th><th>Tests</th><th>Failures</th><th>Errors</th>"
+            f"<th>Skipped</th><th>Time</th><th>Artifacts</th></tr>\n{''.join(suite_rows)}</table>"
+            f"<h2>Failures ({summary.failure_count})</h2><table><tr><th>Suite</th><th>Test</th><th>Outcome</th>"
+            "<th>Time</th><th>Message</th><th>Artifacts</th></tr>\n"
+        )
+        summary.failures.seek(0)
+        shutil.copyfileobj(summary.failures, file)
+        file.write(
+            "</table><h2>Slowest tests</h2><table><tr><th>Suite</th><th>Test</th><th>Time</th></tr>\n"
+            f"{slowest_rows}</table></body></html>\n"
+        )
@@ -0,0 +1,225 @@
+# src/utilities/local_app.py
+"""
+Hermetic local stand-in for the application under test (SauceDemo).
+
+Serves the login, inventory and forgot-password markup the page objects rely
+on, with optional injected latency and jitter per request.
+"""
+import json
+import random
+import threading
+import time
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+VALID_USERS = [
+    "standard_user",
+    "problem_user",
+    "performance_glitch_user",
+    "error_user",
+    "visual_user",
+]
+LOCKED_USERS = ["locked_out_user"]
+PASSWORD = "secret_sauce"
+
+LOGIN_HTML = """<!DOCTYPE html>
+<html>
+<head><title>Swag Labs</title></head>
+<body>
+<div class="login_logo">Swag Labs</div>
+<form id="login-form">
+  <input id="user-name" name="user-name" type="text" placeholder="Username" data-test="username">
+  <input id="password" name="password" type="password" placeholder="Password" data-test="password">
+  <div class="error-message-container" id="error-container"></div>
+  <input id="login-button" type="submit" value="Login" data-test="login-button">
+</form>
+<a id="forgot-password-link" href="/forgot-password">Forgot password?</a>
+<script>
+var VALID = %(valid)s, LOCKED = %(locked)s, PASSWORD = %(password)s;
+function showError(message) {
+  document.getElementById('error-container').innerHTML =
+    '<h3 data-test="error">Epic sadface: ' + message + '</h3>';
+}
+if (sessionStorage.getItem('login-error')) {
+  showError(sessionStorage.getItem('login-error'));
+  sessionStorage.removeItem('login-error');
+}
+document.getElementById('login-form').addEventListener('submit', function(event) {
+  event.preventDefault();
+  var username = document.getElementById('user-name').value;
+  var password = document.getElementById('password').value;
+  if (!username) { return showError('Username is required'); }
+  if (!password) { return showError('Password is required'); }
+  if (LOCKED.indexOf(username) !== -1 && password === PASSWORD) {
+    return showError('Sorry, this user has been locked out.');
+  }
+  if (VALID.indexOf(username) === -1 || password !== PASSWORD) {
+    return showError('Username and password do not match any user in this service');
+  }
+  document.cookie = 'session-username=' + username + '; path=/';
+  localStorage.setItem('session-username', username);
+  window.location.href = '/inventory.html';
+});
+</script>
+</body>
+</html>
+"""
+
+INVENTORY_HTML = """<!DOCTYPE html>
+<html>
+<head><title>Swag Labs</title></head>
+<body>
+<div id="root"></div>
+<script>
+if (document.cookie.indexOf('session-username=') === -1) {
+  sessionStorage.setItem('login-error',
+    "You can only access '/inventory.html' when you are logged in.");
+  window.location.href = '/';
+} else {
+  document.getElementById('root').innerHTML =
+    '<div class="primary_header">' +
+    '<button id="react-burger-menu-btn">Open Menu</button>' +
+    '<div class="app_logo">Swag Labs</div></div>' +
+    '<span class="title">Products</span>' +
+    '<div class="inventory_list">' +
+    '<div class="inventory_item">Sauce Labs Backpack</div>' +
+    '<div class="inventory_item">Sauce Labs Bike Light</div>' +
+    '</div>';
+}
+</script>
+</body>
+</html>
+"""
+
+FORGOT_PASSWORD_HTML = """<!DOCTYPE html>
+<html>
+<head><title>Reset Password</title></head>
+<body>
+<input id="email" type="email" placeholder="Email">
+<button id="resetBtn">Reset Password</button>
+<button id="cancelBtn">Cancel</button>
+<div id="result"></div>
+<script>
+document.getElementById('resetBtn').addEventListener('click', function() {
+  var email = document.getElementById('email').value;
+  var valid = /^[^@\\s]+@[^@\\s]+\\.[^@\\s]+$/.test(email);
+  document.getElementById('result').innerHTML = valid
+    ? '<div class="reset-success">Password reset email sent successfully</div>'
+    : '<div class="reset-error">' + (email ? 'Email not found' : 'Email is required') + '</div>';
+});
+document.getElementById('cancelBtn').addEventListener('click', function() {
+  window.location.href = '/';
+});
+</script>
+</body>
+</html>
+"""
+
+
+def _render_login() -> str:
+    return LOGIN_HTML % {
+        "valid": json.dumps(VALID_USERS),
+        "locked": json.dumps(LOCKED_USERS),
+        "password": json.dumps(PASSWORD),
+    }
+
+
+PAGES = {
+    "/": _render_login,
+    "/index.html": _render_login,
+    "/inventory.html": lambda: INVENTORY_HTML,
+    "/forgot-password": lambda: FORGOT_PASSWORD_HTML,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves the stand-in pages with injected latency"""
+
+    def do_GET(self):
+        self.server.app.inject_latency()
+        render = PAGES.get(urlparse(self.path).path)
+        if render is None:
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("local app: " + format % args)
+
+
+class LocalApp:
+    """Local HTTP server reproducing the SauceDemo pages used by the page objects"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0, jitter_ms: float = 0, seed: int = 0):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving on a background thread"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.app = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-app", daemon=True)
+        self._thread.start()
+        logger.info("Local app serving at %s (latency %sms ± %sms)", self.url, self.latency_ms, self.jitter_ms)
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def inject_latency(self):
+        """Sleep for the configured latency plus seeded jitter"""
+        with self._lock:
+            self.requests += 1
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        delay = max(self.latency_ms + jitter, 0) / 1000.0
+        if delay:
+            time.sleep(delay)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the local SauceDemo stand-in")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    args = parser.parse_args()
+    app = LocalApp(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms).start()
+    print(f"Serving at {app.url} - Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        app.stop()
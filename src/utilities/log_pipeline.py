@@ -0,0 +1,130 @@
+# src/utilities/log_pipeline.py
+"""
+Non-blocking logging for test runs.
+
+Test threads only enqueue records; a QueueListener thread formats them and
+writes the file. Under pytest-xdist every worker writes its own file and the
+controller merges them by timestamp at session end.
+"""
+import glob
+import heapq
+import logging
+import os
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterator, List, Optional, Tuple
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+WORKER_LOG_FORMAT = '%(asctime)s - {worker} - %(name)s - %(levelname)s - %(message)s'
+RECORD_START = re.compile(r"^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3} ")
+
+# Arguments of these types cannot change after the call, so formatting them
+# can safely wait for the listener thread
+_IMMUTABLE_ARGS = (str, int, float, bool, type(None), bytes, tuple, frozenset)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stdlib handler renders the message in prepare(), i.e. on the calling
+    thread. Here only tracebacks and mutable arguments are rendered eagerly.
+    """
+
+    def prepare(self, record):
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if record.args and not all(isinstance(arg, _IMMUTABLE_ARGS) for arg in _as_tuple(record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _as_tuple(args):
+    return tuple(args.values()) if isinstance(args, dict) else args
+
+
+class LogPipeline:
+    """Root-logger QueueHandler plus a background listener writing one log file"""
+
+    def __init__(self, log_dir: str, run_id: str, worker_id: Optional[str] = None, level: int = logging.INFO):
+        self.log_dir = log_dir
+        self.run_id = run_id
+        self.worker_id = worker_id
+        self.level = level
+        self._queue = queue.SimpleQueue()
+        self._handler = None
+        self._listener = None
+
+    @property
+    def path(self) -> str:
+        suffix = f"_{self.worker_id}" if self.worker_id else ""
+        return os.path.join(self.log_dir, f"test_execution_{self.run_id}{suffix}.log")
+
+    def start(self):
+        """Install the queue handler on the root logger and start the listener"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        log_format = WORKER_LOG_FORMAT.format(worker=self.worker_id) if self.worker_id else LOG_FORMAT
+        file_handler = logging.FileHandler(self.path)
+        file_handler.setFormatter(logging.Formatter(log_format))
+        self._listener = QueueListener(self._queue, file_handler, respect_handler_level=True)
+        self._listener.start()
+
+        self._handler = DeferredQueueHandler(self._queue)
+        root = logging.getLogger()
+        root.addHandler(self._handler)
+        root.setLevel(self.level)
+        return self
+
+    def stop(self):
+        """Drain the queue, close the file and detach from the root logger"""
+        if self._handler is not None:
+            logging.getLogger().removeHandler(self._handler)
+            self._handler = None
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+
+def worker_log_paths(log_dir: str, run_id: str) -> List[str]:
+    """Per-worker files written for one run"""
+    return sorted(glob.glob(os.path.join(log_dir, f"test_execution_{run_id}_gw*.log")))
+
+
+def _records(path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (timestamp, record text) with traceback lines kept on their record"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+        timestamp, lines = "", []
+        for line in file:
+            if RECORD_START.match(line):
+                if lines:
+                    yield timestamp, "".join(lines)
+                timestamp, lines = line[:23], [line]
+            else:
+                lines.append(line)
+        if lines:
+            yield timestamp, "".join(lines)
+
+
+def merge_logs(paths: List[str], output: str, remove: bool = True) -> int:
+    """Stream-merge per-worker logs into one file ordered by timestamp; returns record count.
+
+    `output` may also be one of the inputs (the controller's own log): the
+    merge is written to a temporary file that replaces it at the end.
+    """
+    count = 0
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for _, text in heapq.merge(*(_records(path) for path in paths), key=lambda record: record[0]):
+            out.write(text)
+            count += 1
+    os.replace(tmp_path, output)
+    if remove:
+        for path in paths:
+            if os.path.abspath(path) != os.path.abspath(output):
+                os.remove(path)
+    return count
@@ -0,0 +1,276 @@
+# src/utilities/page_metrics.py
+"""
+Front-end performance capture for page objects.
+
+One execute_script reads Navigation, Paint and Resource Timing for the
+current document. Results are checked against per-page budgets, collected
+into a per-run dataset and compared with a stored baseline.
+
+A client-side route change (new URL, same document) is a soft navigation:
+the document's Navigation and Paint timing belong to the page it started
+on, so it is recorded as "<page> (soft)" with the time from the triggering
+action to ready and the resources loaded since the last mark.
+"""
+import json
+import os
+import statistics
+import threading
+import warnings
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Set by page actions (e.g. a form submit) so a soft navigation can be timed from it
+ACTION_MARK = "qa:action"
+# Set by every capture, so the next soft navigation only counts newer resources
+CAPTURE_MARK = "qa:capture"
+
+METRICS_SCRIPT = """
+var top = arguments[0], actionMark = arguments[1], captureMark = arguments[2];
+var marks = performance.getEntriesByName(actionMark, 'mark').concat(performance.getEntriesByName(captureMark, 'mark'))
+    .sort(function(a, b) { return a.startTime - b.startTime; });
+var last = marks.length ? marks[marks.length - 1] : null;
+var now = performance.now();
+// Lives as long as the document, so a new document always starts unmeasured
+var measuredUrl = window.__qaMeasuredUrl || null;
+window.__qaMeasuredUrl = window.location.href;
+var nav = performance.getEntriesByType('navigation')[0];
+var timing = {};
+if (nav) {
+    timing = {ttfb: nav.responseStart, dom_interactive: nav.domInteractive,
+              dom_content_loaded: nav.domContentLoadedEventEnd, load: nav.loadEventEnd,
+              transfer_size: nav.transferSize};
+} else {
+    var t = performance.timing, start = t.navigationStart;
+    timing = {ttfb: t.responseStart - start, dom_interactive: t.domInteractive - start,
+              dom_content_loaded: t.domContentLoadedEventEnd - start,
+              load: t.loadEventEnd ? t.loadEventEnd - start : 0, transfer_size: 0};
+}
+var paint = {};
+performance.getEntriesByType('paint').forEach(function(entry) { paint[entry.name] = entry.startTime; });
+var resources = performance.getEntriesByType('resource');
+var bytes = 0;
+resources.forEach(function(entry) { bytes += entry.transferSize || 0; });
+var slowest = function(entries) {
+    return entries.slice().sort(function(a, b) { return b.duration - a.duration; }).slice(0, top)
+        .map(function(entry) { return {name: entry.name, type: entry.initiatorType, duration: entry.duration,
+                                       transfer_size: entry.transferSize || 0}; });
+};
+var recent = last ? resources.filter(function(entry) { return entry.startTime >= last.startTime; }) : resources;
+var recentBytes = 0;
+recent.forEach(function(entry) { recentBytes += entry.transferSize || 0; });
+performance.mark(captureMark);
+return {url: window.location.href, time_origin: performance.timeOrigin || performance.timing.navigationStart,
+        timing: timing, paint: paint, resource_count: resources.length, resource_bytes: bytes,
+        slowest_resources: slowest(resources), measured_url: measuredUrl,
+        soft: {route_time: last && last.name === actionMark ? now - last.startTime : null,
+               resource_count: recent.length, resource_bytes: recentBytes, slowest_resources: slowest(recent)}};
+"""
+
+# Metrics that budgets and baselines can refer to (milliseconds)
+TIMING_METRICS = ("ttfb", "dom_interactive", "dom_content_loaded", "load", "first_paint", "first_contentful_paint",
+                  "route_time")
+# Summarized alongside timing (lean mode savings) but not regression-checked
+RESOURCE_METRICS = ("resource_count", "resource_bytes")
+
+
+class PerformanceBudgetExceeded(AssertionError):
+    """Raised when a page misses its budget and the budget mode is 'fail'"""
+
+
+class PerformanceBudgetWarning(UserWarning):
+    """Emitted when a page misses its budget and the budget mode is 'warn'"""
+
+
+@dataclass
+class PageMetrics:
+    """Timing of one document load (ms from navigation start) or soft navigation (ms from the action)"""
+    page: str
+    url: str
+    time_origin: float
+    ttfb: Optional[float] = None
+    dom_interactive: Optional[float] = None
+    dom_content_loaded: Optional[float] = None
+    load: Optional[float] = None
+    first_paint: Optional[float] = None
+    first_contentful_paint: Optional[float] = None
+    route_time: Optional[float] = None
+    transfer_size: int = 0
+    resource_count: int = 0
+    resource_bytes: int = 0
+    slowest_resources: List[Dict[str, Any]] = field(default_factory=list)
+    test: Optional[str] = None
+    lean: bool = False
+    soft_navigation: bool = False
+
+    @classmethod
+    def from_script(cls, page: str, raw: Dict[str, Any]) -> "PageMetrics":
+        timing, paint = raw.get("timing", {}), raw.get("paint", {})
+
+        def ms(value):
+            # 0 means the event has not fired yet (e.g. load still pending)
+            return round(value, 1) if value else None
+
+        return cls(
+            page=page,
+            url=raw.get("url", ""),
+            time_origin=raw.get("time_origin", 0),
+            ttfb=ms(timing.get("ttfb")),
+            dom_interactive=ms(timing.get("dom_interactive")),
+            dom_content_loaded=ms(timing.get("dom_content_loaded")),
+            load=ms(timing.get("load")),
+            first_paint=ms(paint.get("first-paint")),
+            first_contentful_paint=ms(paint.get("first-contentful-paint")),
+            transfer_size=timing.get("transfer_size") or 0,
+            resource_count=raw.get("resource_count", 0),
+            resource_bytes=raw.get("resource_bytes", 0),
+            slowest_resources=raw.get("slowest_resources", []),
+        )
+
+    @classmethod
+    def soft_from_script(cls, page: str, raw: Dict[str, Any]) -> "PageMetrics":
+        """Route change within the same document: no Navigation or Paint timing of its own"""
+        soft = raw.get("soft") or {}
+        route_time = soft.get("route_time")
+        return cls(
+            page=f"{page} (soft)",
+            url=raw.get("url", ""),
+            time_origin=raw.get("time_origin", 0),
+            route_time=round(route_time, 1) if route_time is not None else None,
+            resource_count=soft.get("resource_count", 0),
+            resource_bytes=soft.get("resource_bytes", 0),
+            slowest_resources=soft.get("slowest_resources", []),
+            soft_navigation=True,
+        )
+
+
+class PerformanceRecorder:
+    """Per-worker dataset of page metrics with budget checks and baseline comparison"""
+
+    def __init__(self):
+        self.samples: List[PageMetrics] = []
+        self.violations: List[str] = []
+        self.test_id: Optional[str] = None
+        self._budgets = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def capture(driver, page: str, top_resources: int = 5) -> Optional[PageMetrics]:
+        """Read Navigation, Paint and Resource Timing in one round trip.
+
+        Returns None if this document was already measured at the current URL,
+        and a soft-navigation sample if it was measured at another URL.
+        """
+        raw = driver.execute_script(METRICS_SCRIPT, top_resources, ACTION_MARK, CAPTURE_MARK)
+        if not isinstance(raw, dict):
+            return None
+        measured_url = raw.get("measured_url")
+        if measured_url is None:
+            return PageMetrics.from_script(page, raw)
+        if measured_url == raw.get("url", ""):
+            return None
+        return PageMetrics.soft_from_script(page, raw)
+
+    def budgets(self) -> Dict[str, Dict[str, float]]:
+        """Per-page budgets from PERF_BUDGETS_PATH, e.g. {"login": {"dom_content_loaded": 2000}}"""
+        if self._budgets is None:
+            from src.config.config import config
+            try:
+                with open(config.PERF_BUDGETS_PATH, 'r') as file:
+                    self._budgets = json.load(file).get("pages", {})
+            except FileNotFoundError:
+                self._budgets = {}
+        return self._budgets
+
+    def set_budgets(self, budgets: Dict[str, Dict[str, float]]):
+        self._budgets = budgets
+
+    def check_budget(self, metrics: PageMetrics) -> List[str]:
+        """Return a message per metric over its page budget"""
+        exceeded = []
+        for metric, limit in self.budgets().get(metrics.page, {}).items():
+            value = getattr(metrics, metric, None)
+            if value is not None and value > limit:
+                exceeded.append(f"{metrics.page} {metric} {value:.0f}ms > budget {limit:.0f}ms")
+        return exceeded
+
+    def record(self, metrics: PageMetrics, mode: str = "warn") -> PageMetrics:
+        """Add a sample and enforce the page budget ('off', 'warn' or 'fail')"""
+        metrics.test = self.test_id
+        exceeded = self.check_budget(metrics) if mode != "off" else []
+        with self._lock:
+            self.samples.append(metrics)
+            self.violations.extend(exceeded)
+        if exceeded:
+            message = "; ".join(exceeded)
+            if mode == "fail":
+                raise PerformanceBudgetExceeded(message)
+            warnings.warn(PerformanceBudgetWarning(message), stacklevel=3)
+        return metrics
+
+    def clear(self):
+        with self._lock:
+            self.samples = []
+            self.violations = []
+
+    def dataset(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [asdict(sample) for sample in self.samples]
+
+    def write(self, path: str):
+        """Write this run's samples as JSON"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump({"samples": self.dataset(), "violations": list(self.violations)}, file, indent=2)
+
+
+def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Median and count per page and metric; lean-mode loads are keyed "<page> (lean)" """
+    values: Dict[str, Dict[str, List[float]]] = {}
+    for sample in samples:
+        page = f"{sample['page']} (lean)" if sample.get("lean") else sample["page"]
+        for metric in TIMING_METRICS + RESOURCE_METRICS:
+            value = sample.get(metric)
+            if value is not None:
+                values.setdefault(page, {}).setdefault(metric, []).append(value)
+    return {
+        page: {metric: {"median": round(statistics.median(series), 1), "count": len(series)}
+               for metric, series in metrics.items()}
+        for page, metrics in values.items()
+    }
+
+
+def compare_to_baseline(summary: Dict, baseline: Dict, tolerance: float = 0.2, min_delta_ms: float = 50) -> List[str]:
+    """Flag metrics whose median grew more than `tolerance` and `min_delta_ms` over the baseline"""
+    regressions = []
+    for page, metrics in summary.items():
+        for metric, current in metrics.items():
+            previous = baseline.get(page, {}).get(metric)
+            if metric not in TIMING_METRICS or not previous:
+                continue
+            delta = current["median"] - previous["median"]
+            if delta > min_delta_ms and current["median"] > previous["median"] * (1 + tolerance):
+                regressions.append(
+                    f"{page} {metric}: {current['median']:.0f}ms vs baseline {previous['median']:.0f}ms "
+                    f"(+{delta:.0f}ms, +{delta / previous['median']:.0%})"
+                )
+    return regressions
+
+
+def load_baseline(path: str) -> Dict:
+    try:
+        with open(path, 'r') as file:
+            return json.load(file).get("pages", {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, summary: Dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({"pages": summary}, file, indent=2)
+
+
+performance_recorder = PerformanceRecorder()
@@ -0,0 +1,220 @@
+# src/utilities/profiler.py
+import functools
+import threading
+import time
+import logging
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands (HTTP round trips) issued by a driver"""
+
+    def __init__(self):
+        self.commands = Counter()
+
+    @property
+    def total(self) -> int:
+        return sum(self.commands.values())
+
+    def record(self, command: str):
+        self.commands[command] += 1
+
+
+@contextmanager
+def count_round_trips(driver):
+    """Count every command sent to the browser inside the block"""
+    counter = RoundTripCounter()
+    original_execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter.record(driver_command)
+        return original_execute(driver_command, params)
+
+    previous = driver.__dict__.get("execute")
+    driver.execute = counting_execute
+    try:
+        yield counter
+    finally:
+        # Restore an instrumented execute, or fall back to the class method
+        if previous is not None:
+            driver.execute = previous
+        else:
+            del driver.execute
+        logger.debug("%s WebDriver round trips: %s", counter.total, dict(counter.commands))
+
+
+# Commands whose params name a locator, and the key of the element id in results
+FIND_COMMANDS = ("findElement", "findElements", "findChildElement", "findChildElements")
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+@dataclass
+class CommandRecord:
+    """One WebDriver command: name, locator it touched, duration and enclosing wait"""
+    command: str
+    locator: Optional[str]
+    duration: float
+    wait: Optional[str] = None
+
+
+@dataclass
+class WaitRecord:
+    """One wait: total time, time in browser commands and number of polls"""
+    kind: str
+    locator: Optional[str]
+    duration: float
+    command_time: float
+    polls: int
+    depth: int = 0
+
+    @property
+    def retries(self) -> int:
+        return max(self.polls - 1, 0)
+
+
+class CommandProfiler:
+    """Records every command a driver sends, with locator, duration and wait context"""
+
+    def __init__(self):
+        self.commands: List[CommandRecord] = []
+        self.waits: List[WaitRecord] = []
+        self._element_locators: Dict[str, str] = {}
+        self._active_waits = []
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Start a new profile (e.g. at the beginning of a test)"""
+        with self._lock:
+            self.commands = []
+            self.waits = []
+            self._element_locators.clear()
+
+    def record(self, command: str, params: Optional[Dict], result: Any, duration: float):
+        locator = self._locator_for(command, params or {})
+        wait = self._active_waits[-1] if self._active_waits else None
+        with self._lock:
+            if command in FIND_COMMANDS:
+                for element_id in _element_ids(result):
+                    self._element_locators[element_id] = locator
+            self.commands.append(CommandRecord(command, locator, duration, wait and wait["kind"]))
+        if wait is not None:
+            wait["polls"] += 1
+            wait["command_time"] += duration
+
+    def _locator_for(self, command: str, params: Dict) -> Optional[str]:
+        if command in FIND_COMMANDS and "using" in params:
+            return f"{params['using']}={params.get('value')}"
+        if params.get("id") in self._element_locators:
+            return self._element_locators[params["id"]]
+        if self._active_waits:
+            return self._active_waits[-1]["locator"]
+        return None
+
+    @contextmanager
+    def wait(self, kind: str, locator=None):
+        """Attribute the commands issued inside the block to one wait"""
+        span = {"kind": kind, "locator": _format_locator(locator), "polls": 0, "command_time": 0.0}
+        depth = len(self._active_waits)
+        self._active_waits.append(span)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active_waits.pop()
+            with self._lock:
+                self.waits.append(WaitRecord(kind, span["locator"], time.perf_counter() - start,
+                                             span["command_time"], span["polls"], depth))
+
+    def summary(self, top: int = 5) -> Dict[str, Any]:
+        """Command counts, slowest locators and wait versus work time"""
+        with self._lock:
+            commands, waits = list(self.commands), list(self.waits)
+        by_locator = defaultdict(lambda: [0.0, 0])
+        for record in commands:
+            if record.locator:
+                by_locator[record.locator][0] += record.duration
+                by_locator[record.locator][1] += 1
+        slowest = sorted(by_locator.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        # Only outermost waits count towards wall time (waits can nest)
+        wait_time = sum(wait.duration for wait in waits if wait.depth == 0)
+        command_time = sum(record.duration for record in commands)
+        wait_command_time = sum(record.duration for record in commands if record.wait)
+        return {
+            "commands": dict(Counter(record.command for record in commands)),
+            "total_commands": len(commands),
+            "command_time": round(command_time, 4),
+            "wait_time": round(wait_time, 4),
+            "wait_round_trip_time": round(wait_command_time, 4),
+            "work_time": round(command_time - wait_command_time, 4),
+            "waits": len(waits),
+            "retries": sum(wait.retries for wait in waits),
+            "slowest_locators": [
+                {"locator": locator, "time": round(total, 4), "commands": count}
+                for locator, (total, count) in slowest
+            ],
+        }
+
+
+def _element_ids(result) -> List[str]:
+    value = result.get("value") if isinstance(result, dict) else None
+    values = value if isinstance(value, list) else [value]
+    return [item[ELEMENT_KEY] for item in values if isinstance(item, dict) and ELEMENT_KEY in item]
+
+
+def _format_locator(locator) -> Optional[str]:
+    if locator is None:
+        return None
+    if isinstance(locator, (list, tuple)) and len(locator) == 2 and all(isinstance(part, str) for part in locator):
+        return f"{locator[0]}={locator[1]}"
+    if isinstance(locator, (list, tuple)):
+        return " | ".join(_format_locator(item) for item in locator)
+    return str(locator)
+
+
+def instrument(driver) -> CommandProfiler:
+    """Wrap `driver.execute` so every command is timed; idempotent"""
+    profiler = getattr(driver, "command_profiler", None)
+    if profiler is not None:
+        return profiler
+    profiler = CommandProfiler()
+    original_execute = driver.execute
+
+    def profiled_execute(driver_command, params=None):
+        start = time.perf_counter()
+        result = None
+        try:
+            result = original_execute(driver_command, params)
+            return result
+        finally:
+            profiler.record(driver_command, params, result, time.perf_counter() - start)
+
+    driver.execute = profiled_execute
+    driver.command_profiler = profiler
+    return profiler
+
+
+@contextmanager
+def profiled_wait(driver, kind: str, locator=None):
+    """Mark a wait on an instrumented driver; a no-op otherwise"""
+    profiler = getattr(driver, "command_profiler", None)
+    if profiler is None:
+        yield
+        return
+    with profiler.wait(kind, locator):
+        yield
+
+
+def profile_wait(kind: str):
+    """Decorator for wait methods on objects with a `driver`; the first argument names the locator"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with profiled_wait(self.driver, kind, args[0] if args else None):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
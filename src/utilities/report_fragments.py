@@ -0,0 +1,105 @@
+# src/utilities/report_fragments.py
+"""
+Per-worker run summaries.
+
+Every pytest process that runs tests (each xdist worker, or the single
+process of a serial run) writes one JSON fragment. run_tests.py merges
+them into one summary with the speedup over serial execution.
+"""
+import glob
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+OUTCOMES = ("passed", "failed", "skipped", "error")
+
+
+class WorkerStats:
+    """Test outcomes and time spent in one pytest process"""
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or "main"
+        self.started = time.time()
+        self.outcomes = {outcome: 0 for outcome in OUTCOMES}
+        self.tests = 0
+        self.test_time = 0.0
+        self.reruns = 0
+
+    def add(self, report):
+        """Count a pytest TestReport (any phase)"""
+        self.test_time += report.duration
+        if report.outcome == "rerun":
+            # A failed attempt that was retried; the final attempt is counted
+            self.reruns += 1
+            return
+        if report.when == "call" or (report.when == "setup" and not report.passed):
+            self.tests += 1
+            if report.when == "setup" and report.failed:
+                self.outcomes["error"] += 1
+            else:
+                self.outcomes[report.outcome] += 1
+        elif report.when == "teardown" and report.failed:
+            self.outcomes["error"] += 1
+
+    def to_dict(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return dict({
+            "worker": self.worker_id,
+            "tests": self.tests,
+            "outcomes": self.outcomes,
+            "test_time": round(self.test_time, 3),
+            "reruns": self.reruns,
+            "session_time": round(time.time() - self.started, 3),
+        }, **(extra or {}))
+
+    def write(self, directory: str, extra: Optional[Dict[str, Any]] = None) -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.worker_id}.json")
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(extra), file, indent=2)
+        return path
+
+
+def load_fragments(directory: str) -> List[Dict[str, Any]]:
+    fragments = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, 'r') as file:
+            fragments.append(json.load(file))
+    return fragments
+
+
+def merge_fragments(fragments: List[Dict[str, Any]], wall_time: float) -> Dict[str, Any]:
+    """Totals across workers plus the speedup of `wall_time` over running every test serially"""
+    outcomes = {outcome: sum(f["outcomes"].get(outcome, 0) for f in fragments) for outcome in OUTCOMES}
+    serial_time = sum(f["test_time"] for f in fragments)
+    pools = [f["pool"] for f in fragments if f.get("pool")]
+    return {
+        "workers": len(fragments),
+        "tests": sum(f["tests"] for f in fragments),
+        "outcomes": outcomes,
+        "serial_time": round(serial_time, 3),
+        "wall_time": round(wall_time, 3),
+        "speedup": round(serial_time / wall_time, 2) if wall_time > 0 else None,
+        "browsers_launched": sum(pool["launched"] for pool in pools),
+        "browser_startup_time": round(sum(pool["startup_time"] for pool in pools), 3),
+        "per_worker": fragments,
+    }
+
+
+def format_summary(merged: Dict[str, Any]) -> List[str]:
+    """Human-readable lines for the merged summary"""
+    lines = [f"{'worker':<8} {'tests':>6} {'passed':>7} {'failed':>7} {'skipped':>8} {'error':>6} {'test time':>10}"]
+    for fragment in merged["per_worker"]:
+        o = fragment["outcomes"]
+        lines.append(f"{fragment['worker']:<8} {fragment['tests']:>6} {o['passed']:>7} {o['failed']:>7} "
+                     f"{o['skipped']:>8} {o['error']:>6} {fragment['test_time']:>9.1f}s")
+    o = merged["outcomes"]
+    lines.append(f"{'total':<8} {merged['tests']:>6} {o['passed']:>7} {o['failed']:>7} "
+                 f"{o['skipped']:>8} {o['error']:>6} {merged['serial_time']:>9.1f}s")
+    if merged["browsers_launched"]:
+        lines.append(f"Browsers launched: {merged['browsers_launched']} "
+                     f"({merged['browser_startup_time']:.1f}s of startup across workers)")
+    if merged["speedup"] is not None:
+        lines.append(f"Wall time {merged['wall_time']:.1f}s vs {merged['serial_time']:.1f}s of test time "
+                     f"-> speedup {merged['speedup']:.2f}x over serial")
+    return lines
@@ -0,0 +1,62 @@
+# src/utilities/retry.py
+"""
+In-session retries of failed tests (--retry-failed N).
+
+A test is run like pytest's runtestprotocol, except that the teardown
+target is chosen after the call phase: an attempt that will be retried
+tears down only the test itself, so module, class and session fixtures
+stay up for the retry. This is the only place that relies on a pytest
+internal (_pytest.runner.call_and_report); test_retry runs it under the
+installed pytest.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def run_attempt(item, nextitem, can_retry):
+    """One setup/call/teardown pass; returns (reports, retry)"""
+    from _pytest.runner import call_and_report
+    if hasattr(item, "_request") and not item._request:
+        item._initrequest()
+    try:
+        reports = [call_and_report(item, "setup", False)]
+        if reports[0].passed and not item.config.getoption("setuponly", False):
+            reports.append(call_and_report(item, "call", False))
+        retry = can_retry and any(report.failed for report in reports)
+        if item.session.shouldfail or item.session.shouldstop:
+            retry, nextitem = False, None
+        reports.append(call_and_report(item, "teardown", False, nextitem=item.parent if retry else nextitem))
+    finally:
+        if hasattr(item, "_request"):
+            item._request = False
+            item.funcargs = None
+    return reports, retry
+
+
+def run_with_retries(item, nextitem, retries):
+    """Run `item` up to retries + 1 times until it passes (a pytest_runtest_protocol implementation).
+
+    Failed attempts are reported with the "rerun" outcome. Only setup and
+    call failures are retried; a failed teardown is reported as is.
+    """
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    user_properties = list(item.user_properties)
+    for attempt in range(1, retries + 2):
+        item.execution_count = attempt
+        item.user_properties[:] = user_properties
+        for when in ("setup", "call", "teardown"):
+            if hasattr(item, f"rep_{when}"):
+                delattr(item, f"rep_{when}")
+        reports, retry = run_attempt(item, nextitem, can_retry=attempt <= retries)
+        if not retry:
+            break
+        logger.warning("Retrying %s after failed attempt %d", item.nodeid, attempt)
+        for report in reports:
+            if report.failed:
+                report.outcome = "rerun"
+                item.ihook.pytest_runtest_logreport(report=report)
+    for report in reports:
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
@@ -0,0 +1,119 @@
+# src/utilities/screenshots.py
+"""
+Asynchronous, deduplicated screenshot storage.
+
+Only the WebDriver round trip happens on the test thread; recompression,
+optional downscaling and the disk write run on a small thread pool.
+"""
+import hashlib
+import io
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenshotService:
+    """Captures screenshots on the test thread and writes them in the background.
+
+    Files are named by the SHA-256 of the PNG the browser returned, so identical
+    pages (e.g. the same error screen hit by many negative tests) are stored once.
+    """
+
+    def __init__(self, directory: str, max_workers: int = 2, max_width: Optional[int] = None):
+        self.directory = directory
+        self.max_width = max_width
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screenshot")
+        self._lock = threading.Lock()
+        self._known: Dict[str, str] = {}
+        self._pending = []
+        self.captured = 0
+        self.deduplicated = 0
+
+    def capture(self, driver, name: str = None) -> str:
+        """Grab a PNG from the driver and queue it for writing; returns the final file path"""
+        png = driver.get_screenshot_as_png()
+        return self.store(png, name)
+
+    def store(self, png: bytes, name: str = None) -> str:
+        """Queue PNG bytes for writing under their content hash"""
+        digest = hashlib.sha256(png).hexdigest()[:20]
+        path = os.path.join(self.directory, f"{digest}.png")
+        with self._lock:
+            self.captured += 1
+            if digest in self._known or os.path.exists(path):
+                self.deduplicated += 1
+                self._known.setdefault(digest, path)
+                logger.info("Screenshot %s matches an existing image: %s", name or digest, path)
+                return path
+            self._known[digest] = path
+            self._pending.append(self._executor.submit(self._write, png, path))
+        logger.info("Screenshot %s queued: %s", name or digest, path)
+        return path
+
+    def flush(self):
+        """Wait for all queued writes to finish"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning("Screenshot write failed: %s", e)
+
+    def shutdown(self):
+        """Flush pending writes and stop the worker threads"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _write(self, png: bytes, path: str):
+        data = self._encode(png)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def _encode(self, png: bytes) -> bytes:
+        """Optionally downscale and recompress; falls back to the raw PNG without Pillow"""
+        try:
+            from PIL import Image
+        except ImportError:
+            return png
+        image = Image.open(io.BytesIO(png))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height))
+        output = io.BytesIO()
+        image.save(output, format="PNG", optimize=True)
+        data = output.getvalue()
+        return data if len(data) < len(png) else png
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_screenshot_service() -> ScreenshotService:
+    """Per-process screenshot service writing to REPORT_PATH/screenshots (screenshots/gwN under xdist)"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            from src.config.config import config
+            _service = ScreenshotService(
+                os.path.join(config.REPORT_PATH, "screenshots", os.getenv("PYTEST_XDIST_WORKER", "")),
+                max_width=config.SCREENSHOT_MAX_WIDTH or None
+            )
+        return _service
+
+
+def shutdown_screenshot_service():
+    """Flush and stop the service if it was ever used"""
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.shutdown()
@@ -0,0 +1,155 @@
+# src/utilities/sheet_cache.py
+"""
+Compiled on-disk cache for spreadsheet test data.
+
+Each sheet is compiled once into a marshal blob named after the workbook's
+content hash and the marshal format of the running Python. Reads mmap the
+file and unmarshal it without importing pandas or openpyxl; a file that
+cannot be read is rebuilt from the workbook. A small stat-keyed index avoids
+re-hashing unchanged workbooks.
+"""
+import datetime
+import decimal
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import re
+import sys
+import threading
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# marshal output is only guaranteed readable by the same marshal version and Python release
+CACHE_FORMAT = f"m{marshal.version}-py{sys.version_info[0]}{sys.version_info[1]}"
+MAGIC = b"QADC2" + CACHE_FORMAT.encode()
+INDEX_FILE = "index.json"
+
+
+def _to_native(value):
+    """Reduce cell values to types marshal can store"""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, float) and value != value:
+        # NaN becomes None, the same as an empty cell
+        return None
+    return value
+
+
+class SheetCache:
+    """Content-hash keyed, memory-mapped cache of compiled spreadsheet sheets"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self.compiled = 0
+        self.reads = 0
+
+    def load(self, source_path: str, sheet_name: Optional[str],
+             compile_rows: Callable[[str, Optional[str]], Tuple[List[str], Iterable[tuple]]]) -> List[Dict[str, Any]]:
+        """Return the sheet as a list of dicts, compiling it first if the workbook changed"""
+        cache_path, fresh = self._lookup(source_path, sheet_name)
+        if fresh:
+            try:
+                columns, rows = self._read(cache_path)
+            except (OSError, ValueError, EOFError, TypeError) as e:
+                logger.warning("Rebuilding unreadable sheet cache %s: %s", os.path.basename(cache_path), e)
+                fresh = False
+        if not fresh:
+            self._compile(source_path, sheet_name, compile_rows, cache_path)
+            columns, rows = self._read(cache_path)
+        self.reads += 1
+        return [dict(zip(columns, row)) for row in rows]
+
+    def _lookup(self, source_path: str, sheet_name: Optional[str]) -> Tuple[str, bool]:
+        """Return (cache file path, whether it already exists for the current content)"""
+        stat = os.stat(source_path)
+        key = f"{os.path.abspath(source_path)}::{sheet_name or ''}"
+        entry = self._read_index().get(key)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            # Named from the stored hash, so a cache written by another Python is never picked up
+            cache_path = os.path.join(self.cache_dir, self._file_name(source_path, sheet_name, entry["sha256"]))
+            if os.path.exists(cache_path):
+                return cache_path, True
+
+        # Stat changed (or no index entry): fall back to the content hash
+        digest = self._hash(source_path)
+        file_name = self._file_name(source_path, sheet_name, digest)
+        self._update_index(key, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                                 "sha256": digest, "file": file_name})
+        cache_path = os.path.join(self.cache_dir, file_name)
+        return cache_path, os.path.exists(cache_path)
+
+    def _compile(self, source_path, sheet_name, compile_rows, cache_path: str):
+        logger.info("Compiling sheet '%s' of %s", sheet_name or 'first', os.path.basename(source_path))
+        columns, rows = compile_rows(source_path, sheet_name)
+        payload = marshal.dumps((
+            tuple(str(column) for column in columns),
+            [tuple(_to_native(value) for value in row) for row in rows],
+        ))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(MAGIC)
+            file.write(payload)
+        os.replace(tmp_path, cache_path)
+        self.compiled += 1
+
+    @staticmethod
+    def _read(cache_path: str):
+        with open(cache_path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped[:len(MAGIC)] != MAGIC:
+                    raise ValueError(f"Not a compiled sheet cache: {cache_path}")
+                view = memoryview(mapped)
+                body = view[len(MAGIC):]
+                try:
+                    return marshal.loads(body)
+                finally:
+                    # Release buffer exports before the mmap is closed
+                    body.release()
+                    view.release()
+
+    @staticmethod
+    def _hash(source_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(source_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _file_name(source_path: str, sheet_name: Optional[str], digest: str) -> str:
+        stem = re.sub(r"[^\w.-]+", "_", os.path.splitext(os.path.basename(source_path))[0])
+        sheet = re.sub(r"[^\w.-]+", "_", sheet_name) if sheet_name else "first"
+        # The readable sheet part can collide ("a b" vs "a_b", None vs a sheet named "first"); the raw name cannot
+        sheet_key = hashlib.sha256(b"\0" if sheet_name is None else b"=" + sheet_name.encode()).hexdigest()[:8]
+        return f"{stem}.{sheet}-{sheet_key}.{digest[:16]}.{CACHE_FORMAT}.qadc"
+
+    def _read_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _update_index(self, key: str, entry: Dict):
+        with self._lock:
+            index = self._read_index()
+            index[key] = entry
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                index_path = os.path.join(self.cache_dir, INDEX_FILE)
+                tmp_path = f"{index_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as file:
+                    json.dump(index, file, indent=2)
+                os.replace(tmp_path, index_path)
+            except OSError as e:
+                logger.warning("Could not update sheet cache index: %s", e)
@@ -1,12 +1,199 @@
 # src/utilities/waits.py
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from src.config.config import config
+from src.utilities.profiler import profile_wait
+from contextlib import contextmanager
+import json
 import logging
-from typing import Callable, Tuple
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Resolves when the predicate holds, re-checking only on DOM mutations and
+# history changes instead of polling from the client.
+EVENT_WAIT_SCRIPT = """
+var predicate = new Function('args', 'trigger', arguments[0]);
+var args = arguments[1];
+var timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var check = function(trigger) { try { return predicate(args, trigger) || null; } catch (e) { return null; } };
+var initial = check('initial');
+if (initial) { done(initial); return; }
+var finished = false;
+var pushState = history.pushState, replaceState = history.replaceState;
+var observer = new MutationObserver(function() { var r = check('mutation'); if (r) { finish(r); } });
+var onNavigation = function() { var r = check('navigation'); if (r) { finish(r); } };
+var onReadyState = function() { var r = check('readystate'); if (r) { finish(r); } };
+var timer = setTimeout(function() { finish(check('timeout')); }, timeoutMs);
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    history.pushState = pushState;
+    history.replaceState = replaceState;
+    window.removeEventListener('popstate', onNavigation);
+    window.removeEventListener('hashchange', onNavigation);
+    document.removeEventListener('readystatechange', onReadyState);
+    done(result);
+}
+// SPA routers change the URL through the History API without firing an event
+history.pushState = function() { pushState.apply(history, arguments); onNavigation(); };
+history.replaceState = function() { replaceState.apply(history, arguments); onNavigation(); };
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+window.addEventListener('popstate', onNavigation);
+window.addEventListener('hashchange', onNavigation);
+document.addEventListener('readystatechange', onReadyState);
+"""
+
+
+def locator_to_js(locator: Tuple) -> str:
+    """Translate a (By, value) locator into a JS expression returning the first match or null"""
+    by, value = locator
+    quoted = json.dumps(value)
+    if by == By.ID:
+        return f"document.getElementById({quoted})"
+    if by == By.CSS_SELECTOR:
+        return f"document.querySelector({quoted})"
+    if by == By.CLASS_NAME:
+        return f"document.getElementsByClassName({quoted})[0] || null"
+    if by == By.NAME:
+        return f"document.getElementsByName({quoted})[0] || null"
+    if by == By.TAG_NAME:
+        return f"document.getElementsByTagName({quoted})[0] || null"
+    if by == By.XPATH:
+        return (f"document.evaluate({quoted}, document, null, "
+                f"XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue")
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        match = "a.textContent.trim() === text" if by == By.LINK_TEXT else "a.textContent.indexOf(text) !== -1"
+        return (f"(function(text) {{ return Array.prototype.find.call("
+                f"document.getElementsByTagName('a'), function(a) {{ return {match}; }}) || null; }})({quoted})")
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+def locator_to_js_all(locator: Tuple) -> str:
+    """Translate a (By, value) locator into a JS expression returning an array of all matches"""
+    by, value = locator
+    quoted = json.dumps(value)
+    if by == By.ID:
+        return f"[document.getElementById({quoted})].filter(Boolean)"
+    if by == By.CSS_SELECTOR:
+        return f"Array.prototype.slice.call(document.querySelectorAll({quoted}))"
+    if by == By.CLASS_NAME:
+        return f"Array.prototype.slice.call(document.getElementsByClassName({quoted}))"
+    if by == By.NAME:
+        return f"Array.prototype.slice.call(document.getElementsByName({quoted}))"
+    if by == By.TAG_NAME:
+        return f"Array.prototype.slice.call(document.getElementsByTagName({quoted}))"
+    if by == By.XPATH:
+        return (f"(function(r) {{ var out = []; for (var i = 0; i < r.snapshotLength; i++) "
+                f"{{ out.push(r.snapshotItem(i)); }} return out; }})(document.evaluate({quoted}, document, "
+                f"null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null))")
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        match = "a.textContent.trim() === text" if by == By.LINK_TEXT else "a.textContent.indexOf(text) !== -1"
+        return (f"(function(text) {{ return Array.prototype.filter.call("
+                f"document.getElementsByTagName('a'), function(a) {{ return {match}; }}); }})({quoted})")
+    raise ValueError(f"Unsupported locator strategy: {by}")
+
+
+# Resolves once no new Resource Timing entries appear for a quiet window and,
+# when the page uses jQuery, no jQuery requests are active. Checks run inside
+# the browser, so the client sends a single command.
+NETWORK_IDLE_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now(), count = performance.getEntriesByType('resource').length, since = Date.now();
+var timer = setInterval(function() {
+    var now = Date.now(), current = performance.getEntriesByType('resource').length;
+    if (current !== count) { count = current; since = now; }
+    var jqueryIdle = !(window.jQuery && window.jQuery.active);
+    if (jqueryIdle && now - since >= quietMs) { clearInterval(timer); done(true); }
+    else if (now - start >= timeoutMs) { clearInterval(timer); done(false); }
+}, 50);
+"""
+
+# document.readyState that satisfies each page load strategy
+READY_STATES = {"normal": ("complete",), "eager": ("interactive", "complete"), "none": ("interactive", "complete")}
+
+_STATE_CHECKS = {
+    "present": "true",
+    "visible": "!!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)",
+    "clickable": ("!!(el.offsetWidth || el.offsetHeight || el.getClientRects().length) && !el.disabled"
+                  " && getComputedStyle(el).pointerEvents !== 'none'"),
+}
+
+
+@dataclass(frozen=True)
+class Ready:
+    """One condition of a page readiness contract: at least `min_count` matches in `state`"""
+    locator: Tuple
+    state: str = "visible"
+    min_count: int = 1
+
+    def to_js(self) -> str:
+        """JS expression that is true when the condition holds"""
+        if self.state not in _STATE_CHECKS:
+            raise ValueError(f"Unknown readiness state: {self.state}")
+        return (f"({locator_to_js_all(self.locator)}).filter(function(el) {{ return {_STATE_CHECKS[self.state]}; }})"
+                f".length >= {self.min_count}")
+
+
+def readiness_to_js(contract: Sequence[Ready]) -> str:
+    """JS expression that is true when every condition of a contract holds"""
+    return " && ".join(f"({condition.to_js()})" for condition in contract) or "true"
+
+
+# Identifies the current document: a new navigation changes timeOrigin, a history change the URL
+DOCUMENT_MARKER_SCRIPT = "return [performance.timeOrigin, window.location.href];"
+
+
+def left_document_js(since: Optional[Sequence]) -> str:
+    """JS expression that is true once the browser is no longer on the document marked by `since`"""
+    if not since:
+        return "true"
+    time_origin, url = since
+    return f"(performance.timeOrigin !== {json.dumps(time_origin)} || window.location.href !== {json.dumps(url)})"
+
+
+class SleepForbiddenError(AssertionError):
+    """Raised when test or page-object code calls time.sleep under forbid_sleep()"""
+
+
+@contextmanager
+def forbid_sleep():
+    """Fail direct time.sleep calls from project code on the current thread.
+
+    Library code (Selenium's own polling) and other threads are unaffected.
+    """
+    original_sleep = time.sleep
+    thread_id = threading.get_ident()
+
+    def guarded_sleep(seconds):
+        caller = sys._getframe(1).f_code.co_filename
+        if (threading.get_ident() == thread_id
+                and os.path.abspath(caller).startswith(PROJECT_ROOT)
+                and "site-packages" not in caller):
+            raise SleepForbiddenError(
+                f"time.sleep({seconds}) called from {os.path.relpath(caller, PROJECT_ROOT)}; "
+                "wait for a page condition instead"
+            )
+        return original_sleep(seconds)
+
+    time.sleep = guarded_sleep
+    try:
+        yield
+    finally:
+        time.sleep = original_sleep
+
 class SmartWait:
     """Advanced wait utilities for handling dynamic elements"""
     
@@ -15,16 +202,119 @@ class SmartWait:
         self.timeout = timeout
         self.poll_frequency = poll_frequency
     
-    def wait_for_page_load(self):
-        """Wait for page to load completely"""
+    def document_marker(self) -> List:
+        """Marker of the current document; pass it as `since` to wait for the next one"""
+        return self.driver.execute_script(DOCUMENT_MARKER_SCRIPT)
+
+    @profile_wait("page_load")
+    def wait_for_page_load(self, strategy=None, timeout=None, since=None) -> bool:
+        """Wait until document.readyState satisfies the page load strategy (complete for 'normal').
+
+        With `since` (a document_marker taken before navigating) the previous
+        document never counts, which matters when driver.get returns early.
+        """
+        states = READY_STATES.get(strategy or config.PAGE_LOAD_STRATEGY, READY_STATES["normal"])
+        loaded = self.wait_for_js_condition(
+            f"return {left_document_js(since)} && args.indexOf(document.readyState) !== -1;", list(states), timeout
+        )
+        if loaded:
+            logger.info("Page loaded (readyState in %s)", states)
+        else:
+            logger.warning("Page load timeout")
+        return loaded
+    
+    def wait_for_js_value(self, predicate_js: str, args=None, timeout=None):
+        """Wait in the browser until a JS predicate (body of `function(args, trigger)`) is truthy.
+
+        Returns the predicate's value, or None on timeout. Uses a MutationObserver
+        through execute_async_script; falls back to client-side polling for the
+        time left if the page navigates away mid-wait.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
         try:
-            WebDriverWait(self.driver, self.timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
+            return self.driver.execute_async_script(
+                EVENT_WAIT_SCRIPT, predicate_js, args, int(timeout * 1000)
+            )
+        except WebDriverException as e:
+            logger.debug("Event wait interrupted (%s), polling instead", e.__class__.__name__)
+        try:
+            # A script timeout has used up the budget already; this still checks once
+            return WebDriverWait(self.driver, max(0.0, deadline - time.monotonic()), self.poll_frequency).until(
+                lambda d: d.execute_script(
+                    f"return (function(args, trigger) {{ {predicate_js} }})(arguments[0], 'poll');", args
+                )
             )
-            logger.info("Page loaded completely")
         except TimeoutException:
-            logger.warning("Page load timeout")
-    
+            return None
+
+    def wait_for_js_condition(self, predicate_js: str, args=None, timeout=None) -> bool:
+        """Wait in the browser until a JS predicate is truthy"""
+        return bool(self.wait_for_js_value(predicate_js, args, timeout))
+
+    @profile_wait("any_element")
+    def wait_for_any_element(self, locators, visible=True, timeout=None):
+        """Watch several locators in one wait and return the first one that matches, or None"""
+        checks = ", ".join(f"function() {{ return {locator_to_js(locator)}; }}" for locator in locators)
+        predicate = (
+            f"var finders = [{checks}];"
+            " for (var i = 0; i < finders.length; i++) {"
+            "  var el = finders[i]();"
+            "  if (el && (!args || el.offsetWidth || el.offsetHeight || el.getClientRects().length)) {"
+            "   return i + 1; } }"
+            " return null;"
+        )
+        index = self.wait_for_js_value(predicate, visible, timeout)
+        return locators[index - 1] if index else None
+
+    @profile_wait("present")
+    def wait_for_element_present(self, locator: Tuple, timeout=None) -> bool:
+        """Wait for an element to be attached to the DOM"""
+        found = self.wait_for_js_condition(f"return {locator_to_js(locator)} !== null;", timeout=timeout)
+        if not found:
+            logger.warning("Element not present: %s", locator)
+        return found
+
+    @profile_wait("url_change")
+    def wait_for_url_change(self, old_url: str, timeout=None) -> bool:
+        """Wait until the page URL differs from `old_url`"""
+        return self.wait_for_js_condition("return window.location.href !== args;", old_url, timeout)
+
+    @profile_wait("url_contains")
+    def wait_for_url_contains(self, fragment: str, timeout=None) -> bool:
+        """Wait until the page URL contains `fragment`"""
+        return self.wait_for_js_condition("return window.location.href.indexOf(args) !== -1;", fragment, timeout)
+
+    @profile_wait("ready")
+    def wait_for_ready(self, contract: Sequence[Ready], timeout=None, since=None) -> bool:
+        """Wait in the browser until every condition of a readiness contract holds on a document after `since`"""
+        return self.wait_for_js_condition(
+            f"return {left_document_js(since)} && ({readiness_to_js(contract)});", timeout=timeout
+        )
+
+    def unmet_conditions(self, contract: Sequence[Ready], since=None) -> List[str]:
+        """Describe the conditions of a readiness contract that do not hold right now"""
+        checks = ", ".join([left_document_js(since)] + [condition.to_js() for condition in contract])
+        held = self.driver.execute_script(f"return [{checks}];")
+        labels = ["new document"] + [f"{ready.locator[1]} {ready.state}" for ready in contract]
+        return [label for label, ok in zip(labels, held) if not ok]
+
+    @profile_wait("first_ready")
+    def wait_for_first_ready(self, contracts: Sequence[Sequence[Ready]], timeout=None):
+        """Wait for whichever contract holds first and return its index, or None on timeout"""
+        checks = ", ".join(f"function() {{ return {readiness_to_js(contract)}; }}" for contract in contracts)
+        index = self.wait_for_js_value(
+            f"var checks = [{checks}]; for (var i = 0; i < checks.length; i++) {{ if (checks[i]()) {{ return i + 1; }} }}"
+            " return null;", timeout=timeout
+        )
+        return index - 1 if index else None
+
+    @profile_wait("dom_mutation")
+    def wait_for_dom_mutation(self, timeout=None) -> bool:
+        """Wait for the next DOM change"""
+        return self.wait_for_js_condition("return trigger === 'mutation';", timeout=timeout)
+
+    @profile_wait("present_retry")
     def wait_for_element_with_retry(self, locator: Tuple, max_retries: int = 3) -> bool:
         """Wait for element with retry mechanism"""
         for attempt in range(max_retries):
@@ -32,47 +322,50 @@ class SmartWait:
                 element = WebDriverWait(self.driver, self.timeout).until(
                     EC.presence_of_element_located(locator)
                 )
-                logger.info(f"Element found: {locator} on attempt {attempt + 1}")
+                logger.info("Element found: %s on attempt %s", locator, attempt + 1)
                 return element
             except TimeoutException:
-                logger.warning(f"Element not found: {locator}, attempt {attempt + 1}")
+                logger.warning("Element not found: %s, attempt %s", locator, attempt + 1)
                 if attempt == max_retries - 1:
                     raise
-                # Optional: Add small delay before retry
-                import time
-                time.sleep(1)
     
+    @profile_wait("disappear")
     def wait_for_element_to_disappear(self, locator: Tuple) -> bool:
         """Wait for element to disappear"""
         try:
             WebDriverWait(self.driver, self.timeout).until(
                 EC.invisibility_of_element_located(locator)
             )
-            logger.info(f"Element disappeared: {locator}")
+            logger.info("Element disappeared: %s", locator)
             return True
         except TimeoutException:
-            logger.warning(f"Element still visible: {locator}")
+            logger.warning("Element still visible: %s", locator)
             return False
     
+    @profile_wait("text")
     def wait_for_text_to_be_present(self, locator: Tuple, text: str) -> bool:
         """Wait for specific text to be present in element"""
         try:
             WebDriverWait(self.driver, self.timeout).until(
                 EC.text_to_be_present_in_element(locator, text)
             )
-            logger.info(f"Text '{text}' found in element: {locator}")
+            logger.info("Text '%s' found in element: %s", text, locator)
             return True
         except TimeoutException:
-            logger.warning(f"Text '{text}' not found in element: {locator}")
+            logger.warning("Text '%s' not found in element: %s", text, locator)
             return False
     
-    def wait_for_ajax_complete(self):
-        """Wait for AJAX calls to complete (jQuery specific)"""
+    @profile_wait("network_idle")
+    def wait_for_ajax_complete(self, quiet_ms: int = 500, timeout=None) -> bool:
+        """Wait until the page's network is quiet (no new resources for `quiet_ms`; jQuery idle if present)"""
+        timeout = self.timeout if timeout is None else timeout
         try:
-            WebDriverWait(self.driver, self.timeout).until(
-                lambda d: d.execute_script("return jQuery.active == 0")
-            )
+            idle = self.driver.execute_async_script(NETWORK_IDLE_SCRIPT, quiet_ms, int(timeout * 1000))
+        except WebDriverException as e:
+            logger.warning("Network idle wait failed: %s", e)
+            return False
+        if idle:
             logger.info("AJAX calls completed")
-        except:
-            # jQuery might not be present, ignore
-            pass
\ No newline at end of file
+        else:
+            logger.warning("Network still busy after %ss", timeout)
+        return bool(idle)